@@ -5,31 +5,52 @@ import click
 import re
 import json
 from datetime import datetime
-from collections import Counter
 from datetime import datetime, timedelta
 from itertools import groupby
-from operator import attrgetter
-from threading import Thread
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
 
-from flask import Flask, send_file, render_template, request, jsonify, session, url_for, redirect
+from flask import Flask, Response, abort, g, has_request_context, send_file, render_template, request, jsonify, session, url_for, redirect, stream_template, stream_with_context
 from flask_migrate import Migrate
 from flask_cors import CORS
 from flask_login import LoginManager, UserMixin, login_user, login_required, current_user, logout_user
 from flask_sqlalchemy import SQLAlchemy
+from werkzeug.datastructures import ContentRange
 from werkzeug.security import generate_password_hash, check_password_hash
 from openai import OpenAI
 from dotenv import load_dotenv
-from sqlalchemy import desc
+from sqlalchemy import bindparam, event, func, insert, tuple_, update
+from sqlalchemy.exc import IntegrityError
 from flask_mail import Mail, Message as FlaskMessage
+from markupsafe import Markup
 from flask_admin import BaseView, Admin, AdminIndexView, expose
 from flask_admin.contrib.sqla import ModelView
 from flask_admin.form import SecureForm
 from flask.cli import with_appcontext
+import gevent
+from gevent import monkey as gevent_monkey
+import pytz
 from pytz import timezone
-import schedule
 import time
-from bs4 import BeautifulSoup
-import requests
+from contextlib import contextmanager
+
+from audio_cache import TTSAudioCache
+from audio_clips import AudioClipStore, close_parts, iter_file_range, open_parts
+from cache import LRUCache, Memoizer
+from conversation_memory import build_summary_request
+from db_audit import explain_query_plan, full_scans
+from db_backup import BackupManager
+from db_profile import engine_options, install_sqlite_pragmas, is_sqlite, normalize_database_url, sqlite_pragmas
+from keyword_matcher import KeywordMatcher, load_lexicon
+from llm_gateway import LLMGateway, ModelPolicy
+from metrics import MetricsRegistry
+from news_crawler import NewsCrawler
+from prompt_builder import PromptBuilder, TokenCounter
+from scheduler import JobScheduler
+from single_flight import SingleFlight
+from speech import SpeechPipeline
+from usage_buffer import UsageBuffer
+from user_profile import ProfileState
 
 # Flask 애플리케이션 초기화
 app = Flask(__name__)
@@ -38,16 +59,147 @@ CORS(app)  # Cross-Origin Resource Sharing 설정
 # 한국 시간대 설정
 KST = timezone('Asia/Seoul')
 
+# 환경 변수 로드
+load_dotenv()
+
 # 애플리케이션 설정
-app.config['SECRET_KEY'] = os.urandom(24)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///users.db'
+# 여러 워커가 같은 세션 쿠키를 검증할 수 있도록 SECRET_KEY는 환경 변수로 공유
+app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY') or os.urandom(24)
+# DATABASE_URL로 서버 DB(postgresql:// 등)로 바꿀 수 있음
+app.config['SQLALCHEMY_DATABASE_URI'] = normalize_database_url(os.environ.get('DATABASE_URL', 'sqlite:///users.db'))
+# DB 엔진 프로필 ('production': SQLite WAL/PRAGMA와 풀 설정 적용, 'legacy': 기본값)
+app.config['DB_PROFILE'] = os.environ.get('DB_PROFILE', 'production')
+app.config['DB_POOL_SIZE'] = int(os.environ.get('DB_POOL_SIZE', 10))
+app.config['DB_MAX_OVERFLOW'] = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+app.config['DB_POOL_TIMEOUT'] = float(os.environ.get('DB_POOL_TIMEOUT', 30))
+app.config['DB_POOL_RECYCLE'] = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+app.config['SQLITE_JOURNAL_MODE'] = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+app.config['SQLITE_SYNCHRONOUS'] = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+app.config['SQLITE_BUSY_TIMEOUT_MS'] = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+app.config['SQLITE_MMAP_SIZE'] = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+app.config['SQLITE_CACHE_SIZE_KB'] = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 64 * 1024))
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
 db = SQLAlchemy(app)
+if app.config['DB_PROFILE'] != 'legacy' and is_sqlite(app.config['SQLALCHEMY_DATABASE_URI']):
+    with app.app_context():
+        install_sqlite_pragmas(db.engine, sqlite_pragmas(app.config))
 login_manager = LoginManager(app)
 login_manager.login_view = 'login'
 
-# 환경 변수 로드 및 OpenAI 클라이언트 초기화
-load_dotenv()
-client = OpenAI()
+# 계측 설정 (/metrics 에서 Prometheus 형식으로 조회)
+app.config['METRICS_DIR'] = os.environ.get('METRICS_DIR', os.path.join(app.instance_path, 'metrics'))
+app.config['METRICS_FLUSH_INTERVAL'] = float(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+# 설정하면 관리자 로그인 없이 'Authorization: Bearer <토큰>'으로 /metrics 를 수집할 수 있음
+app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN')
+# 이 시간(초)보다 오래 걸린 요청은 단계별 시간과 함께 로그로 남김 (0이면 끔)
+app.config['SLOW_REQUEST_SECONDS'] = float(os.environ.get('SLOW_REQUEST_SECONDS', 0))
+metrics = MetricsRegistry(app.config['METRICS_DIR'], app.config['METRICS_FLUSH_INTERVAL'])
+REQUEST_SECONDS = metrics.histogram(
+    'talkr_http_request_duration_seconds', 'HTTP request latency (streaming responses until the stream ends)',
+    ('method', 'route', 'status'))
+REQUEST_DB_QUERIES = metrics.histogram(
+    'talkr_http_request_db_queries', 'SQL statements executed per request',
+    ('route',), buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200))
+PHASE_SECONDS = metrics.histogram(
+    'talkr_request_phase_seconds', 'Time spent in each phase of a request (db, context, llm, tts)',
+    ('route', 'phase'))
+LLM_CALL_SECONDS = metrics.histogram(
+    'talkr_llm_call_duration_seconds', 'OpenAI call latency per call site, including retries (first chunk for streams)',
+    ('site', 'model', 'outcome'))
+LLM_TOKENS = metrics.counter(
+    'talkr_llm_tokens_total', 'OpenAI tokens reported by responses',
+    ('site', 'model', 'type'))
+
+def count_db_query(*args):
+    if has_request_context():
+        g.db_queries = g.get('db_queries', 0) + 1
+
+with app.app_context():
+    event.listen(db.engine, 'before_cursor_execute', count_db_query)
+
+def request_route():
+    # 404 요청의 경로가 라벨로 쌓이지 않도록 URL 규칙으로 묶음
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+@contextmanager
+def phase(name):
+    """
+    요청 안의 한 구간 시간을 재서 단계별 히스토그램과 느린 요청 로그에 남기는 컨텍스트 매니저
+    같은 단계를 여러 번 지나면 합산합니다.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        PHASE_SECONDS.observe(elapsed, route=request_route(), phase=name)
+        phases = g.setdefault('phases', {})
+        phases[name] = phases.get(name, 0) + elapsed
+
+@app.before_request
+def start_request_timer():
+    metrics.start()
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def remember_response_status(response):
+    g.response_status = response.status_code
+    return response
+
+@app.teardown_request
+def observe_request(error=None):
+    # 스트리밍 응답은 스트림이 끝난 뒤에 teardown이 불리므로 전체 전송 시간이 잡힘
+    started = g.get('request_started')
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    route = request_route()
+    status = g.get('response_status', 500)
+    queries = g.get('db_queries', 0)
+    REQUEST_SECONDS.observe(elapsed, method=request.method, route=route, status=status)
+    REQUEST_DB_QUERIES.observe(queries, route=route)
+    slow_after = app.config['SLOW_REQUEST_SECONDS']
+    if slow_after and elapsed >= slow_after:
+        phases = ' '.join(f"{name}={seconds:.3f}s" for name, seconds in g.get('phases', {}).items())
+        print(f"Slow request {request.method} {request.path} {status} {elapsed:.3f}s db_queries={queries} {phases}".rstrip())
+
+# OpenAI 클라이언트 초기화
+# 재시도는 게이트웨이가 deadline 안에서 직접 하므로 클라이언트 자체 재시도는 끔
+client = OpenAI(max_retries=0)
+
+# OpenAI 게이트웨이 설정 (모델별 deadline(초)/동시 호출 수, 공통 재시도/서킷 브레이커)
+app.config['LLM_MAX_RETRIES'] = int(os.environ.get('LLM_MAX_RETRIES', 2))
+app.config['LLM_DEADLINE_GPT_4O'] = float(os.environ.get('LLM_DEADLINE_GPT_4O', 30))
+app.config['LLM_DEADLINE_GPT_4O_MINI'] = float(os.environ.get('LLM_DEADLINE_GPT_4O_MINI', 20))
+app.config['LLM_DEADLINE_TTS'] = float(os.environ.get('LLM_DEADLINE_TTS', 20))
+app.config['LLM_CONCURRENCY_GPT_4O'] = int(os.environ.get('LLM_CONCURRENCY_GPT_4O', 32))
+app.config['LLM_CONCURRENCY_GPT_4O_MINI'] = int(os.environ.get('LLM_CONCURRENCY_GPT_4O_MINI', 32))
+app.config['LLM_CONCURRENCY_TTS'] = int(os.environ.get('LLM_CONCURRENCY_TTS', 16))
+app.config['LLM_ACQUIRE_TIMEOUT'] = float(os.environ.get('LLM_ACQUIRE_TIMEOUT', 5))
+app.config['LLM_BREAKER_FAILURES'] = int(os.environ.get('LLM_BREAKER_FAILURES', 5))
+app.config['LLM_BREAKER_RESET'] = float(os.environ.get('LLM_BREAKER_RESET', 30))
+
+def llm_policy(name):
+    return ModelPolicy(
+        deadline=app.config[f'LLM_DEADLINE_{name}'],
+        max_retries=app.config['LLM_MAX_RETRIES'],
+        concurrency=app.config[f'LLM_CONCURRENCY_{name}'],
+    )
+
+llm_gateway = LLMGateway(
+    client,
+    policies={
+        'gpt-4o': llm_policy('GPT_4O'),
+        'gpt-4o-mini': llm_policy('GPT_4O_MINI'),
+        'tts-1': llm_policy('TTS'),
+    },
+    default_policy=llm_policy('GPT_4O'),
+    acquire_timeout=app.config['LLM_ACQUIRE_TIMEOUT'],
+    breaker_failures=app.config['LLM_BREAKER_FAILURES'],
+    breaker_reset=app.config['LLM_BREAKER_RESET'],
+    observer=lambda site, model, latency, outcome: LLM_CALL_SECONDS.observe(latency, site=site, model=model, outcome=outcome),
+    usage_observer=lambda site, model, usage: observe_llm_tokens(site, model, usage),
+)
 migrate = Migrate(app, db)
 
 # Flask-Mail 설정
@@ -61,6 +213,18 @@ app.config['MAIL_DEFAULT_SENDER'] = 'mks010103@gmail.com' # 실제 이메일 주
 
 mail = Mail(app)
 
+# TTS 오디오 캐시 설정
+app.config['TTS_CACHE_DIR'] = os.environ.get('TTS_CACHE_DIR', os.path.join(app.instance_path, 'tts_cache'))
+app.config['TTS_CACHE_MAX_BYTES'] = int(os.environ.get('TTS_CACHE_MAX_MB', 200)) * 1024 * 1024
+# 응답 오디오 클립 설정 (클립 URL은 AUDIO_CLIP_TTL초 동안만 유효)
+app.config['AUDIO_CLIP_DIR'] = os.environ.get('AUDIO_CLIP_DIR', os.path.join(app.instance_path, 'audio_clips'))
+app.config['AUDIO_CLIP_TTL'] = int(os.environ.get('AUDIO_CLIP_TTL', 600))
+tts_cache = TTSAudioCache(app.config['TTS_CACHE_DIR'], app.config['TTS_CACHE_MAX_BYTES'])
+audio_clips = AudioClipStore(app.config['AUDIO_CLIP_DIR'], app.config['AUDIO_CLIP_TTL'])
+# 문장별 TTS를 병렬로 처리하는 스레드 풀
+app.config['TTS_WORKERS'] = int(os.environ.get('TTS_WORKERS', 8))
+tts_executor = ThreadPoolExecutor(max_workers=app.config['TTS_WORKERS'])
+
 # 사용자 모델 정의
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -89,8 +253,17 @@ class Conversation(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     start_time = db.Column(db.DateTime, default=datetime.utcnow)
     end_time = db.Column(db.DateTime)
+    # 오래된 메시지를 접어 둔 누적 요약과, 요약에 포함된 마지막 메시지 id
+    summary = db.Column(db.Text)
+    summary_message_id = db.Column(db.Integer)
+    summary_updated_at = db.Column(db.DateTime)
     messages = db.relationship('Message', backref='conversation', lazy=True, order_by="Message.timestamp")
 
+    __table_args__ = (
+        # 사용자의 진행 중인 대화 조회 (/chat, /get_news)
+        db.Index('ix_conversation_user_id_end_time', 'user_id', 'end_time'),
+    )
+
 # 메시지 모델 정의
 class Message(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -100,6 +273,13 @@ class Message(db.Model):
     timestamp = db.Column(db.DateTime, default=lambda: datetime.now(KST))
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
 
+    __table_args__ = (
+        # 대화별 최근 메시지 조회 (get_conversation_memory, 대화 요약)
+        db.Index('ix_message_conversation_id_timestamp', 'conversation_id', 'timestamp'),
+        # 사용자별 대화 기록 페이지 조회 (/get_history)
+        db.Index('ix_message_user_id_timestamp_id', 'user_id', 'timestamp', 'id'),
+    )
+
 # 관리자 뷰 보안 설정
 class SecureModelView(ModelView):
     form_base_class = SecureForm
@@ -123,6 +303,12 @@ class Report(db.Model):
     analysis = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_report_user_id_created_at', 'user_id', 'created_at'),
+        # 같은 문장의 분석 결과 재사용 (/analyze_korean)
+        db.Index('ix_report_original_text', 'original_text'),
+    )
+
 class VocabularyItem(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -132,11 +318,90 @@ class VocabularyItem(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     user = db.relationship('User', backref=db.backref('vocabulary_items', lazy=True))
+
+    __table_args__ = (
+        db.Index('ix_vocabulary_item_user_id_created_at', 'user_id', 'created_at'),
+        # 단어 뜻 캐시가 비었을 때 단어장에 저장된 뜻을 찾는 조회 (lookup_cached_meanings)
+        db.Index('ix_vocabulary_item_word_created_at', 'word', 'created_at'),
+    )
+
+# 미리 크롤링·요약해 둔 뉴스 모델 (모든 워커가 공유)
+class NewsItem(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    url = db.Column(db.String(500), unique=True, nullable=False)
+    messages = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    consumed_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        # 아직 꺼내지 않은 뉴스를 준비된 순서대로 조회 (/get_news)
+        db.Index('ix_news_item_consumed_at_created_at', 'consumed_at', 'created_at'),
+    )
+
+# 사용자 간에 공유되는 단어 뜻 캐시 모델
+class WordDefinition(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    word = db.Column(db.String(100), unique=True, nullable=False)
+    meaning = db.Column(db.Text, nullable=False)
+    explanation = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# 전체 사용자 뉴스 전송 진행 상태 (작업이 중단되면 last_user_id 다음부터 이어서 전송)
+class NewsBroadcast(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    messages = db.Column(db.Text, nullable=False)
+    last_user_id = db.Column(db.Integer, nullable=False, default=0)
+    sent_count = db.Column(db.Integer, nullable=False, default=0)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    # 예약 주기가 지나 이어서 보내지 않고 중단한 시각 (finished_at도 함께 기록)
+    abandoned_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        # 끝나지 않은 방송을 시작 순서대로 조회 (send_news_to_all_users)
+        db.Index('ix_news_broadcast_finished_at_started_at', 'finished_at', 'started_at'),
+    )
+
+# 예약 작업 실행 기록
+class JobRun(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    job_name = db.Column(db.String(100), nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    error = db.Column(db.Text)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    duration = db.Column(db.Float)
+
+# LLM 호출별 토큰 사용량과 지연 시간 (비용/지연 추적용)
+class LLMUsage(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    route = db.Column(db.String(50), nullable=False)
+    model = db.Column(db.String(50), nullable=False)
+    prompt_tokens = db.Column(db.Integer)
+    completion_tokens = db.Column(db.Integer)
+    cached_tokens = db.Column(db.Integer)
+    estimated_prompt_tokens = db.Column(db.Integer)
+    latency_ms = db.Column(db.Integer)
+    first_token_ms = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+# 사용자별 관심사/감정 누적 프로필 (메시지마다 갱신, /chat에서 기본 키로 조회)
+class UserProfile(db.Model):
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    category_counts = db.Column(db.Text, nullable=False, default='{}')
+    sentiment_average = db.Column(db.Float, nullable=False, default=0.0)
+    message_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
 # 관리자 페이지 설정
 admin = Admin(app, name='TalKR Admin', template_mode='bootstrap3', index_view=MyAdminIndexView())
 admin.add_view(SecureModelView(User, db.session))
 admin.add_view(SecureModelView(Conversation, db.session))
 admin.add_view(SecureModelView(Message, db.session))
+admin.add_view(SecureModelView(JobRun, db.session))
+admin.add_view(SecureModelView(LLMUsage, db.session))
+admin.add_view(SecureModelView(UserProfile, db.session))
 
 @login_manager.user_loader
 def load_user(user_id):
@@ -215,74 +480,96 @@ Important:
 Respond to your friend's message in Korean, following all the guidelines above. Wrap your response in <response></response> tags."""
 }
 
-# 키워드 및 감정 단어 정의
-keywords = {
-    'travel': ['여행', '관광', '휴가', '비행기', '호텔', '리조트', '관광지', '여행지', '백패킹', '배낭여행', '숙소', '투어', '가이드', '여권', '비자'],
-    'food': ['음식', '맛집', '요리', '레스토랑', '카페', '베이커리', '디저트', '음료', '식당', '맛있는', '메뉴', '주방', '식재료', '맛', '향'],
-    'movie': ['영화', '시네마', '극장', '배우', '감독', '개봉', '상영', '티켓', '팝콘', '영화관', '스크린', '대본', '촬영', '특수효과', '시나리오'],
-    'music': ['음악', '노래', '가수', '밴드', '콘서트', '앨범', '뮤직비디오', '가사', '멜로디', '리듬', '악기', '작곡', '음반', '공연', '팬'],
-    'sports': ['스포츠', '운동', '경기', '선수', '팀', '경기장', '트레이닝', '체육', '올림픽', '월드컵', '코치', '트레이너', '승리', '패배', '기록'],
-    'technology': ['기술', '컴퓨터', '스마트폰', '앱', '소프트웨어', '하드웨어', 'AI', '인공지능', '로봇', 'IT', '프로그래밍', '코딩', '데이터', '알고리즘', '머신러닝'],
-    'education': ['교육', '학교', '학습', '공부', '선생님', '학생', '수업', '강의', '과목', '시험', '숙제', '교과서', '학위', '졸업', '장학금'],
-    'health': ['건강', '의료', '병원', '의사', '약', '치료', '운동', '다이어트', '영양', '웰빙', '질병', '예방', '검진', '면역', '스트레스'],
-    'finance': ['금융', '투자', '주식', '은행', '대출', '저축', '보험', '경제', '재테크', '부동산', '환율', '펀드', '자산', '세금', '연금'],
-    'art': ['예술', '그림', '조각', '전시회', '갤러리', '미술관', '작품', '창작', '디자인', '색채', '형태', '추상', '아티스트', '화가', '조각가']
-}
-
-positive_words = ['좋아', '멋져', '행복', '즐거워', '기뻐', '감사해', '훌륭해', '대단해', '신나', '만족', '흥미로워', '재미있어', '편안해', '희망적', '긍정적']
-negative_words = ['싫어', '나빠', '슬퍼', '화나', '걱정돼', '불안해', '실망', '후회', '우울해', '짜증나', '힘들어', '어려워', '괴로워', '부정적', '불편해']
+# 키워드 및 감정 단어 사전 (data/analysis_lexicon.json) 을 시작할 때 한 번만 컴파일
+app.config['ANALYSIS_LEXICON_PATH'] = os.environ.get('ANALYSIS_LEXICON_PATH', os.path.join(app.root_path, 'data', 'analysis_lexicon.json'))
+keyword_matcher = KeywordMatcher(load_lexicon(app.config['ANALYSIS_LEXICON_PATH']))
 
 def analyze_message(message):
     """
     메시지를 분석하여 사용자의 선호도와 감정을 파악합니다.
     """
-    message = message.lower()
-    preferences = []
-    for category, words in keywords.items():
-        if any(word in message for word in words):
-            preferences.append(category)
-    
-    word_counts = Counter(message.split())
-    positive_score = sum(word_counts[word] for word in positive_words)
-    negative_score = sum(word_counts[word] for word in negative_words)
-    
-    if positive_score > negative_score:
-        sentiment = 'positive'
-    elif negative_score > positive_score:
-        sentiment = 'negative'
-    else:
-        sentiment = 'neutral'
-    
-    return preferences, sentiment
+    return keyword_matcher.analyze(message)
+
+# 사용자 프로필 설정
+app.config['PROFILE_HALF_LIFE_MESSAGES'] = float(os.environ.get('PROFILE_HALF_LIFE_MESSAGES', 30))
+app.config['PROFILE_SENTIMENT_ALPHA'] = float(os.environ.get('PROFILE_SENTIMENT_ALPHA', 0.2))
+app.config['PROFILE_TOP_CATEGORIES'] = int(os.environ.get('PROFILE_TOP_CATEGORIES', 3))
+app.config['PROFILE_BACKFILL_BATCH_SIZE'] = int(os.environ.get('PROFILE_BACKFILL_BATCH_SIZE', 1000))
+
+def user_profile_query(user_id):
+    return (
+        db.session.query(UserProfile.category_counts, UserProfile.sentiment_average, UserProfile.message_count)
+        .filter(UserProfile.user_id == user_id)
+    )
+
+def get_user_profile(user_id):
+    """
+    사용자 프로필을 기본 키로 한 번 조회하는 함수 (없으면 빈 프로필)
+    """
+    return ProfileState.from_row(user_profile_query(user_id).first())
+
+def add_to_profile(profile, preferences, sentiment):
+    return profile.add(preferences, sentiment, app.config['PROFILE_HALF_LIFE_MESSAGES'], app.config['PROFILE_SENTIMENT_ALPHA'])
+
+def update_user_profile(user_id, preferences, sentiment):
+    """
+    메시지 하나의 분석 결과를 사용자 프로필에 반영하는 함수 (커밋은 호출하는 쪽에서)
+    읽은 뒤 다른 요청이 먼저 갱신했으면(message_count가 바뀌었으면) 다시 읽어서 반영합니다.
+    """
+    for _ in range(3):
+        profile = get_user_profile(user_id)
+        expected_count = profile.message_count
+        add_to_profile(profile, preferences, sentiment)
+        values = {
+            'category_counts': profile.dumps(),
+            'sentiment_average': profile.sentiment_average,
+            'message_count': profile.message_count,
+            'updated_at': datetime.utcnow(),
+        }
+        if expected_count == 0:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(insert(UserProfile).values(user_id=user_id, **values))
+                return profile
+            except IntegrityError:
+                continue
+        result = db.session.execute(
+            update(UserProfile)
+            .where(UserProfile.user_id == user_id, UserProfile.message_count == expected_count)
+            .values(**values)
+        )
+        if result.rowcount:
+            return profile
+    print(f"Gave up updating profile for user {user_id}")
+    return None
+
+# 뉴스 크롤링 설정
+app.config['NEWS_LIST_URL'] = os.environ.get('NEWS_LIST_URL', 'https://www.ytn.co.kr/news/list.php?mcd=0103')
+app.config['NEWS_PREFETCH_ENABLED'] = os.environ.get('NEWS_PREFETCH_ENABLED', 'true').lower() == 'true'
+app.config['NEWS_PREFETCH_COUNT'] = int(os.environ.get('NEWS_PREFETCH_COUNT', 5))
+app.config['NEWS_PREFETCH_INTERVAL'] = int(os.environ.get('NEWS_PREFETCH_INTERVAL', 900))
+# /get_news가 미리 받기를 앞당겨 요청하는 최소 간격 (초)
+app.config['NEWS_PREFETCH_TRIGGER_INTERVAL'] = int(os.environ.get('NEWS_PREFETCH_TRIGGER_INTERVAL', 60))
+
+app.config['NEWS_CRAWL_WORKERS'] = int(os.environ.get('NEWS_CRAWL_WORKERS', 4))
+app.config['NEWS_CRAWL_TIMEOUT'] = float(os.environ.get('NEWS_CRAWL_TIMEOUT', 10))
+
+news_crawler = NewsCrawler(
+    timeout=(3.05, app.config['NEWS_CRAWL_TIMEOUT']),
+    max_workers=app.config['NEWS_CRAWL_WORKERS'],
+)
 
 # 크롤링 함수들
 current_news_index = 0
 news_url_list = []
 
 def crawl_main(url):
-    response = requests.get(url)
-    if response.status_code == 200:
-        soup = BeautifulSoup(response.text, 'html.parser')
-        news_list = soup.find_all('div', class_='news_list')
-        articles = []
-        for news in news_list:
-            title_tag = news.find('div', class_='title')
-            if title_tag and title_tag.a:
-                link = title_tag.a['href']
-                full_link = requests.compat.urljoin(url, link)
-                articles.append(full_link)
-        return articles
-    else:
-        print(f"웹 페이지를 불러오지 못했습니다. 상태 코드: {response.status_code}")
-        return []
+    return news_crawler.list_articles(url)
 
 def news_scrap(url):
-    response = requests.get(url)
-    if response.status_code == 200:
-        soup = BeautifulSoup(response.text, 'html.parser')
-        content_div = soup.find('div', {'id': 'CmAdContent'})
-        if content_div:
-            return content_div.get_text(separator="\n").strip()
+    content = news_crawler.scrape_article(url)
+    if content:
+        return content
     return "뉴스 내용을 가져오지 못했습니다."
 
 def get_next_news():
@@ -290,7 +577,7 @@ def get_next_news():
     global news_url_list
     
     if not news_url_list or current_news_index >= len(news_url_list):
-        news_url_list = crawl_main("https://www.ytn.co.kr/news/list.php?mcd=0103")
+        news_url_list = crawl_main(app.config['NEWS_LIST_URL'])
         current_news_index = 0
     
     if not news_url_list:
@@ -305,7 +592,8 @@ def get_next_news():
 
 def summarize_news(news_content, max_tokens=100):
     summary_prompt = f"다음 뉴스를 100자 이내로 요약해주세요:\n\n{news_content}"
-    response = client.chat.completions.create(
+    response = llm_gateway.chat(
+        'news_summary',
         model="gpt-4o-mini",
         messages=[
             {"role": "system", "content": "당신은 뉴스를 간결하게 요약하는 AI입니다."},
@@ -315,21 +603,156 @@ def summarize_news(news_content, max_tokens=100):
     )
     return response.choices[0].message.content
 
-def get_recent_context(conversation_id, limit=10):
-    recent_messages = Message.query.filter_by(conversation_id=conversation_id).order_by(Message.timestamp.desc()).limit(limit).all()
+# 대화 메모리 설정
+app.config['MEMORY_RECENT_TURNS'] = int(os.environ.get('MEMORY_RECENT_TURNS', 3))
+app.config['MEMORY_SUMMARY_EVERY'] = int(os.environ.get('MEMORY_SUMMARY_EVERY', 4))
+app.config['MEMORY_SUMMARY_MAX_CHARS'] = int(os.environ.get('MEMORY_SUMMARY_MAX_CHARS', 400))
+app.config['MEMORY_SUMMARY_MAX_FOLD'] = int(os.environ.get('MEMORY_SUMMARY_MAX_FOLD', 40))
+app.config['MEMORY_CONTEXT_TOKEN_BUDGET'] = int(os.environ.get('MEMORY_CONTEXT_TOKEN_BUDGET', 800))
+
+memory_executor = ThreadPoolExecutor(max_workers=2)
+summary_updates_in_flight = set()
+summary_updates_lock = Lock()
+
+def recent_messages_query(conversation_id, after_id, limit):
+    """
+    대화에서 id가 after_id보다 큰 메시지를 최신순으로 limit개 읽는 쿼리
+    """
+    return (
+        Message.query
+        .filter(Message.conversation_id == conversation_id, Message.id > after_id)
+        .order_by(Message.timestamp.desc(), Message.id.desc())
+        .limit(limit)
+    )
+
+def get_conversation_memory(conversation_id):
+    """
+    대화 요약과 아직 요약되지 않은 최근 메시지를 (요약, [(is_user, 내용), ...])로 반환하는 함수
+    """
+    conversation = db.session.get(Conversation, conversation_id)
+    # 요약 갱신 주기 사이에 쌓이는 메시지까지만 읽음
+    limit = (app.config['MEMORY_RECENT_TURNS'] + app.config['MEMORY_SUMMARY_EVERY']) * 2
+    recent_messages = recent_messages_query(conversation_id, conversation.summary_message_id or 0, limit).all()
     recent_messages.reverse()
-    context = []
-    for msg in recent_messages:
-        msg_type = "사용자" if msg.is_user else "AI"
-        context.append(f"{msg_type}: {msg.content}")
-    return "\n".join(context)
+    return conversation.summary, [(msg.is_user, msg.content) for msg in recent_messages]
+
+def unsummarized_messages_query(conversation_id, watermark, limit):
+    return (
+        Message.query
+        .filter(Message.conversation_id == conversation_id, Message.id > watermark)
+        .order_by(Message.id.desc())
+        .limit(limit)
+    )
+
+def update_conversation_summary(conversation_id):
+    """
+    최근 MEMORY_RECENT_TURNS턴을 뺀 요약되지 않은 메시지가 MEMORY_SUMMARY_EVERY턴 이상 쌓였으면
+    기존 요약에 합쳐서 요약을 갱신하는 함수
+    """
+    conversation = db.session.get(Conversation, conversation_id)
+    watermark = conversation.summary_message_id or 0
+    keep = app.config['MEMORY_RECENT_TURNS'] * 2
+    pending = unsummarized_messages_query(conversation_id, watermark, app.config['MEMORY_SUMMARY_MAX_FOLD'] + keep).all()
+    pending.reverse()
+    to_fold = pending[:-keep] if keep else pending
+    if len(to_fold) < app.config['MEMORY_SUMMARY_EVERY'] * 2:
+        return False
+
+    started = time.perf_counter()
+    response = llm_gateway.chat(
+        'conversation_summary',
+        model="gpt-4o-mini",
+        messages=build_summary_request(
+            conversation.summary,
+            [(msg.is_user, msg.content) for msg in to_fold],
+            app.config['MEMORY_SUMMARY_MAX_CHARS'],
+        ),
+        max_tokens=400,
+    )
+    summary = response.choices[0].message.content.strip()
+    record_llm_usage('conversation_summary', 'gpt-4o-mini', usage_from_response(response.usage), started, user_id=conversation.user_id)
+
+    # 그 사이 다른 워커가 요약을 먼저 갱신했다면 덮어쓰지 않음
+    watermark_unchanged = Conversation.summary_message_id.is_(None) if watermark == 0 else Conversation.summary_message_id == watermark
+    updated = db.session.execute(
+        update(Conversation)
+        .where(Conversation.id == conversation_id, watermark_unchanged)
+        .values(summary=summary, summary_message_id=to_fold[-1].id, summary_updated_at=datetime.utcnow())
+    ).rowcount
+    db.session.commit()
+    return bool(updated)
+
+def usage_from_response(usage):
+    """
+    OpenAI 응답의 usage 객체에서 토큰 수를 꺼내는 함수 (캐시 적중 토큰은 제공될 때만)
+    """
+    if usage is None:
+        return {}
+    details = getattr(usage, 'prompt_tokens_details', None)
+    return {
+        'prompt_tokens': usage.prompt_tokens,
+        'completion_tokens': usage.completion_tokens,
+        'cached_tokens': getattr(details, 'cached_tokens', None),
+    }
+
+def observe_llm_tokens(site, model, usage):
+    for token_type, count in usage_from_response(usage).items():
+        if count:
+            LLM_TOKENS.inc(count, site=site, model=model, type=token_type.removesuffix('_tokens'))
+
+def record_llm_usage(route, model, usage, started, user_id=None, estimated_prompt_tokens=None):
+    """
+    LLM 호출 한 번의 토큰 사용량과 지연 시간을 LLMUsage에 추가하는 함수 (커밋은 호출한 쪽에서)
+    """
+    first_token_at = usage.get('first_token_at')
+    db.session.add(LLMUsage(
+        user_id=user_id,
+        route=route,
+        model=model,
+        prompt_tokens=usage.get('prompt_tokens', estimated_prompt_tokens),
+        completion_tokens=usage.get('completion_tokens'),
+        cached_tokens=usage.get('cached_tokens'),
+        estimated_prompt_tokens=estimated_prompt_tokens,
+        latency_ms=int((time.perf_counter() - started) * 1000),
+        first_token_ms=int((first_token_at - started) * 1000) if first_token_at else None,
+    ))
+
+def run_summary_update(conversation_id):
+    try:
+        with app.app_context():
+            update_conversation_summary(conversation_id)
+    except Exception as e:
+        print(f"Error updating conversation summary {conversation_id}: {str(e)}")
+    finally:
+        with summary_updates_lock:
+            summary_updates_in_flight.discard(conversation_id)
+
+def schedule_summary_update(conversation_id):
+    """
+    응답을 늦추지 않도록 대화 요약 갱신을 백그라운드에서 실행하는 함수 (대화당 한 번에 하나만)
+    """
+    with summary_updates_lock:
+        if conversation_id in summary_updates_in_flight:
+            return
+        summary_updates_in_flight.add(conversation_id)
+    memory_executor.submit(run_summary_update, conversation_id)
 
-def get_news_summary():
+def get_news_summary(speech_pipeline=None):
+    """
+    다음 뉴스를 요약해서 친구에게 말하듯 나눈 메시지 목록을 반환하는 함수
+    speech_pipeline이 주어지면 응답을 스트리밍하면서 메시지별 TTS를 함께 시작합니다.
+    """
     news_content = get_next_news()
     
     if news_content == "뉴스 내용을 가져오지 못했습니다.":
         return ["앗, 이 뉴스를 가져오는데 문제가 있었어. 다음에 다시 시도해볼게!"]
     
+    return summarize_article(news_content, speech_pipeline)
+
+def summarize_article(news_content, speech_pipeline=None):
+    """
+    뉴스 본문을 요약한 뒤 친구에게 말하듯 '---'로 나눈 메시지 목록으로 만드는 함수
+    """
     summarized_news = summarize_news(news_content)
     
     prompt = f"""다음은 최근 뉴스 요약이야:
@@ -345,16 +768,36 @@ def get_news_summary():
 6. 너 이 소식 들었어? / 와 ~ 이런 일이 있었데 / 오늘 이런 ~ 이런 일이 있었다는데? 같은 친구에게 소신을 전하는 말투를 사용해
 """
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "넌 친구에게 뉴스 전하는 20대 한국인이야. 편하게 얘기해."},
-            {"role": "user", "content": prompt}
-        ],
-        max_tokens=350,
-        )
+    news_messages = [
+        {"role": "system", "content": "넌 친구에게 뉴스 전하는 20대 한국인이야. 편하게 얘기해."},
+        {"role": "user", "content": prompt}
+    ]
+
+    if speech_pipeline is None:
+        response = llm_gateway.chat(
+            'news_article',
+            model="gpt-4o-mini",
+            messages=news_messages,
+            max_tokens=350,
+            )
+        content = response.choices[0].message.content
+    else:
+        stream = llm_gateway.chat_stream(
+            'news_article',
+            model="gpt-4o-mini",
+            messages=news_messages,
+            max_tokens=350,
+            )
+        content_parts = []
+        for chunk in stream:
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            content_parts.append(chunk.choices[0].delta.content)
+            speech_pipeline.feed(chunk.choices[0].delta.content)
+        speech_pipeline.close()
+        content = ''.join(content_parts)
     
-    messages = [msg.strip() for msg in response.choices[0].message.content.split('---') if msg.strip()]
+    messages = [msg.strip() for msg in content.split('---') if msg.strip()]
     return messages
 
 # 분석 결과 저장 함수
@@ -363,37 +806,242 @@ def save_analysis(user_id, original_text, analysis):
     db.session.add(new_report)
     db.session.commit()
 
+# 번역/분석 결과 메모이제이션 설정
+# 프롬프트나 모델을 바꾸면 버전을 올려서 이전 결과가 재사용되지 않도록 합니다
+TRANSLATE_PROMPT_VERSION = 'gpt-4o-mini/v1'
+ANALYZE_PROMPT_VERSION = 'gpt-4o/v1'
+app.config['MEMO_CACHE_SIZE'] = int(os.environ.get('MEMO_CACHE_SIZE', 2000))
+app.config['MEMO_CACHE_TTL'] = int(os.environ.get('MEMO_CACHE_TTL', 24 * 60 * 60))
+llm_memo = Memoizer(maxsize=app.config['MEMO_CACHE_SIZE'], ttl=app.config['MEMO_CACHE_TTL'])
+# 같은 단어/문장에 대한 동시 요청은 OpenAI 호출 하나로 합침 (워커 사이에는 SINGLE_FLIGHT_DIR의 잠금 슬롯과 결과 파일로 공유)
+app.config['SINGLE_FLIGHT_DIR'] = os.environ.get('SINGLE_FLIGHT_DIR', os.path.join(app.instance_path, 'single_flight'))
+app.config['SINGLE_FLIGHT_RESULT_TTL'] = float(os.environ.get('SINGLE_FLIGHT_RESULT_TTL', 10))
+app.config['SINGLE_FLIGHT_WAIT_TIMEOUT'] = float(os.environ.get('SINGLE_FLIGHT_WAIT_TIMEOUT', 30))
+single_flight = SingleFlight(
+    app.config['SINGLE_FLIGHT_DIR'],
+    result_ttl=app.config['SINGLE_FLIGHT_RESULT_TTL'],
+    wait_timeout=app.config['SINGLE_FLIGHT_WAIT_TIMEOUT'],
+)
+
+def synthesize_speech(text, model="tts-1", voice="nova", speed=1.0):
+    """
+    TTS 캐시를 먼저 확인하고 없을 때만 OpenAI TTS를 호출해 캐시에 저장한 뒤 캐시 키를 반환하는 함수
+    오디오는 캐시 파일에서 바로 내려주므로 메모리에 들고 있지 않습니다.
+    """
+    key = tts_cache.make_key(text, model, voice, speed)
+    if not tts_cache.touch(key):
+        audio = llm_gateway.speech(
+            'tts',
+            model=model,
+            voice=voice,
+            input=text,
+            speed=speed
+        )
+        tts_cache.put(key, audio)
+    return key
+
+def speech_payload(speech_pipeline, user_id):
+    """
+    문장별 TTS 결과를 순서대로 하나의 짧은 수명 오디오 클립으로 묶어 응답 JSON의 audio_url을 만드는 함수
+    """
+    keys = [key for _, key in speech_pipeline.results()]
+    if not keys:
+        return {'audio_url': None}
+    clip_id = audio_clips.create(user_id, keys)
+    return {'audio_url': url_for('clip_audio', clip_id=clip_id)}
+
+@app.route('/audio/<clip_id>')
+@login_required
+def clip_audio(clip_id):
+    """
+    응답 하나의 문장 오디오들을 이어 붙여 하나의 MP3로 스트리밍하는 라우트 (Range 요청 지원)
+    """
+    clip = audio_clips.get(clip_id)
+    if clip is None or clip['user_id'] != current_user.id:
+        abort(404)
+    try:
+        # Content-Length를 보낸 뒤에 캐시에서 지워져 응답이 잘리지 않도록 모든 문장 파일을 먼저 열어 둠
+        parts = open_parts(map(tts_cache.path_for, clip['keys']))
+    except FileNotFoundError:
+        # 클립이 만료되기 전에 TTS 캐시에서 밀려난 경우
+        abort(410)
+    total = sum(size for _, size in parts)
+
+    start, stop, status = 0, total, 200
+    if request.range is not None:
+        byte_range = request.range.range_for_length(total)
+        if byte_range is None:
+            close_parts(parts)
+            response = Response(status=416)
+            response.headers['Content-Range'] = f'bytes */{total}'
+            return response
+        (start, stop), status = byte_range, 206
+
+    response = Response(iter_file_range(parts, start, stop), status=status, mimetype='audio/mpeg', direct_passthrough=True)
+    # 본문을 읽기 전에 연결이 끊겨도 파일을 닫음
+    response.call_on_close(lambda: close_parts(parts))
+    response.content_length = stop - start
+    response.accept_ranges = 'bytes'
+    if status == 206:
+        response.content_range = ContentRange('bytes', start, stop, total)
+    response.cache_control.private = True
+    response.cache_control.max_age = app.config['AUDIO_CLIP_TTL']
+    return response
+
+# 단어 뜻 캐시 설정
+app.config['WORD_CACHE_SIZE'] = int(os.environ.get('WORD_CACHE_SIZE', 5000))
+app.config['WORD_BATCH_LIMIT'] = int(os.environ.get('WORD_BATCH_LIMIT', 50))
+word_cache = LRUCache(maxsize=app.config['WORD_CACHE_SIZE'])
+
+# 화면의 단어는 공백 기준으로 나뉘므로 앞뒤 문장부호를 떼고 캐시 키로 사용
+WORD_STRIP_CHARS = ' \t\n.,!?~…"\'()[]{}:;·'
+
+def normalize_word(word):
+    return word.strip(WORD_STRIP_CHARS)
+
+def word_entry(word, meaning, explanation):
+    return {'word': word, 'meaning': meaning, 'explanation': explanation or ''}
+
+def word_definitions_query(words):
+    return WordDefinition.query.filter(WordDefinition.word.in_(words))
+
+def vocabulary_meanings_query(words):
+    """
+    사용자 단어장에 저장된 words의 뜻을 최근 저장한 것부터 읽는 쿼리 (공유 캐시를 채울 때 사용)
+    """
+    return VocabularyItem.query.filter(VocabularyItem.word.in_(words)).order_by(VocabularyItem.created_at.desc())
+
+def store_word_definitions(entries):
+    """
+    새로 알게 된 단어 뜻을 공유 캐시 테이블과 LRU에 저장하는 함수
+    """
+    if not entries:
+        return
+    for entry in entries:
+        word_cache.set(entry['word'], entry)
+    words = [entry['word'] for entry in entries]
+    existing = {row.word for row in word_definitions_query(words)}
+    new_rows = [
+        WordDefinition(word=entry['word'], meaning=entry['meaning'], explanation=entry['explanation'])
+        for entry in entries if entry['word'] not in existing
+    ]
+    if not new_rows:
+        return
+    try:
+        db.session.add_all(new_rows)
+        db.session.commit()
+    except IntegrityError:
+        # 다른 워커가 같은 단어를 먼저 저장한 경우
+        db.session.rollback()
+
+def lookup_cached_meanings(words):
+    """
+    LRU → WordDefinition → VocabularyItem 순서로 단어 뜻을 찾는 함수
+    찾은 결과 dict와 찾지 못한 단어 목록을 반환합니다.
+    """
+    found = {}
+    missing = []
+    for word in words:
+        cached = word_cache.get(word)
+        if cached is not None:
+            found[word] = cached
+        else:
+            missing.append(word)
+    if not missing:
+        return found, []
+
+    for row in word_definitions_query(missing):
+        found[row.word] = word_entry(row.word, row.meaning, row.explanation)
+        word_cache.set(row.word, found[row.word])
+
+    # 사용자들이 단어장에 저장한 뜻으로 공유 캐시를 채움
+    unseeded = [word for word in missing if word not in found]
+    if unseeded:
+        seeded = []
+        items = vocabulary_meanings_query(unseeded)
+        for item in items:
+            if item.word not in found:
+                found[item.word] = word_entry(item.word, item.meaning, item.explanation)
+                seeded.append(found[item.word])
+        store_word_definitions(seeded)
+
+    return found, [word for word in missing if word not in found]
+
+def fetch_word_meanings(words):
+    """
+    캐시에 없는 단어들의 뜻을 한 번의 gpt-4o-mini 호출로 가져오는 함수
+    """
+    response = llm_gateway.chat(
+        'word_meanings',
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": "You are a Korean-English dictionary. Provide structured information about the given Korean words."},
+            {"role": "user", "content": f"Provide information about each of these Korean words as a JSON array in the following format: [{{\"word\": \"Korean word exactly as given\", \"meaning\": \"English meaning\", \"explanation\": \"Detailed explanation in English\"}}]\n\nWords: {json.dumps(words, ensure_ascii=False)}"}
+        ]
+    )
+    content = response.choices[0].message.content
+
+    # Remove code block markers and extract JSON
+    json_content = re.search(r'\[.*\]', content, re.DOTALL)
+    if not json_content:
+        raise ValueError("No JSON array found in the response")
+
+    requested = set(words)
+    entries = []
+    for item in json.loads(json_content.group()):
+        word = normalize_word(item.get('word', ''))
+        if word in requested and item.get('meaning'):
+            entries.append(word_entry(word, item['meaning'], item.get('explanation')))
+    return entries
+
+def resolve_word_meanings(words):
+    """
+    캐시를 확인한 뒤 빠진 단어만 LLM으로 조회하고 결과를 캐시에 저장하는 함수
+    """
+    words = list(dict.fromkeys(normalize_word(word) for word in words if normalize_word(word)))
+    found, missing = lookup_cached_meanings(words)
+    if missing:
+        def fetch_and_store():
+            entries = fetch_word_meanings(missing)
+            store_word_definitions(entries)
+            return entries
+
+        entries = single_flight.do('word_meanings', 'gpt-4o-mini', json.dumps(missing, ensure_ascii=False), fetch_and_store)
+        for entry in entries:
+            # 다른 요청이 가져온 결과도 이 워커의 LRU에 채워 둠
+            word_cache.set(entry['word'], entry)
+            found[entry['word']] = entry
+    return found
+
 @app.route('/get_word_meaning', methods=['POST'])
 @login_required
 def get_word_meaning():
     word = request.json['word']
     try:
-        print(f"Requesting meaning for word: {word}")
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a Korean-English dictionary. Provide structured information about the given Korean word."},
-                {"role": "user", "content": f"Provide information about this Korean word in the following JSON format: {{\"word\": \"{word}\", \"meaning\": \"English meaning\", \"explanation\": \"Detailed explanation in English\"}}"}
-            ]
-        )
-        
-        print(f"Raw OpenAI response: {response}")
-        content = response.choices[0].message.content
-        print(f"Response content: {content}")
-        
-        # Remove code block markers and extract JSON
-        json_content = re.search(r'\{.*\}', content, re.DOTALL)
-        if json_content:
-            meaning_data = json.loads(json_content.group())
-        else:
-            raise ValueError("No JSON object found in the response")
-        
-        print(f"Parsed meaning data: {meaning_data}")
-        
+        meanings = resolve_word_meanings([word])
+        meaning_data = meanings.get(normalize_word(word))
+        if not meaning_data:
+            raise ValueError("No meaning found in the response")
         return jsonify(meaning_data)
     except Exception as e:
         print(f"Error getting word meaning: {str(e)}")
         return jsonify({'error': 'Failed to get word meaning'}), 500
+
+@app.route('/get_word_meanings', methods=['POST'])
+@login_required
+def get_word_meanings():
+    """
+    메시지에 나온 여러 단어의 뜻을 한 번에 조회하는 라우트
+    """
+    words = request.json.get('words') or []
+    if not isinstance(words, list):
+        return jsonify({'error': 'words must be a list'}), 400
+    words = [word for word in words if isinstance(word, str)][:app.config['WORD_BATCH_LIMIT']]
+    try:
+        return jsonify({'meanings': resolve_word_meanings(words)})
+    except Exception as e:
+        print(f"Error getting word meanings: {str(e)}")
+        return jsonify({'error': 'Failed to get word meanings'}), 500
     
 @app.route('/save_vocabulary', methods=['POST'])
 @login_required
@@ -421,11 +1069,14 @@ def save_vocabulary():
         return jsonify({'success': False, 'error': 'Failed to save vocabulary'}), 500
 
 
+def vocabulary_query(user_id):
+    return VocabularyItem.query.filter_by(user_id=user_id).order_by(VocabularyItem.created_at.desc())
+
 @app.route('/get_vocabulary', methods=['GET'])
 @login_required
 def get_vocabulary():
     try:
-        items = VocabularyItem.query.filter_by(user_id=current_user.id).order_by(VocabularyItem.created_at.desc()).all()
+        items = vocabulary_query(current_user.id).all()
         vocabulary = [{
             'word': item.word,
             'meaning': item.meaning,
@@ -438,22 +1089,95 @@ def get_vocabulary():
         return jsonify({'error': f'Failed to fetch vocabulary: {str(e)}'}), 500
 
 
+def ready_news_query():
+    """
+    아직 꺼내지 않은 뉴스를 준비된 순서대로 읽는 쿼리
+    """
+    return NewsItem.query.filter_by(consumed_at=None).order_by(NewsItem.created_at)
+
+def known_news_urls_query(urls):
+    return db.session.query(NewsItem.url).filter(NewsItem.url.in_(urls))
+
+def prefetch_news():
+    """
+    준비된 뉴스가 NEWS_PREFETCH_COUNT개가 될 때까지 크롤링·요약해서 NewsItem에 저장하는 함수
+    """
+    missing = app.config['NEWS_PREFETCH_COUNT'] - ready_news_query().count()
+    if missing <= 0:
+        return 0
+
+    article_urls = crawl_main(app.config['NEWS_LIST_URL'])
+    known_urls = {url for (url,) in known_news_urls_query(article_urls)}
+    for url in known_urls:
+        news_crawler.mark_seen(url)
+
+    # 기사 본문은 동시에 받아오고, 먼저 도착한 기사부터 요약
+    added = 0
+    for url, news_content in news_crawler.scrape_articles(article_urls, limit=missing):
+        # 음성도 미리 합성해서 TTS 캐시에 넣어 둠
+        speech_pipeline = SpeechPipeline(synthesize_speech, tts_executor)
+        messages = summarize_article(news_content, speech_pipeline)
+        for _ in speech_pipeline.results():
+            pass
+
+        db.session.add(NewsItem(url=url, messages=json.dumps(messages, ensure_ascii=False)))
+        try:
+            db.session.commit()
+            added += 1
+        except IntegrityError:
+            # 다른 워커가 같은 기사를 먼저 저장한 경우
+            db.session.rollback()
+    return added
+
+def pop_ready_news():
+    """
+    가장 먼저 준비된 뉴스를 하나 꺼내는 함수
+    여러 워커가 동시에 꺼내도 같은 뉴스는 한 번만 반환됩니다.
+    """
+    for _ in range(3):
+        item = ready_news_query().first()
+        if not item:
+            return None
+        claimed = db.session.execute(
+            update(NewsItem)
+            .where(NewsItem.id == item.id, NewsItem.consumed_at.is_(None))
+            .values(consumed_at=datetime.utcnow())
+        ).rowcount
+        db.session.commit()
+        if claimed:
+            return json.loads(item.messages)
+    return None
+
+def run_news_prefetch():
+    added = prefetch_news()
+    if added:
+        print(f"Prefetched {added} news items")
+    return added
+
 @app.route('/get_news', methods=['GET'])
 @login_required
 def get_news():
-    news_summary = get_news_summary()
-    active_conversation = Conversation.query.filter_by(user_id=current_user.id, end_time=None).first()
-    if not active_conversation:
-        active_conversation = Conversation(user_id=current_user.id)
-        db.session.add(active_conversation)
-        db.session.commit()
+    speech_pipeline = SpeechPipeline(synthesize_speech, tts_executor)
+    news_summary = pop_ready_news()
+    if news_summary is None:
+        # 준비된 뉴스가 없으면 예전처럼 요청 안에서 바로 크롤링
+        news_summary = get_news_summary(speech_pipeline)
+    else:
+        # 미리 합성해 둔 음성이 TTS 캐시에서 바로 나옴
+        for news_message in news_summary:
+            speech_pipeline.feed(news_message + '\n')
+        speech_pipeline.close()
+    if app.config['NEWS_PREFETCH_ENABLED']:
+        # 리더 워커에서만 받아들여지고, 요청마다가 아니라 NEWS_PREFETCH_TRIGGER_INTERVAL에 한 번만 앞당김
+        job_scheduler.run_now('news-prefetch', min_interval=app.config['NEWS_PREFETCH_TRIGGER_INTERVAL'])
+    active_conversation = get_active_conversation(current_user.id)
     
     for news_message in news_summary:
         message = Message(conversation_id=active_conversation.id, content=news_message, is_user=False, user_id=current_user.id)
         db.session.add(message)
     
     db.session.commit()
-    return jsonify({"messages": news_summary})
+    return jsonify({"messages": news_summary, **speech_payload(speech_pipeline, current_user.id)})
 
 @app.route('/')
 def home():
@@ -462,13 +1186,19 @@ def home():
     """
     return render_template('index.html')
 
+def user_query(**filters):
+    """
+    username, email, reset_token처럼 고유 인덱스가 있는 컬럼으로 사용자를 찾는 쿼리
+    """
+    return User.query.filter_by(**filters)
+
 @app.route('/login', methods=['POST'])
 def login():
     """
     로그인 처리 라우트
     """
     data = request.json
-    user = User.query.filter_by(username=data['username']).first()
+    user = user_query(username=data['username']).first()
     if user and check_password_hash(user.password, data['password']):
         login_user(user, remember=True)
         return jsonify({"success": True, "username": user.username})
@@ -502,11 +1232,11 @@ def signup():
     email = data['email']
     password = data['password']
 
-    existing_user = User.query.filter_by(email=email).first()
+    existing_user = user_query(email=email).first()
     if existing_user:
         return jsonify({"success": False, "error": "email_taken"})
     
-    existing_user = User.query.filter_by(username=username).first()
+    existing_user = user_query(username=username).first()
     if existing_user:
         return jsonify({"success": False, "error": "username_taken"})
     
@@ -518,12 +1248,41 @@ def signup():
     return jsonify({"success": True, "message": "User created successfully"})
 
 # analyze_korean 함수 수정
+def shared_report_query(text):
+    """
+    같은 문장을 누가 분석했든 가장 최근 리포트를 찾는 쿼리 (분석 결과 재사용)
+    """
+    return Report.query.filter_by(original_text=text).order_by(Report.created_at.desc())
+
+def own_report_query(user_id, text):
+    return Report.query.filter_by(user_id=user_id, original_text=text)
+
+def user_reports_query(user_id):
+    return Report.query.filter_by(user_id=user_id).order_by(Report.created_at.desc())
+
+def report_query(report_id):
+    return Report.query.filter_by(id=report_id)
+
 @app.route('/analyze_korean', methods=['POST'])
 @login_required
 def analyze_korean():
     text = request.json['text']
+    analysis = None
     try:
-        response = client.chat.completions.create(
+        analysis_dict = llm_memo.get('analyze_korean', ANALYZE_PROMPT_VERSION, text)
+        if analysis_dict is None:
+            # 다른 워커나 이전 실행에서 저장된 분석 결과가 있으면 재사용
+            report = shared_report_query(text).first()
+            if report:
+                analysis_dict = json.loads(report.analysis)
+                llm_memo.set('analyze_korean', ANALYZE_PROMPT_VERSION, text, analysis_dict)
+        if analysis_dict is not None:
+            if analysis_dict['errors'] and not own_report_query(current_user.id, text).first():
+                save_analysis(current_user.id, text, json.dumps(analysis_dict))
+            return jsonify(analysis_dict)
+
+        response = llm_gateway.chat(
+            'analyze_korean',
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": """Analyze the given Korean sentence and return the result in the following JSON format:
@@ -545,12 +1304,8 @@ def analyze_korean():
             ]
         )
         analysis = response.choices[0].message.content
-        
-        # 여기에 로그 출력 코드를 추가합니다
-        print(f"Raw OpenAI response: {response}")
-        print(f"Parsed analysis: {analysis}")
-        
         analysis_dict = json.loads(analysis)
+        llm_memo.set('analyze_korean', ANALYZE_PROMPT_VERSION, text, analysis_dict)
         
         # 교정이 필요한 경우에만 저장
         if analysis_dict['errors']:
@@ -561,6 +1316,7 @@ def analyze_korean():
         print(f"JSON Decode Error. Raw response: {analysis}")
         return jsonify({'error': 'Invalid analysis format'}), 500
     except Exception as e:
+        db.session.rollback()
         print(f"Analysis error: {str(e)}")
         return jsonify({'error': 'Analysis failed'}), 500
 
@@ -568,7 +1324,7 @@ def analyze_korean():
 @app.route('/get_reports', methods=['GET'])
 @login_required
 def get_reports():
-    reports = Report.query.filter_by(user_id=current_user.id).order_by(Report.created_at.desc()).all()
+    reports = user_reports_query(current_user.id).all()
     return jsonify([{
         'id': report.id,
         'original_text': report.original_text,
@@ -580,87 +1336,262 @@ def get_reports():
 @app.route('/get_analysis/<int:report_id>', methods=['GET'])
 @login_required
 def get_analysis(report_id):
-    report = Report.query.get_or_404(report_id)
+    report = report_query(report_id).first_or_404()
     if report.user_id != current_user.id:
         abort(403)  # 권한 없음
     return jsonify(json.loads(report.analysis))
 
+def active_conversation_query(user_id):
+    return Conversation.query.filter_by(user_id=user_id, end_time=None)
+
+def get_active_conversation(user_id):
+    """
+    사용자의 진행 중인 대화를 가져오거나 새로 생성하는 함수
+    """
+    active_conversation = active_conversation_query(user_id).first()
+    if not active_conversation:
+        active_conversation = Conversation(user_id=user_id)
+        db.session.add(active_conversation)
+        db.session.commit()
+    return active_conversation
+
+# 프롬프트 설정
+app.config['PROMPT_TOKEN_BUDGET'] = int(os.environ.get('PROMPT_TOKEN_BUDGET', 3000))
+# 빈 값이면 tiktoken 인코딩 파일을 받지 않고 어림값으로 셈
+app.config['PROMPT_TOKENIZER'] = os.environ.get('PROMPT_TOKENIZER', 'o200k_base')
+
+# 매 요청 똑같은 프리픽스 (프롬프트 캐시 대상) - 요청마다 바뀌는 내용을 여기에 넣지 않음
+CHAT_STATIC_PROMPT = f"""{system_message['content']}
+
+답변 지침:
+아래 추가 컨텍스트(사용자 관심사, 감정 상태, 평소 관심사와 감정, 이전 대화 요약, 최근 대화)와 사용자 메시지를 고려하여 답변해주세요. 문맥을 크게 벗어나지 않는 영역에서 다른 주제를 꺼냅니다. 길게 이야기 하지 않습니다(60자이내). 메세지가 길다면 짧게 나누어 보냅니다. 같은 단어를 여러번 반복하지 않습니다."""
+
+token_counter = TokenCounter(app.config['PROMPT_TOKENIZER'] or None)
+chat_prompt_builder = PromptBuilder(
+    CHAT_STATIC_PROMPT,
+    token_counter,
+    budget=app.config['PROMPT_TOKEN_BUDGET'],
+    context_budget=app.config['MEMORY_CONTEXT_TOKEN_BUDGET'],
+)
+
+def build_chat_messages(user_id, conversation_id, user_message_content):
+    """
+    대화 메모리, 사용자 프로필과 이번 메시지 분석 결과로 gpt-4o에 보낼
+    (메시지 목록, 프롬프트 토큰 수, (관심사, 감정))을 만드는 함수
+    이번 사용자 메시지를 저장하기 전에 호출해야 최근 대화에 중복으로 들어가지 않습니다.
+    분석 결과는 사용자 메시지를 저장할 때 update_user_profile로 프로필에 반영합니다.
+    """
+    summary, turns = get_conversation_memory(conversation_id)
+    preferences, sentiment = analyze_message(user_message_content)
+    profile = get_user_profile(user_id)
+    messages, prompt_tokens = chat_prompt_builder.build(
+        user_message_content, summary, turns, preferences, sentiment,
+        usual_preferences=profile.top_categories(app.config['PROFILE_TOP_CATEGORIES']),
+        usual_sentiment=profile.mood(),
+    )
+    return messages, prompt_tokens, (preferences, sentiment)
+
+# 스트리밍 응답에서 아직 닫히지 않은 <response> 태그 조각을 찾기 위한 패턴
+RESPONSE_TAG_PATTERN = re.compile(r'</?response>')
+PARTIAL_TAG_PATTERN = re.compile(r'<[^>]{0,9}$')
+
+def stream_reply_deltas(messages, usage=None, site='chat'):
+    """
+    gpt-4o 스트리밍 응답에서 <response> 태그를 뺀 텍스트 조각을 순서대로 돌려주는 제너레이터
+    usage 딕셔너리를 넘기면 첫 토큰 도착 시각과 토큰 사용량을 채워 줍니다.
+    """
+    if usage is None:
+        usage = {}
+    raw_content = ""
+    sent_length = 0
+    stream = llm_gateway.chat_stream(
+        site,
+        model="gpt-4o",
+        messages=messages,
+        max_tokens=100,
+        stream_options={"include_usage": True},
+    )
+    for chunk in stream:
+        if chunk.usage:
+            usage.update(usage_from_response(chunk.usage))
+        if not chunk.choices or not chunk.choices[0].delta.content:
+            continue
+        usage.setdefault('first_token_at', time.perf_counter())
+        raw_content += chunk.choices[0].delta.content
+        cleaned = RESPONSE_TAG_PATTERN.sub('', raw_content)
+        # 태그가 여러 조각으로 나뉘어 도착할 수 있으므로 끝부분의 미완성 태그는 보류
+        partial = PARTIAL_TAG_PATTERN.search(cleaned)
+        safe_length = partial.start() if partial else len(cleaned)
+        if safe_length > sent_length:
+            yield cleaned[sent_length:safe_length]
+            sent_length = safe_length
+
+    cleaned = RESPONSE_TAG_PATTERN.sub('', raw_content)
+    if len(cleaned) > sent_length:
+        yield cleaned[sent_length:]
+
 @app.route('/chat', methods=['POST'])
 @login_required
 def chat():
     user_message_content = request.json['message']
     
     try:
-        active_conversation = Conversation.query.filter_by(user_id=current_user.id, end_time=None).first()
-        if not active_conversation:
-            active_conversation = Conversation(user_id=current_user.id)
-            db.session.add(active_conversation)
-            db.session.commit()
+        with phase('db'):
+            active_conversation = get_active_conversation(current_user.id)
+
+        with phase('context'):
+            messages, prompt_tokens, analysis = build_chat_messages(current_user.id, active_conversation.id, user_message_content)
 
         user_message = Message(conversation_id=active_conversation.id, content=user_message_content, is_user=True, user_id=current_user.id)
         db.session.add(user_message)
 
-        recent_context = get_recent_context(active_conversation.id)
-        
-        preferences, sentiment = analyze_message(user_message_content)
-
-        prompt = f"""최근 대화 컨텍스트:
-{recent_context}
+        # 문장이 완성될 때마다 TTS를 시작해서 응답 생성과 음성 합성을 겹쳐 진행
+        speech_pipeline = SpeechPipeline(synthesize_speech, tts_executor)
+        reply_parts = []
+        usage = {}
+        started = time.perf_counter()
+        with phase('llm'):
+            for delta in stream_reply_deltas(messages, usage):
+                reply_parts.append(delta)
+                speech_pipeline.feed(delta)
+        speech_pipeline.close()
+        ai_message_content = ''.join(reply_parts)
+
+        with phase('db'):
+            ai_message = Message(conversation_id=active_conversation.id, content=ai_message_content, is_user=False, user_id=current_user.id)
+            db.session.add(ai_message)
+            record_llm_usage('chat', 'gpt-4o', usage, started, current_user.id, prompt_tokens)
+            # 쓰기 잠금을 LLM 응답 동안 잡지 않도록 프로필은 커밋 직전에 갱신
+            update_user_profile(current_user.id, *analysis)
+            db.session.commit()
+        schedule_summary_update(active_conversation.id)
 
-사용자 메시지: {user_message_content}
+        # 응답 생성이 끝난 뒤 남은 문장의 음성 합성을 기다리는 시간
+        with phase('tts'):
+            audio = speech_payload(speech_pipeline, current_user.id)
 
-위 컨텍스트와 사용자 메시지를 고려하여 답변해주세요. 문맥을 크게 벗어나지 않는 영역에서 다른 주제를 꺼냅니다. 길게 이야기 하지 않습니다(60자이내). 메세지가 길다면 짧게 나누어 보냅니다. 같은 단어를 여러번 반복하지 않습니다.
-"""
+        return jsonify({
+            'message': ai_message_content,
+            **audio,
+            'success': True
+        })
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error in chat processing: {str(e)}")
+        return jsonify({'message': 'Sorry, an error occurred.', 'success': False}), 500
 
-        messages = [
-            {"role": "system", "content": f"{system_message['content']}\n\n추가 컨텍스트:\n사용자 관심사: {', '.join(preferences)}\n감정 상태: {sentiment}"},
-            {"role": "user", "content": prompt}
-        ]
+def sse_event(event, data):
+    """
+    Server-Sent Events 형식의 이벤트 문자열을 만드는 함수
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=messages,
-            max_tokens=100
-        )
-        ai_message_content = response.choices[0].message.content
+def speech_events(speech_pipeline, user_id, block=True):
+    """
+    합성이 끝난 문장 오디오를 순서대로 SSE 이벤트로 만드는 제너레이터
+    /chat 과 같은 /audio/<clip_id> 엔드포인트를 쓰도록 문장마다 클립을 하나씩 만듭니다.
+    """
+    for _, key in speech_pipeline.results(block=block):
+        yield sse_event('audio_url', {'url': url_for('clip_audio', clip_id=audio_clips.create(user_id, [key]))})
 
-        ai_message_content = re.sub(r'</?response>', '', ai_message_content)
+@app.route('/chat_stream', methods=['POST'])
+@login_required
+def chat_stream():
+    """
+    LLM 토큰과 TTS 오디오 조각을 도착하는 대로 SSE로 전달하는 /chat 스트리밍 라우트
+    """
+    user_message_content = request.json['message']
+    user_id = current_user.id
 
-        ai_message = Message(conversation_id=active_conversation.id, content=ai_message_content, is_user=False, user_id=current_user.id)
-        db.session.add(ai_message)
-        db.session.commit()
+    try:
+        with phase('db'):
+            active_conversation = get_active_conversation(user_id)
+            conversation_id = active_conversation.id
 
-        try:
-            speech_response = client.audio.speech.create(
-                model="tts-1",
-                voice="nova",
-                input=ai_message_content,
-                speed=1.0
-            )
-            audio_base64 = base64.b64encode(speech_response.content).decode('utf-8')
-        except Exception as e:
-            print(f"Error in speech generation: {str(e)}")
-            audio_base64 = None
+        with phase('context'):
+            messages, prompt_tokens, analysis = build_chat_messages(user_id, conversation_id, user_message_content)
 
-        return jsonify({
-            'message': ai_message_content,
-            'audio': audio_base64,
-            'success': True
-        })
+        with phase('db'):
+            user_message = Message(conversation_id=conversation_id, content=user_message_content, is_user=True, user_id=user_id)
+            db.session.add(user_message)
+            update_user_profile(user_id, *analysis)
+            db.session.commit()
     except Exception as e:
         db.session.rollback()
-        print(f"Error in chat processing: {str(e)}")
+        print(f"Error in chat stream setup: {str(e)}")
         return jsonify({'message': 'Sorry, an error occurred.', 'success': False}), 500
 
+    def generate():
+        speech_pipeline = SpeechPipeline(synthesize_speech, tts_executor)
+        reply_parts = []
+        usage = {}
+        started = time.perf_counter()
+        try:
+            for delta in stream_reply_deltas(messages, usage, site='chat_stream'):
+                reply_parts.append(delta)
+                speech_pipeline.feed(delta)
+                yield sse_event('text', {'delta': delta})
+                # 앞 문장의 음성이 먼저 준비되면 나머지 텍스트를 기다리지 않고 보냄
+                yield from speech_events(speech_pipeline, user_id, block=False)
+            speech_pipeline.close()
+            ai_message_content = ''.join(reply_parts)
+
+            ai_message = Message(conversation_id=conversation_id, content=ai_message_content, is_user=False, user_id=user_id)
+            db.session.add(ai_message)
+            record_llm_usage('chat_stream', 'gpt-4o', usage, started, user_id, prompt_tokens)
+            db.session.commit()
+            schedule_summary_update(conversation_id)
+            yield sse_event('text_done', {'message': ai_message_content})
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error in chat stream: {str(e)}")
+            yield sse_event('error', {'message': 'Sorry, an error occurred.', 'success': False})
+            return
+
+        yield from speech_events(speech_pipeline, user_id)
+        yield sse_event('done', {'success': True})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+# 사용 시간 쓰기 버퍼 설정
+app.config['USAGE_FLUSH_INTERVAL'] = float(os.environ.get('USAGE_FLUSH_INTERVAL', 10))
+# 요청 하나로 더할 수 있는 최대 초 (클라이언트 보고 주기보다 넉넉하게)
+app.config['USAGE_MAX_DELTA'] = int(os.environ.get('USAGE_MAX_DELTA', 300))
+
+def flush_usage_time(pending):
+    """
+    사용자별 사용 시간 증가분을 UPDATE 한 번(executemany)으로 반영하는 함수
+    """
+    user_table = User.__table__
+    with app.app_context():
+        db.session.execute(
+            update(user_table)
+            .where(user_table.c.id == bindparam('user_id'))
+            .values(total_usage_time=func.coalesce(user_table.c.total_usage_time, 0) + bindparam('seconds')),
+            [{'user_id': user_id, 'seconds': seconds} for user_id, seconds in pending.items()],
+        )
+        db.session.commit()
+
+usage_buffer = UsageBuffer(flush_usage_time, interval=app.config['USAGE_FLUSH_INTERVAL'])
+
 @app.route('/update_usage_time', methods=['POST'])
 @login_required
 def update_usage_time():
     """
-    사용자의 총 사용 시간을 업데이트하는 라우트
+    사용자의 총 사용 시간에 지난 보고 이후 늘어난 시간(초)을 더하는 라우트
+    바로 DB에 쓰지 않고 버퍼에 모아서 주기적으로 반영합니다. (navigator.sendBeacon 요청도 받음)
     """
-    data = request.json
-    current_user.total_usage_time += data['time']
-    db.session.commit()
+    data = request.get_json(force=True, silent=True) or {}
+    seconds = data.get('time')
+    if not isinstance(seconds, int) or isinstance(seconds, bool) or seconds < 0:
+        return jsonify({"success": False, "error": "Invalid time"}), 400
+    seconds = min(seconds, app.config['USAGE_MAX_DELTA'])
+    if seconds:
+        usage_buffer.add(current_user.id, seconds)
     return jsonify({"success": True})
 
 @app.route('/translate', methods=['POST'])
@@ -670,45 +1601,86 @@ def translate():
     텍스트 번역을 위한 라우트
     """
     text = request.json['text']
-    try:
-        response = client.chat.completions.create(
+    translation = llm_memo.get('translate', TRANSLATE_PROMPT_VERSION, text)
+    if translation is not None:
+        return jsonify({'translation': translation})
+
+    def fetch_translation():
+        response = llm_gateway.chat(
+            'translate',
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": "You are a translator. Translate the given Korean text to English."},
                 {"role": "user", "content": f"Translate this to English: {text}"}
             ]
         )
-        translation = response.choices[0].message.content
+        return response.choices[0].message.content
+
+    try:
+        translation = single_flight.do('translate', TRANSLATE_PROMPT_VERSION, text, fetch_translation)
+        llm_memo.set('translate', TRANSLATE_PROMPT_VERSION, text, translation)
         return jsonify({'translation': translation})
     except Exception as e:
         print(f"Translation error: {str(e)}")
         return jsonify({'error': 'Translation failed'}), 500
 
+app.config['HISTORY_PAGE_SIZE'] = int(os.environ.get('HISTORY_PAGE_SIZE', 50))
+app.config['HISTORY_MAX_PAGE_SIZE'] = int(os.environ.get('HISTORY_MAX_PAGE_SIZE', 200))
+
+def encode_history_cursor(message):
+    raw = f"{message.timestamp.isoformat()}|{message.id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def decode_history_cursor(cursor):
+    timestamp, message_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+    return datetime.fromisoformat(timestamp), int(message_id)
+
+def history_page_query(user_id, before=None, date=None, limit=None):
+    """
+    사용자 메시지를 (timestamp, id) 커서 before 이전부터 최신순으로 limit개 읽는 쿼리
+    date가 있으면 그 날짜 이전 메시지만 읽습니다.
+    """
+    query = Message.query.filter(Message.user_id == user_id)
+    if before:
+        query = query.filter(tuple_(Message.timestamp, Message.id) < before)
+    if date:
+        query = query.filter(Message.timestamp < date)
+    return query.order_by(Message.timestamp.desc(), Message.id.desc()).limit(limit)
+
 @app.route('/get_history', methods=['GET'])
 @login_required
 def get_history():
     """
-    사용자의 대화 기록을 가져오는 라우트
+    사용자의 대화 기록을 최신 메시지부터 페이지 단위로 가져오는 라우트
+    (timestamp, id) 커서로 다음 페이지를 이어서 조회하며, 한 페이지는 쿼리 한 번으로 읽습니다.
     """
+    limit = min(request.args.get('limit', app.config['HISTORY_PAGE_SIZE'], type=int), app.config['HISTORY_MAX_PAGE_SIZE'])
+    if limit <= 0:
+        return jsonify({'error': 'limit must be positive'}), 400
+
+    before = request.args.get('before')
+    try:
+        cursor = decode_history_cursor(before) if before else None
+    except (ValueError, UnicodeDecodeError):
+        return jsonify({'error': 'Invalid cursor'}), 400
     date = request.args.get('date')
-    
-    query = Conversation.query.filter_by(user_id=current_user.id)
-    if date:
-        query = query.filter(Conversation.start_time < datetime.strptime(date, '%Y-%m-%d'))
-    
-    conversations = query.order_by(desc(Conversation.start_time)).limit(10).all()
-    
+    date = datetime.strptime(date, '%Y-%m-%d') if date else None
+
+    messages = history_page_query(current_user.id, cursor, date, limit + 1).all()
+    has_more = len(messages) > limit
+    messages = messages[:limit]
+    next_cursor = encode_history_cursor(messages[-1]) if has_more else None
+
+    # 페이지 안에서는 오래된 메시지부터 날짜별로 묶음
+    messages.reverse()
     history = []
-    for conv in conversations:
-        messages = sorted(conv.messages, key=attrgetter('timestamp'))
-        grouped_messages = groupby(messages, key=lambda m: m.timestamp.astimezone(KST).date())
-        for date, msgs in grouped_messages:
-            history.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'messages': [{'content': msg.content, 'is_user': msg.is_user, 'timestamp': msg.timestamp.strftime('%H:%M')} for msg in msgs]
-            })
-    
-    return jsonify({'history': history})
+    for date, msgs in groupby(messages, key=lambda m: m.timestamp.astimezone(KST).date()):
+        history.append({
+            'date': date.strftime('%Y-%m-%d'),
+            'messages': [{'content': msg.content, 'is_user': msg.is_user, 'timestamp': msg.timestamp.strftime('%H:%M')} for msg in msgs]
+        })
+
+    return jsonify({'history': history, 'next_cursor': next_cursor})
 
 def send_async_email(app, msg):
     """
@@ -742,7 +1714,7 @@ def request_reset():
     """
     try:
         email = request.json.get('email')
-        user = User.query.filter_by(email=email).first()
+        user = user_query(email=email).first()
         if user:
             user.set_reset_token()
             send_password_reset_email(user)
@@ -757,7 +1729,7 @@ def reset_password_form(token):
     """
     비밀번호 재설정 폼을 표시하는 라우트
     """
-    user = User.query.filter_by(reset_token=token).first()
+    user = user_query(reset_token=token).first()
     if user and user.check_reset_token(token):
         return render_template('reset_password.html', token=token)
     return "Invalid or expired token", 400
@@ -769,7 +1741,7 @@ def reset_password():
     """
     token = request.json.get('token')
     new_password = request.json.get('new_password')
-    user = User.query.filter_by(reset_token=token).first()
+    user = user_query(reset_token=token).first()
     if user and user.check_reset_token(token):
         user.password = generate_password_hash(new_password)
         user.reset_token = None
@@ -778,24 +1750,181 @@ def reset_password():
         return jsonify({"message": "Password reset successful"})
     return jsonify({"message": "Invalid or expired token"}), 400
 
-@app.route('/admin/backup_db')
+# DB 백업 설정
+app.config['BACKUP_DIR'] = os.environ.get('BACKUP_DIR', os.path.join(app.instance_path, 'backups'))
+app.config['BACKUP_KEEP'] = int(os.environ.get('BACKUP_KEEP', 7))
+app.config['BACKUP_PAGES_PER_STEP'] = int(os.environ.get('BACKUP_PAGES_PER_STEP', 1024))
+app.config['BACKUP_TIME'] = os.environ.get('BACKUP_TIME', '03:00')
+
+def create_backup_manager():
+    """
+    SQLite DB일 때만 백업 관리자를 만드는 함수 (서버 DB는 DB 자체 백업 도구를 사용)
+    """
+    with app.app_context():
+        if db.engine.dialect.name != 'sqlite':
+            return None
+        db_path = db.engine.url.database
+    return BackupManager(
+        db_path,
+        app.config['BACKUP_DIR'],
+        keep=app.config['BACKUP_KEEP'],
+        pages_per_step=app.config['BACKUP_PAGES_PER_STEP'],
+    )
+
+backup_manager = create_backup_manager()
+backup_executor = ThreadPoolExecutor(max_workers=1)
+
+def run_in_os_thread(func):
+    """
+    gevent 워커에서는 func를 허브의 스레드 풀(실제 OS 스레드)에서 실행하고 결과를 반환하는 함수
+    기다리는 동안 현재 greenlet만 멈추고 다른 요청은 계속 처리됩니다. gevent가 아니면 그냥 실행합니다.
+    """
+    if not gevent_monkey.is_module_patched('threading'):
+        return func()
+    return gevent.get_hub().threadpool.apply(func)
+
+def run_db_backup():
+    if backup_manager is None:
+        print("Skipping database backup: not a SQLite database")
+        return
+    # sqlite backup API와 gzip 압축은 C 코드 안에서 오래 돌면서 gevent에 양보하지 않으므로
+    # greenlet에서 바로 돌리면 백업이 끝날 때까지 워커의 모든 요청이 멈춤
+    run_in_os_thread(backup_manager.run)
+
+def start_db_backup():
+    """
+    백업을 백그라운드에서 시작하는 함수 (이미 진행 중이면 시작하지 않음)
+    """
+    if backup_manager.is_running():
+        return False
+    backup_executor.submit(record_job_run, 'db-backup', run_db_backup)
+    return True
+
+def backup_status():
+    return {'status': backup_manager.status(), 'snapshots': backup_manager.snapshots()}
+
+@app.route('/admin/backup_db', methods=['GET', 'POST'])
 @login_required
 def backup_db():
     """
     데이터베이스 백업을 위한 관리자 라우트
+    GET: 완료된 스냅숏(기본은 최신, ?name= 으로 선택)을 Range 요청을 지원하며 내려줍니다.
+         스냅숏이 하나도 없으면 백업을 시작하고 202를 반환합니다.
+    POST: 새 스냅숏 만들기를 백그라운드에서 시작합니다.
     """
     if not current_user.is_admin:
         return jsonify({"error": "Unauthorized access"}), 403
-    
-    try:
-        db_path = os.path.join(app.instance_path, 'users.db')
-        
-        if not os.path.exists(db_path):
-            return jsonify({"error": "Database file not found"}), 404
+    if backup_manager is None:
+        return jsonify({"error": "Backups are only available for SQLite databases"}), 404
+
+    if request.method == 'POST':
+        started = start_db_backup()
+        return jsonify({'started': started, **backup_status()}), 202
+
+    name = request.args.get('name')
+    snapshot_path = backup_manager.snapshot_path(name)
+    if snapshot_path is None:
+        if name:
+            return jsonify({"error": "Backup not found"}), 404
+        started = start_db_backup()
+        return jsonify({'started': started, **backup_status()}), 202
+    return send_file(
+        snapshot_path,
+        mimetype='application/gzip',
+        as_attachment=True,
+        download_name=os.path.basename(snapshot_path),
+        conditional=True,
+        max_age=0,
+    )
 
-        return send_file(db_path, as_attachment=True, download_name='users.db')
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+@app.route('/admin/backups')
+@login_required
+def list_backups():
+    """
+    백업 진행 상황과 보관 중인 스냅숏 목록을 확인하는 관리자 라우트
+    """
+    if not current_user.is_admin:
+        return jsonify({"error": "Unauthorized access"}), 403
+    if backup_manager is None:
+        return jsonify({"error": "Backups are only available for SQLite databases"}), 404
+    return jsonify(backup_status())
+
+@app.route('/admin/cache_stats')
+@login_required
+def cache_stats():
+    """
+    TTS/단어/번역·분석 캐시 적중률과 사용량, 동시 요청 합치기 현황을 확인하는 관리자 라우트
+    """
+    if not current_user.is_admin:
+        return jsonify({"error": "Unauthorized access"}), 403
+    return jsonify({
+        'tts': tts_cache.stats(),
+        'words': word_cache.stats(),
+        'llm_memo': llm_memo.stats(),
+        'usage_buffer': usage_buffer.stats(),
+        'single_flight': single_flight.stats(),
+    })
+
+def llm_usage_query(since):
+    """
+    since 이후의 LLM 호출을 라우트/모델별로 모은 토큰 사용량과 평균 지연 시간 쿼리
+    """
+    return (
+        db.session.query(
+            LLMUsage.route,
+            LLMUsage.model,
+            func.count(LLMUsage.id),
+            func.sum(LLMUsage.prompt_tokens),
+            func.sum(LLMUsage.cached_tokens),
+            func.sum(LLMUsage.completion_tokens),
+            func.avg(LLMUsage.latency_ms),
+            func.avg(LLMUsage.first_token_ms),
+        )
+        .filter(LLMUsage.created_at >= since)
+        .group_by(LLMUsage.route, LLMUsage.model)
+    )
+
+@app.route('/admin/llm_usage')
+@login_required
+def llm_usage_stats():
+    """
+    최근 N일(기본 7일) 동안의 라우트/모델별 LLM 토큰 사용량과 평균 지연 시간을 확인하는 관리자 라우트
+    """
+    if not current_user.is_admin:
+        return jsonify({"error": "Unauthorized access"}), 403
+    since = datetime.utcnow() - timedelta(days=request.args.get('days', 7, type=int))
+    rows = llm_usage_query(since).all()
+    return jsonify({'usage': [{
+        'route': route,
+        'model': model,
+        'calls': calls,
+        'prompt_tokens': prompt_tokens or 0,
+        'cached_tokens': cached_tokens or 0,
+        'completion_tokens': completion_tokens or 0,
+        'avg_latency_ms': round(avg_latency or 0),
+        'avg_first_token_ms': round(avg_first_token) if avg_first_token is not None else None,
+    } for route, model, calls, prompt_tokens, cached_tokens, completion_tokens, avg_latency, avg_first_token in rows]})
+
+@app.route('/admin/llm_gateway')
+@login_required
+def llm_gateway_stats():
+    """
+    이 워커의 호출 위치별 OpenAI 호출 수/오류/재시도/지연 시간과 모델별 서킷 상태를 확인하는 관리자 라우트
+    """
+    if not current_user.is_admin:
+        return jsonify({"error": "Unauthorized access"}), 403
+    return jsonify(llm_gateway.stats())
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """
+    모든 워커의 요청/단계/DB 쿼리/OpenAI 호출·토큰 지표를 Prometheus 텍스트 형식으로 내보내는 관리자 라우트
+    """
+    token = app.config['METRICS_TOKEN']
+    authorized = bool(token) and secrets.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}")
+    if not authorized and not (current_user.is_authenticated and current_user.is_admin):
+        return jsonify({"error": "Unauthorized access"}), 403
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
 
 @click.command('create-admin')
 @with_appcontext
@@ -805,7 +1934,7 @@ def create_admin_command():
     email = click.prompt('Enter admin email', type=str)
     password = click.prompt('Enter admin password', type=str, hide_input=True, confirmation_prompt=True)
     
-    existing_user = User.query.filter_by(email=email).first()
+    existing_user = user_query(email=email).first()
     if existing_user:
         if click.confirm('User with this email already exists. Do you want to make this user an admin?'):
             existing_user.is_admin = True
@@ -821,57 +1950,496 @@ def create_admin_command():
 
 app.cli.add_command(create_admin_command)
 
+@click.command('seed-word-cache')
+@with_appcontext
+def seed_word_cache_command():
+    """단어장에 저장된 뜻으로 공유 단어 캐시를 채우는 CLI 명령"""
+    existing = {word for (word,) in db.session.query(WordDefinition.word)}
+    new_rows = []
+    items = db.session.query(VocabularyItem.word, VocabularyItem.meaning, VocabularyItem.explanation)
+    for word, meaning, explanation in items.order_by(VocabularyItem.created_at.desc()).yield_per(500):
+        word = normalize_word(word)
+        if not word or word in existing:
+            continue
+        new_rows.append(WordDefinition(word=word, meaning=meaning, explanation=explanation or ''))
+        existing.add(word)
+    db.session.add_all(new_rows)
+    db.session.commit()
+    click.echo(f'Seeded {len(new_rows)} word definitions')
+
+app.cli.add_command(seed_word_cache_command)
+
+def profile_backfill_page(after, limit):
+    """
+    (user_id, timestamp, id) 순서로 after 다음 사용자 메시지 limit개를 읽는 쿼리
+    """
+    query = (
+        db.session.query(Message.user_id, Message.timestamp, Message.id, Message.content)
+        .filter(Message.is_user.is_(True))
+        .order_by(Message.user_id, Message.timestamp, Message.id)
+    )
+    if after:
+        query = query.filter(tuple_(Message.user_id, Message.timestamp, Message.id) > after)
+    else:
+        # 첫 페이지도 인덱스 범위 검색으로 시작 (사용자 id는 1부터)
+        query = query.filter(Message.user_id > 0)
+    return query.limit(limit)
+
+def save_profiles(profiles):
+    """
+    다시 계산한 프로필로 기존 프로필을 바꿔 쓰는 함수
+    """
+    if not profiles:
+        return
+    UserProfile.query.filter(UserProfile.user_id.in_(list(profiles))).delete(synchronize_session=False)
+    now = datetime.utcnow()
+    db.session.execute(insert(UserProfile), [
+        {
+            'user_id': user_id,
+            'category_counts': profile.dumps(),
+            'sentiment_average': profile.sentiment_average,
+            'message_count': profile.message_count,
+            'updated_at': now,
+        }
+        for user_id, profile in profiles.items()
+    ])
+
+@click.command('backfill-profiles')
+@click.option('--batch-size', type=int, default=None, help='한 번에 읽을 메시지 수')
+@with_appcontext
+def backfill_profiles_command(batch_size):
+    """저장된 사용자 메시지로 사용자 프로필을 처음부터 다시 만드는 CLI 명령"""
+    batch_size = batch_size or app.config['PROFILE_BACKFILL_BATCH_SIZE']
+    cursor = None
+    current_user_id, current_profile = None, None
+    users = messages = 0
+    started = time.perf_counter()
+    while True:
+        rows = profile_backfill_page(cursor, batch_size).all()
+        if not rows:
+            break
+        # 메시지가 사용자 순으로 오므로 배치마다 끝난 사용자 프로필만 저장하고, 마지막 사용자는 다음 배치로 이어감
+        finished = {}
+        for user_id, timestamp, message_id, content in rows:
+            if user_id != current_user_id:
+                if current_profile is not None:
+                    finished[current_user_id] = current_profile
+                current_user_id, current_profile = user_id, ProfileState()
+            add_to_profile(current_profile, *analyze_message(content))
+        save_profiles(finished)
+        db.session.commit()
+
+        cursor = (rows[-1].user_id, rows[-1].timestamp, rows[-1].id)
+        users += len(finished)
+        messages += len(rows)
+        click.echo(f'{messages} messages, {users} users ({messages / (time.perf_counter() - started):.0f} messages/s)')
+
+    if current_profile is not None:
+        save_profiles({current_user_id: current_profile})
+        db.session.commit()
+        users += 1
+    click.echo(f'Built profiles for {users} users from {messages} messages')
+
+app.cli.add_command(backfill_profiles_command)
+
+def hot_queries(user_id=1, conversation_id=1):
+    """
+    요청 처리와 예약 작업에서 실행하는 쿼리 목록 (audit-indexes 명령에서 플랜을 점검)
+    라우트가 쓰는 것과 같은 쿼리 함수로 만들어서 라우트 쿼리가 바뀌면 점검 대상도 같이 바뀝니다.
+    .first()는 LIMIT 1, .count()는 서브쿼리에 대한 count(*)로 실행되므로 같은 모양으로 점검합니다.
+    """
+    sample_text = '안녕하세요'
+    words = [sample_text, '학교']
+    cursor = (datetime.utcnow(), 1)
+    history_limit = app.config['HISTORY_PAGE_SIZE'] + 1
+    admin_limit = app.config['ADMIN_MESSAGES_PAGE_SIZE'] + 1
+    backfill_limit = app.config['PROFILE_BACKFILL_BATCH_SIZE']
+    memory_limit = (app.config['MEMORY_RECENT_TURNS'] + app.config['MEMORY_SUMMARY_EVERY']) * 2
+
+    def count(query):
+        return db.session.query(func.count()).select_from(query.subquery())
+
+    return [
+        ('/chat: conversation memory', recent_messages_query(conversation_id, 0, memory_limit)),
+        ('/chat: conversation summary', unsummarized_messages_query(conversation_id, 0, app.config['MEMORY_SUMMARY_MAX_FOLD'])),
+        ('/chat, /get_news: active conversation', active_conversation_query(user_id).limit(1)),
+        ('/chat: user profile', user_profile_query(user_id).limit(1)),
+        ('/get_history: first page', history_page_query(user_id, limit=history_limit)),
+        ('/get_history: next page', history_page_query(user_id, before=cursor, limit=history_limit)),
+        ('/get_history: date', history_page_query(user_id, date=cursor[0], limit=history_limit)),
+        ('/get_vocabulary', vocabulary_query(user_id)),
+        ('/get_reports', user_reports_query(user_id)),
+        ('/get_analysis/<id>', report_query(1).limit(1)),
+        ('/analyze_korean: shared report', shared_report_query(sample_text).limit(1)),
+        ('/analyze_korean: own report', own_report_query(user_id, sample_text).limit(1)),
+        ('/get_news: ready news', ready_news_query().limit(1)),
+        ('/get_word_meanings: shared definitions', word_definitions_query(words)),
+        ('/get_word_meanings: vocabulary fallback', vocabulary_meanings_query(words)),
+        ('/login, /signup: username', user_query(username=sample_text).limit(1)),
+        ('/signup, /request_reset: email', user_query(email=sample_text).limit(1)),
+        ('/reset_password', user_query(reset_token=sample_text).limit(1)),
+        ('admin: users', admin_user_page(0, app.config['ADMIN_USERS_PAGE_SIZE'] + 1)),
+        ('admin: user conversations first page', admin_messages_query(user_id, limit=admin_limit)),
+        ('admin: user conversations next page', admin_messages_query(user_id, after=cursor, limit=admin_limit)),
+        ('admin: user conversations date range', admin_messages_query(user_id, start=cursor[0], end=cursor[0], limit=admin_limit)),
+        ('admin: message days', message_day_counts_query(user_id)),
+        ('admin: llm usage', llm_usage_query(cursor[0])),
+        ('backfill-profiles: first page', profile_backfill_page(None, backfill_limit)),
+        ('backfill-profiles: next page', profile_backfill_page((user_id, cursor[0], 1), backfill_limit)),
+        ('prefetch-news: ready count', count(ready_news_query())),
+        ('prefetch-news: known urls', known_news_urls_query(['https://example.com/a'])),
+        ('send-news: stale broadcasts', stale_broadcasts_query(cursor[0])),
+        ('send-news: unfinished broadcast', unfinished_broadcast_query().limit(1)),
+        ('send-news: remaining users', remaining_users_count_query(0)),
+        ('send-news: users', broadcast_users_query(0, app.config['NEWS_BROADCAST_BATCH_SIZE'])),
+    ]
+
+@click.command('audit-indexes')
+@with_appcontext
+def audit_indexes_command():
+    """주요 쿼리의 EXPLAIN QUERY PLAN을 출력하고, 전체 테이블 스캔이 있으면 실패하는 CLI 명령"""
+    failures = []
+    for name, query in hot_queries():
+        plan = explain_query_plan(db.session, query)
+        scanned = full_scans(plan, db.metadata.tables)
+        click.echo(f"{'FULL SCAN' if scanned else 'ok':>9}  {name}")
+        for step in plan:
+            click.echo(f"           {step}")
+        if scanned:
+            failures.append(f"{name} ({', '.join(scanned)})")
+    if failures:
+        click.echo(f"Full table scans in {len(failures)} queries: {'; '.join(failures)}", err=True)
+        raise SystemExit(1)
+    click.echo('No full table scans')
+
+app.cli.add_command(audit_indexes_command)
+
+app.config['ADMIN_USERS_PAGE_SIZE'] = int(os.environ.get('ADMIN_USERS_PAGE_SIZE', 50))
+app.config['ADMIN_MESSAGES_PAGE_SIZE'] = int(os.environ.get('ADMIN_MESSAGES_PAGE_SIZE', 500))
+
+def admin_user_page(after, limit):
+    """
+    id가 after보다 큰 사용자 limit명과 각자의 메시지 수, 마지막 메시지 시각을 읽는 쿼리
+    메시지 집계는 사용자별 상관 서브쿼리라서 이번 페이지 사용자의 인덱스 범위만 읽습니다.
+    """
+    message_count = (
+        db.session.query(func.count(Message.id)).filter(Message.user_id == User.id)
+        .correlate(User).scalar_subquery()
+    )
+    last_message_at = (
+        db.session.query(func.max(Message.timestamp)).filter(Message.user_id == User.id)
+        .correlate(User).scalar_subquery()
+    )
+    return (
+        db.session.query(User.id, User.username, message_count, last_message_at)
+        .filter(User.id > after)
+        .order_by(User.id)
+        .limit(limit)
+    )
+
+class MessagePage:
+    """
+    메시지 쿼리를 한 페이지(limit개)만큼 조금씩 읽어 흘려보내는 이터레이터
+    다 돌고 나면 다음 페이지가 있는지와 다음 페이지 커서를 알 수 있습니다.
+    """
+    def __init__(self, query, limit):
+        self.query = query
+        self.limit = limit
+        self.has_more = False
+        self.next_cursor = None
+
+    def __iter__(self):
+        last = None
+        for count, message in enumerate(self.query.yield_per(100)):
+            if count == self.limit:
+                self.has_more = True
+                self.next_cursor = encode_history_cursor(last)
+                break
+            last = message
+            yield message
+
+def message_day_counts_query(user_id):
+    day = func.date(Message.timestamp)
+    return db.session.query(day, func.count(Message.id)).filter(Message.user_id == user_id).group_by(day).order_by(day)
+
+def admin_messages_query(user_id, start=None, end=None, after=None, limit=None):
+    """
+    사용자 메시지를 start~end 날짜 범위에서 (timestamp, id) 커서 after 다음부터 오래된 순으로 limit개 읽는 쿼리
+    """
+    query = Message.query.filter(Message.user_id == user_id)
+    if start:
+        query = query.filter(Message.timestamp >= start)
+    if end:
+        query = query.filter(Message.timestamp < end + timedelta(days=1))
+    if after:
+        query = query.filter(tuple_(Message.timestamp, Message.id) > after)
+    return query.order_by(Message.timestamp, Message.id).limit(limit)
+
+def parse_date_arg(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        abort(400)
+
+# 관리자 화면 틀에서 스트리밍할 본문이 들어갈 자리
+STREAM_BODY_MARKER = '<!-- stream-body -->'
+
 class UserConversationsView(BaseView):
+    def is_accessible(self):
+        return current_user.is_authenticated and current_user.is_admin
+
+    def stream(self, template, body_template, body_args, **kwargs):
+        """
+        관리자 화면 틀(template)은 BaseView.render로 그리고, 그 안의 stream_body 자리에
+        body_template을 stream_template으로 조금씩 그려 넣는 응답
+        메시지는 화면에 그리는 대로 DB에서 읽으므로 한 페이지 전체를 메모리에 올리지 않습니다.
+        """
+        page = self.render(template, stream_body=Markup(STREAM_BODY_MARKER), **kwargs)
+        head, tail = page.split(STREAM_BODY_MARKER, 1)
+
+        def generate():
+            yield head
+            yield from stream_template(body_template, **body_args)
+            yield tail
+
+        return Response(stream_with_context(generate()), mimetype='text/html')
+
     @expose('/')
     def index(self):
-        users = User.query.all()
-        return self.render('admin/user_conversations.html', users=users)
-    
+        after = request.args.get('after', 0, type=int)
+        per_page = app.config['ADMIN_USERS_PAGE_SIZE']
+        users = admin_user_page(after, per_page + 1).all()
+        has_next = len(users) > per_page
+        users = users[:per_page]
+        next_after = users[-1][0] if has_next else None
+        return self.render('admin/user_conversations.html', users=users, after=after, next_after=next_after)
+
     @expose('/<int:user_id>')
     def user_conversations(self, user_id):
         user = User.query.get_or_404(user_id)
-        conversations = Conversation.query.filter_by(user_id=user_id).all()
-        
-        all_messages = []
-        for conv in conversations:
-            all_messages.extend(conv.messages)
-        
-        all_messages.sort(key=attrgetter('timestamp'))
-        
-        grouped_messages = groupby(all_messages, key=lambda m: m.timestamp.date())
-        
-        grouped_conversations = {date: list(messages) for date, messages in grouped_messages}
-        
-        return self.render('admin/user_conversation_details.html', user=user, grouped_conversations=grouped_conversations)
+        start = parse_date_arg('start')
+        end = parse_date_arg('end')
+        after = request.args.get('after')
+        try:
+            cursor = decode_history_cursor(after) if after else None
+        except (ValueError, UnicodeDecodeError):
+            abort(400)
+
+        # 날짜 버튼용 일별 메시지 수
+        day_counts = message_day_counts_query(user_id).all()
+
+        limit = app.config['ADMIN_MESSAGES_PAGE_SIZE']
+        message_page = MessagePage(admin_messages_query(user_id, start, end, cursor, limit + 1), limit)
+        start, end = request.args.get('start', ''), request.args.get('end', '')
+
+        return self.stream(
+            'admin/user_conversation_details.html',
+            'admin/user_conversation_messages.html',
+            {
+                'user': user,
+                'grouped_conversations': groupby(message_page, key=lambda m: m.timestamp.date()),
+                'message_page': message_page,
+                'start': start,
+                'end': end,
+            },
+            user=user,
+            day_counts=day_counts,
+            start=start,
+            end=end,
+        )
 
 admin.add_view(UserConversationsView(name='User Conversations', endpoint='user_conversations'))
 
 
 
-def send_news_to_all_users():
-    news_summary = get_news_summary()
-    users = User.query.all()
-    for user in users:
-        # 각 사용자의 대화에 뉴스 요약을 추가
-        conversation = Conversation(user_id=user.id)
-        db.session.add(conversation)
-        db.session.commit()
-        
-        message = Message(conversation_id=conversation.id, content=news_summary, is_user=False, user_id=user.id)
-        db.session.add(message)
+app.config['NEWS_BROADCAST_BATCH_SIZE'] = int(os.environ.get('NEWS_BROADCAST_BATCH_SIZE', 500))
+# 매일 뉴스를 보내는 시각 (서버 현지 시각, 스케줄러와 같은 기준)
+app.config['NEWS_BROADCAST_TIME'] = os.environ.get('NEWS_BROADCAST_TIME', '01:00')
+
+def news_broadcast_window_start(now=None):
+    """
+    가장 최근 예약 전송 시각을 UTC(naive)로 반환하는 함수 (started_at과 같은 기준)
+    """
+    now = now or datetime.now()
+    hour, minute = map(int, app.config['NEWS_BROADCAST_TIME'].split(':'))
+    window_start = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if window_start > now:
+        window_start -= timedelta(days=1)
+    return window_start.astimezone(pytz.utc).replace(tzinfo=None)
+
+def stale_broadcasts_query(window_start):
+    return NewsBroadcast.query.filter(NewsBroadcast.finished_at.is_(None), NewsBroadcast.started_at < window_start)
+
+def unfinished_broadcast_query():
+    return NewsBroadcast.query.filter_by(finished_at=None).order_by(NewsBroadcast.started_at)
+
+def remaining_users_count_query(after_id):
+    return db.session.query(func.count(User.id)).filter(User.id > after_id)
+
+def broadcast_users_query(after_id, limit):
+    """
+    id가 after_id보다 큰 사용자 id를 limit개씩 읽는 쿼리 (방송 체크포인트 다음 배치)
+    """
+    return db.session.query(User.id).filter(User.id > after_id).order_by(User.id).limit(limit)
+
+def send_news_to_all_users(batch_size=None):
+    """
+    모든 사용자에게 뉴스를 batch_size명 단위로 전송하는 함수
+    청크마다 대화·메시지·진행 상태를 한 트랜잭션으로 저장하므로, 작업이 중간에 멈추면
+    같은 예약 주기 안의 다음 실행에서 마지막으로 저장된 사용자 다음부터 같은 뉴스로 이어서 보냅니다.
+    이전 주기에 멈춘 전송은 지난 뉴스를 보내지 않도록 중단 처리하고 새 뉴스로 시작합니다.
+    """
+    batch_size = batch_size or app.config['NEWS_BROADCAST_BATCH_SIZE']
+    window_start = news_broadcast_window_start()
+    for stale in stale_broadcasts_query(window_start).all():
+        print(f"Abandoning news broadcast {stale.id} from {stale.started_at} after {stale.sent_count} users")
+        stale.abandoned_at = stale.finished_at = datetime.utcnow()
+    db.session.commit()
+
+    broadcast = unfinished_broadcast_query().first()
+    if broadcast:
+        print(f"Resuming news broadcast {broadcast.id} after user {broadcast.last_user_id}")
+    else:
+        news_messages = pop_ready_news() or get_news_summary()
+        broadcast = NewsBroadcast(messages=json.dumps(news_messages, ensure_ascii=False))
+        db.session.add(broadcast)
         db.session.commit()
+    news_messages = json.loads(broadcast.messages)
 
-def run_schedule():
+    total = remaining_users_count_query(broadcast.last_user_id).scalar()
+    sent = 0
+    started = time.perf_counter()
     while True:
-        schedule.run_pending()
-        time.sleep(1)
+        user_ids = [user_id for (user_id,) in broadcast_users_query(broadcast.last_user_id, batch_size)]
+        if not user_ids:
+            break
+
+        conversations = db.session.execute(
+            insert(Conversation).returning(Conversation.id, Conversation.user_id),
+            [{'user_id': user_id} for user_id in user_ids],
+        ).all()
+        # 뉴스 메시지 하나당 Message 한 행, 순서가 유지되도록 시간을 조금씩 늘림
+        now = datetime.now(KST)
+        db.session.execute(insert(Message), [
+            {
+                'conversation_id': conversation_id,
+                'user_id': user_id,
+                'content': content,
+                'is_user': False,
+                'timestamp': now + timedelta(microseconds=index),
+            }
+            for conversation_id, user_id in conversations
+            for index, content in enumerate(news_messages)
+        ])
+        broadcast.last_user_id = user_ids[-1]
+        broadcast.sent_count += len(user_ids)
+        db.session.commit()
+
+        sent += len(user_ids)
+        elapsed = time.perf_counter() - started
+        print(f"News broadcast {broadcast.id}: {sent}/{total} users ({sent / elapsed:.0f} users/s)")
 
-# 매일 오전 1시에 뉴스 전송
-schedule.every().day.at("01:00").do(send_news_to_all_users)
+    broadcast.finished_at = datetime.utcnow()
+    db.session.commit()
+    return sent
+
+@click.command('send-news')
+@click.option('--batch-size', type=int, default=None, help='한 트랜잭션에 처리할 사용자 수')
+@with_appcontext
+def send_news_command(batch_size):
+    """모든 사용자에게 뉴스를 보내는 CLI 명령 (중단된 전송이 있으면 이어서 진행)"""
+    sent = send_news_to_all_users(batch_size)
+    click.echo(f'Sent news to {sent} users')
+
+app.cli.add_command(send_news_command)
+
+@click.command('backup-db')
+@with_appcontext
+def backup_db_command():
+    """DB 스냅숏을 만들고 보관 개수를 넘는 오래된 스냅숏을 지우는 CLI 명령"""
+    if backup_manager is None:
+        raise click.ClickException('Backups are only available for SQLite databases')
+    name = backup_manager.run()
+    if name is None:
+        raise click.ClickException('Another backup is already running')
+    click.echo(f'Created {os.path.join(backup_manager.backup_dir, name)}')
+
+app.cli.add_command(backup_db_command)
+
+# 예약 작업 스케줄러 설정
+app.config['SCHEDULER_ENABLED'] = os.environ.get('SCHEDULER_ENABLED', 'true').lower() == 'true'
+app.config['SCHEDULER_LOCK_PATH'] = os.environ.get('SCHEDULER_LOCK_PATH', os.path.join(app.instance_path, 'scheduler.lock'))
+app.config['JOB_RUN_RETENTION_DAYS'] = int(os.environ.get('JOB_RUN_RETENTION_DAYS', 30))
+
+def record_job_run(name, func, record=True):
+    """
+    예약 작업을 앱 컨텍스트에서 실행하고 JobRun에 결과와 소요 시간을 남기는 함수
+    record=False이면 성공한 실행은 남기지 않고 실패만 기록합니다.
+    """
+    with app.app_context():
+        if not record:
+            started_at = datetime.utcnow()
+            started = time.perf_counter()
+            try:
+                func()
+            except Exception as e:
+                db.session.rollback()
+                print(f"Error in scheduled job {name}: {str(e)}")
+                db.session.add(JobRun(
+                    job_name=name, status='failed', error=str(e), started_at=started_at,
+                    finished_at=datetime.utcnow(), duration=time.perf_counter() - started,
+                ))
+                db.session.commit()
+            return
+
+        job_run = JobRun(job_name=name, status='running')
+        db.session.add(job_run)
+        db.session.commit()
+        started = time.perf_counter()
+        try:
+            func()
+            job_run.status = 'success'
+        except Exception as e:
+            db.session.rollback()
+            job_run.status = 'failed'
+            job_run.error = str(e)
+            print(f"Error in scheduled job {name}: {str(e)}")
+        job_run.finished_at = datetime.utcnow()
+        job_run.duration = time.perf_counter() - started
+        db.session.commit()
+
+def prune_job_runs():
+    cutoff = datetime.utcnow() - timedelta(days=app.config['JOB_RUN_RETENTION_DAYS'])
+    JobRun.query.filter(JobRun.started_at < cutoff).delete()
+    db.session.commit()
+
+os.makedirs(app.instance_path, exist_ok=True)
+job_scheduler = JobScheduler(app.config['SCHEDULER_LOCK_PATH'], runner=record_job_run)
+# 매일 NEWS_BROADCAST_TIME(기본 오전 1시)에 뉴스 전송
+job_scheduler.every_day_at('news-broadcast', app.config['NEWS_BROADCAST_TIME'], send_news_to_all_users)
+job_scheduler.every_day_at('prune-job-runs', '04:00', prune_job_runs)
+job_scheduler.every_day_at('db-backup', app.config['BACKUP_TIME'], run_db_backup)
+# 자주 도는 정리·미리 받기 작업은 실패했을 때만 JobRun에 남김
+job_scheduler.every('prune-audio-clips', app.config['AUDIO_CLIP_TTL'], audio_clips.prune, record=False)
+job_scheduler.every('prune-single-flight', 60, single_flight.prune, record=False)
+if app.config['NEWS_PREFETCH_ENABLED']:
+    # 리더가 되자마자 한 번 채워 둠
+    job_scheduler.every('news-prefetch', app.config['NEWS_PREFETCH_INTERVAL'], run_news_prefetch, record=False, run_on_election=True)
+
+def start_scheduler():
+    """
+    서빙 프로세스에서만 스케줄러를 시작하는 함수 (flask CLI 명령에서는 스레드를 띄우지 않음)
+    """
+    if app.config['SCHEDULER_ENABLED']:
+        job_scheduler.start()
 
-# 스케줄러 시작
-scheduler_thread = Thread(target=run_schedule)
-scheduler_thread.start()
+@app.before_request
+def ensure_scheduler():
+    if not job_scheduler.started:
+        start_scheduler()
 
 if __name__ == '__main__':
     with app.app_context():
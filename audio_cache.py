@@ -0,0 +1,137 @@
+"""
+TTS 오디오 디스크 캐시
+
+(text, model, voice, speed)의 해시를 키로 MP3 파일을 저장합니다.
+파일의 수정 시각을 마지막 사용 시각으로 사용하므로 여러 gunicorn 워커가
+같은 디렉터리를 공유해도 LRU 순서가 유지됩니다.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+from threading import Lock
+
+KEY_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+class TTSAudioCache:
+    def __init__(self, directory, max_bytes=200 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = Lock()
+        self._approx_bytes = None
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(text, model, voice, speed):
+        payload = json.dumps([text.strip(), model, voice, float(speed)], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def is_valid_key(key):
+        return bool(KEY_PATTERN.match(key))
+
+    def path_for(self, key):
+        return os.path.join(self.directory, f"{key}.mp3")
+
+    def get(self, key):
+        """
+        캐시된 오디오를 반환하고 사용 시각을 갱신합니다. 없으면 None을 반환합니다.
+        """
+        path = self.path_for(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path, None)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def touch(self, key):
+        """
+        캐시에 있으면 내용을 읽지 않고 사용 시각만 갱신한 뒤 True를 반환합니다.
+        """
+        try:
+            os.utime(self.path_for(key), None)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return False
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def put(self, key, data):
+        """
+        오디오를 임시 파일에 쓴 뒤 원자적으로 교체하고, 용량을 넘으면 오래된 항목을 지웁니다.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path_for(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            if self._approx_bytes is None:
+                self._approx_bytes = self._scan_size()
+            else:
+                self._approx_bytes += len(data)
+            if self._approx_bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith('.mp3'):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        # 다른 워커가 쓴 파일도 포함하도록 디렉터리를 다시 훑어서 실제 크기를 계산
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self.evictions += 1
+            except FileNotFoundError:
+                continue
+        self._approx_bytes = total
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            entries = self._entries()
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(entries),
+                'bytes': sum(size for _, size, _ in entries),
+                'max_bytes': self.max_bytes,
+            }
@@ -0,0 +1,121 @@
+"""
+짧게 유지되는 오디오 클립
+
+응답 하나의 문장별 TTS 캐시 키 목록을 임의의 클립 ID로 묶어 둡니다. 클립 정보는 작은 JSON 파일로
+저장하므로 어느 gunicorn 워커에서든 /audio/<clip_id>로 조회할 수 있고, ttl초가 지나면 만료됩니다.
+오디오 바이트 자체는 TTS 캐시 파일을 그대로 이어서 보내므로 메모리에 모아 두지 않습니다.
+응답을 시작하기 전에 모든 파일을 열어 두므로 보내는 도중에 캐시에서 지워져도 응답이 끊기지 않습니다.
+"""
+import json
+import os
+import re
+import secrets
+import tempfile
+import time
+
+CLIP_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{16}$')
+
+
+class AudioClipStore:
+    def __init__(self, directory, ttl=600):
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, clip_id):
+        return os.path.join(self.directory, f"{clip_id}.json")
+
+    def create(self, user_id, keys):
+        """
+        키 목록을 새 클립으로 저장하고 클립 ID를 반환합니다.
+        """
+        clip_id = secrets.token_urlsafe(12)
+        manifest = {'user_id': user_id, 'keys': list(keys), 'expires_at': time.time() + self.ttl}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self._path(clip_id))
+        return clip_id
+
+    def get(self, clip_id):
+        """
+        만료되지 않은 클립 정보를 반환합니다. 없거나 만료되었으면 None
+        """
+        if not CLIP_ID_PATTERN.match(clip_id):
+            return None
+        try:
+            with open(self._path(clip_id), encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest['expires_at'] < time.time():
+            return None
+        return manifest
+
+    def prune(self):
+        """
+        만료된 클립 파일을 지우고 지운 개수를 반환합니다.
+        """
+        now = time.time()
+        removed = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(('.json', '.tmp')):
+                    continue
+                try:
+                    # 클립 파일은 만들 때 한 번만 쓰므로 수정 시각 + ttl 이 만료 시각
+                    if entry.stat().st_mtime + self.ttl < now:
+                        os.remove(entry.path)
+                        removed += 1
+                except FileNotFoundError:
+                    continue
+        return removed
+
+
+def open_parts(paths):
+    """
+    파일들을 모두 미리 열어 (파일, 크기) 목록으로 반환합니다.
+    하나라도 없으면 이미 연 파일을 닫고 FileNotFoundError를 그대로 올립니다.
+    열어 둔 파일은 그 뒤에 캐시에서 지워지거나 교체되어도 끝까지 읽을 수 있습니다.
+    """
+    parts = []
+    try:
+        for path in paths:
+            f = open(path, 'rb')
+            parts.append((f, os.fstat(f.fileno()).st_size))
+    except OSError:
+        close_parts(parts)
+        raise
+    return parts
+
+
+def close_parts(parts):
+    for f, _ in parts:
+        f.close()
+
+
+def iter_file_range(parts, start, stop, chunk_size=64 * 1024):
+    """
+    parts의 파일들을 이어 붙인 바이트 중 [start, stop) 구간을 chunk_size씩 읽어 돌려주고 다 읽으면 파일을 닫습니다.
+    parts는 open_parts가 반환한 (파일, 크기) 목록입니다.
+    """
+    try:
+        offset = 0
+        for f, size in parts:
+            if offset + size <= start:
+                offset += size
+                continue
+            if offset >= stop:
+                break
+            position = max(start - offset, 0)
+            f.seek(position)
+            remaining = min(size, stop - offset) - position
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+            offset += size
+    finally:
+        close_parts(parts)
@@ -0,0 +1,105 @@
+"""
+analyze_message 벤치마크
+
+변경 전 구현(카테고리마다 키워드를 하나씩 `in` 으로 찾고, 공백으로 자른 어절이
+감정 단어 목록과 정확히 같을 때만 점수를 주는 방식)과 KeywordMatcher의
+메시지당 처리 시간을 비교하고, 활용형/부정 표현 샘플에서 결과가 어떻게 달라지는지 보여줍니다.
+
+    python bench/analyze_message.py --repeat 2000
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+from harness import REPO_ROOT
+
+sys.path.insert(0, REPO_ROOT)
+
+from keyword_matcher import KeywordMatcher, load_lexicon  # noqa: E402
+
+LEXICON_PATH = os.path.join(REPO_ROOT, 'data', 'analysis_lexicon.json')
+
+# 변경 전 app.py 의 감정 단어 목록 (관심사 키워드는 사전의 categories 와 같음)
+LEGACY_POSITIVE = ['좋아', '멋져', '행복', '즐거워', '기뻐', '감사해', '훌륭해', '대단해', '신나', '만족', '흥미로워', '재미있어', '편안해', '희망적', '긍정적']
+LEGACY_NEGATIVE = ['싫어', '나빠', '슬퍼', '화나', '걱정돼', '불안해', '실망', '후회', '우울해', '짜증나', '힘들어', '어려워', '괴로워', '부정적', '불편해']
+
+SAMPLES = [
+    "주말에 친구랑 제주도 여행 갔는데 정말 좋았어요",
+    "요즘 회사 일이 너무 힘들어서 운동을 못 하고 있어",
+    "어제 본 영화는 별로 안 좋았어. 배우 연기가 어색했거든",
+    "AI가 코딩을 도와줘서 공부가 재미있어요",
+    "새로 생긴 맛집에서 디저트를 먹었는데 행복했어",
+    "주식 투자 때문에 걱정돼요. 환율도 불안해",
+    "콘서트 티켓을 못 구해서 슬퍼",
+    "시험 끝나서 너무 신나! 이제 좀 쉬어야지",
+    "오늘은 그냥 집에서 쉬었어",
+    "미술관 전시회 작품들이 멋져서 감사해요",
+]
+
+
+def legacy_analyze(keywords, message):
+    """
+    변경 전 analyze_message 와 같은 방식
+    """
+    message = message.lower()
+    preferences = []
+    for category, words in keywords.items():
+        if any(word in message for word in words):
+            preferences.append(category)
+
+    word_counts = Counter(message.split())
+    positive_score = sum(word_counts[word] for word in LEGACY_POSITIVE)
+    negative_score = sum(word_counts[word] for word in LEGACY_NEGATIVE)
+
+    if positive_score > negative_score:
+        sentiment = 'positive'
+    elif negative_score > positive_score:
+        sentiment = 'negative'
+    else:
+        sentiment = 'neutral'
+    return preferences, sentiment
+
+
+def timed(label, func, messages, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            func(message)
+    elapsed = time.perf_counter() - started
+    per_message = elapsed / (repeat * len(messages)) * 1e6
+    print(f"{label:>10} {elapsed:>8.3f}s {per_message:>10.1f}us")
+    return per_message
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare legacy and compiled analyze_message")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    lexicon = load_lexicon(LEXICON_PATH)
+    keywords = lexicon['categories']
+    started = time.perf_counter()
+    matcher = KeywordMatcher(lexicon)
+    print(f"matcher compiled in {(time.perf_counter() - started) * 1000:.2f}ms")
+
+    # 실제 메시지 길이와 비슷하게 샘플을 두세 개씩 이어 붙인 것도 함께 측정
+    messages = SAMPLES + [' '.join(SAMPLES[i:i + 3]) for i in range(0, len(SAMPLES), 3)]
+    print(f"{len(messages)} messages x {args.repeat}")
+    print(f"{'impl':>10} {'elapsed':>9} {'per msg':>12}")
+    legacy = timed("legacy", lambda message: legacy_analyze(keywords, message), messages, args.repeat)
+    compiled = timed("compiled", matcher.analyze, messages, args.repeat)
+    print(f"speedup x{legacy / compiled:.1f}")
+
+    print()
+    print("differences:")
+    for message in SAMPLES:
+        before = legacy_analyze(keywords, message)
+        after = matcher.analyze(message)
+        if before != after:
+            print(f"  {message}\n    legacy:   {before}\n    compiled: {after}")
+
+
+if __name__ == "__main__":
+    main()
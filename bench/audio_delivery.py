@@ -0,0 +1,82 @@
+"""
+/chat 오디오 전달 방식 벤치마크
+
+같은 조건으로 변경 전 커밋(--baseline-ref, 오디오를 base64로 JSON에 담던 버전)과 현재 작업 트리
+(JSON에는 /audio/<clip_id> URL만 담고 오디오는 별도 바이너리 응답으로 받는 버전)를 띄워
+/chat 을 동시에 보내고, 응답 크기와 gunicorn 워커의 최대 상주 메모리를 비교합니다.
+
+    python bench/audio_delivery.py --baseline-ref <변경 전 커밋> --clients 20 --audio-kb 400
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_openai import FAKE_MP3_FRAME, FakeOpenAIConfig, start_fake_openai
+from harness import AppServer, RSSSampler, app_env, child_pids, create_schema, percentile, prepare_app_dir, signup_and_login
+
+
+def run_version(label, ref, openai_base_url, args):
+    app_dir = prepare_app_dir(ref)
+    env = app_env(openai_base_url)
+    create_schema(app_dir, env)
+
+    with AppServer(app_dir, env, workers=1) as server:
+        workers = child_pids(server.process.pid)
+        sessions = [signup_and_login(server.base_url, f"{label}-user-{i}") for i in range(args.clients)]
+
+        def chat(i):
+            session = sessions[i]
+            started = time.perf_counter()
+            response = session.post(f"{server.base_url}/chat", json={"message": f"안녕 {i}"})
+            response.raise_for_status()
+            json_bytes = len(response.content)
+            audio_bytes = 0
+            audio_url = response.json().get("audio_url")
+            if audio_url:
+                # 브라우저의 <audio>처럼 스트리밍으로 받음
+                with session.get(f"{server.base_url}{audio_url}", stream=True) as audio:
+                    audio.raise_for_status()
+                    for chunk in audio.iter_content(64 * 1024):
+                        audio_bytes += len(chunk)
+            return json_bytes, audio_bytes, time.perf_counter() - started
+
+        with RSSSampler(workers) as rss, ThreadPoolExecutor(max_workers=args.clients) as pool:
+            results = []
+            for _ in range(args.rounds):
+                results.extend(pool.map(chat, range(args.clients)))
+
+    return {
+        "label": label,
+        "json_bytes": sum(json_bytes for json_bytes, _, _ in results) / len(results),
+        "audio_bytes": sum(audio_bytes for _, audio_bytes, _ in results) / len(results),
+        "p50": percentile([elapsed for _, _, elapsed in results], 50),
+        "rss_start": rss.start_kb,
+        "rss_peak": rss.peak_kb,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare base64-in-JSON and URL audio delivery for /chat")
+    parser.add_argument("--baseline-ref", help="git ref of the base64 version to compare against")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--audio-kb", type=int, default=400, help="fake TTS audio size per sentence")
+    args = parser.parse_args()
+
+    frames = max(1, args.audio_kb * 1024 // len(FAKE_MP3_FRAME))
+    _, openai_base_url = start_fake_openai(config=FakeOpenAIConfig(token_delay=0, audio_frames=frames))
+
+    versions = [("current", None)]
+    if args.baseline_ref:
+        versions.insert(0, ("baseline", args.baseline_ref))
+
+    print(f"{args.clients} concurrent /chat x {args.rounds} rounds, {args.audio_kb}KB audio per sentence, 1 gevent worker")
+    print(f"{'version':>9} {'json/reply':>11} {'audio/reply':>12} {'p50':>7} {'rss start':>10} {'rss peak':>10}")
+    for label, ref in versions:
+        result = run_version(label, ref, openai_base_url, args)
+        print(f"{result['label']:>9} {result['json_bytes'] / 1024:>9.1f}KB {result['audio_bytes'] / 1024:>10.1f}KB "
+              f"{result['p50']:>6.2f}s {result['rss_start'] / 1024:>8.1f}MB {result['rss_peak'] / 1024:>8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+동시 중복 요청 합치기 벤치마크
+
+여러 사용자가 같은 AI 문장의 번역 버튼이나 같은 단어를 거의 동시에 누르는 상황을 흉내 냅니다.
+라운드마다 모든 클라이언트가 같은 문장으로 /translate, 같은 단어로 /get_word_meaning 을 동시에 보내고,
+변경 전 커밋(--baseline-ref)과 현재 작업 트리에서 가짜 OpenAI 서버가 받은 요청 수와 지연 시간을 비교합니다.
+
+    python bench/coalescing.py --baseline-ref <변경 전 커밋> --clients 24 --workers 4 --latency 0.8
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+from fake_openai import FakeOpenAIConfig, start_fake_openai
+from harness import AppServer, app_env, create_schema, percentile, prepare_app_dir, signup_and_login
+
+
+def run_version(label, ref, args):
+    config = FakeOpenAIConfig(latency=args.latency, latency_jitter=args.latency / 4)
+    fake_server, openai_base_url = start_fake_openai(config=config)
+    app_dir = prepare_app_dir(ref)
+    env = app_env(openai_base_url)
+    create_schema(app_dir, env)
+
+    with AppServer(app_dir, env, workers=args.workers) as server:
+        with ThreadPoolExecutor(max_workers=args.clients) as pool:
+            sessions = list(pool.map(
+                lambda i: signup_and_login(server.base_url, f"{label}-user-{i}"),
+                range(args.clients),
+            ))
+            config.counts.clear()
+            barrier = Barrier(args.clients)
+
+            def client(i):
+                latencies = {"translate": [], "word": []}
+                for n in range(args.rounds):
+                    barrier.wait()
+                    started = time.perf_counter()
+                    response = sessions[i].post(f"{server.base_url}/translate", json={"text": f"오늘 날씨 정말 좋다 {n}"})
+                    response.raise_for_status()
+                    latencies["translate"].append(time.perf_counter() - started)
+
+                    barrier.wait()
+                    started = time.perf_counter()
+                    response = sessions[i].post(f"{server.base_url}/get_word_meaning", json={"word": f"날씨{n}"})
+                    response.raise_for_status()
+                    latencies["word"].append(time.perf_counter() - started)
+                return latencies
+
+            results = list(pool.map(client, range(args.clients)))
+    fake_server.shutdown()
+
+    translate = [latency for result in results for latency in result["translate"]]
+    word = [latency for result in results for latency in result["word"]]
+    return {
+        "label": label,
+        "upstream": sum(config.counts.values()),
+        "requests": len(translate) + len(word),
+        "translate_p50": percentile(translate, 50),
+        "translate_p95": percentile(translate, 95),
+        "word_p50": percentile(word, 50),
+        "word_p95": percentile(word, 95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure coalescing of identical concurrent LLM requests")
+    parser.add_argument("--baseline-ref", help="git ref of the version without coalescing")
+    parser.add_argument("--clients", type=int, default=24)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.8, help="fake OpenAI latency in seconds")
+    args = parser.parse_args()
+
+    versions = [("current", None)]
+    if args.baseline_ref:
+        versions.insert(0, ("baseline", args.baseline_ref))
+
+    print(f"{args.clients} clients x {args.rounds} rounds of identical /translate + /get_word_meaning, "
+          f"{args.workers} gevent workers, {args.latency}s OpenAI latency")
+    print(f"{'version':>9} {'requests':>9} {'upstream':>9} {'translate p50/p95':>18} {'word p50/p95':>15}")
+    for label, ref in versions:
+        result = run_version(label, ref, args)
+        print(f"{result['label']:>9} {result['requests']:>9} {result['upstream']:>9} "
+              f"{result['translate_p50']:>8.2f}s/{result['translate_p95']:.2f}s "
+              f"{result['word_p50']:>6.2f}s/{result['word_p95']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+동기 워커와 gevent 워커의 동시 처리량 비교
+
+가짜 OpenAI 서버에 고정 지연을 주고, 같은 수의 gunicorn 워커로
+/translate 요청을 동시에 보내 전체 소요 시간과 지연 분포를 비교합니다.
+
+    python bench/concurrency.py --clients 40 --latency 1.0
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_openai import FakeOpenAIConfig, start_fake_openai
+from harness import AppServer, app_env, create_schema, percentile, prepare_app_dir, signup_and_login
+
+
+def run_mode(app_dir, env, worker_class, workers, clients):
+    with AppServer(app_dir, env, worker_class=worker_class, workers=workers) as server:
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            sessions = list(pool.map(
+                lambda i: signup_and_login(server.base_url, f"{worker_class}-user-{i}"),
+                range(clients),
+            ))
+
+            def translate(i):
+                started = time.perf_counter()
+                # 메모이제이션에 걸리지 않도록 요청마다 다른 문장을 사용
+                response = sessions[i].post(f"{server.base_url}/translate", json={"text": f"안녕 {worker_class} {i}"})
+                response.raise_for_status()
+                return time.perf_counter() - started
+
+            started = time.perf_counter()
+            latencies = list(pool.map(translate, range(clients)))
+            elapsed = time.perf_counter() - started
+
+    return {
+        "worker_class": worker_class,
+        "elapsed": elapsed,
+        "throughput": clients / elapsed,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sync and gevent gunicorn workers")
+    parser.add_argument("--clients", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=1.0, help="fake OpenAI latency in seconds")
+    parser.add_argument("--modes", default="sync,gevent")
+    args = parser.parse_args()
+
+    _, openai_base_url = start_fake_openai(config=FakeOpenAIConfig(latency=args.latency))
+    app_dir = prepare_app_dir()
+    env = app_env(openai_base_url)
+    create_schema(app_dir, env)
+
+    print(f"{args.clients} concurrent /translate calls, {args.workers} workers, {args.latency:.2f}s upstream latency")
+    print(f"{'worker':>8} {'elapsed':>9} {'req/s':>8} {'p50':>7} {'p95':>7}")
+    for worker_class in args.modes.split(","):
+        result = run_mode(app_dir, env, worker_class, args.workers, args.clients)
+        print(f"{result['worker_class']:>8} {result['elapsed']:>8.2f}s {result['throughput']:>8.2f} "
+              f"{result['p50']:>6.2f}s {result['p95']:>6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+뉴스 크롤러 벤치마크
+
+가짜 뉴스 사이트에 고정 지연을 주고, 기존 방식(요청마다 새 연결, 기사 하나씩 순서대로)과
+NewsCrawler(연결 재사용, 제한된 동시 수집)의 수집 시간을 비교합니다.
+두 번째 NewsCrawler 실행에서는 목록 페이지가 304로 재검증되는지도 확인합니다.
+
+    python bench/crawler.py --latency 0.2 --workers 4
+"""
+import argparse
+import os
+import sys
+import time
+
+import requests
+from bs4 import BeautifulSoup
+
+from fake_news import FakeNewsConfig, start_fake_news
+from harness import REPO_ROOT
+
+sys.path.insert(0, REPO_ROOT)
+
+from news_crawler import NewsCrawler  # noqa: E402
+
+
+def crawl_sequential(list_url):
+    """
+    변경 전 crawl_main/news_scrap과 같은 방식
+    """
+    response = requests.get(list_url)
+    soup = BeautifulSoup(response.text, 'html.parser')
+    urls = []
+    for news in soup.find_all('div', class_='news_list'):
+        title_tag = news.find('div', class_='title')
+        if title_tag and title_tag.a:
+            urls.append(requests.compat.urljoin(list_url, title_tag.a['href']))
+    articles = 0
+    for url in urls:
+        soup = BeautifulSoup(requests.get(url).text, 'html.parser')
+        if soup.find('div', {'id': 'CmAdContent'}):
+            articles += 1
+    return articles
+
+
+def crawl_pooled(crawler, list_url):
+    urls = crawler.list_articles(list_url)
+    return sum(1 for _ in crawler.scrape_articles(urls))
+
+
+def timed(label, config, func):
+    requests_before, not_modified_before = config.requests, config.not_modified
+    started = time.perf_counter()
+    articles = func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:>20} {elapsed:>8.2f}s {articles:>9} {config.requests - requests_before:>9} "
+          f"{config.not_modified - not_modified_before:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sequential and pooled news crawling")
+    parser.add_argument("--latency", type=float, default=0.2, help="fake news site latency in seconds")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    config = FakeNewsConfig(latency=args.latency)
+    _, list_url = start_fake_news(config=config)
+    crawler = NewsCrawler(max_workers=args.workers)
+
+    print(f"{args.latency:.2f}s per response, {args.workers} crawler workers")
+    print(f"{'mode':>20} {'elapsed':>9} {'articles':>9} {'requests':>9} {'304s':>6}")
+    timed("sequential", config, lambda: crawl_sequential(list_url))
+    timed("pooled", config, lambda: crawl_pooled(crawler, list_url))
+    # 같은 기사는 다시 받지 않고, 목록 페이지는 조건부 요청으로 재검증
+    timed("pooled (revisit)", config, lambda: crawl_pooled(crawler, list_url))
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+SQLite 쓰기 동시성 벤치마크
+
+DB_PROFILE=legacy(롤백 저널, PRAGMA 없음)와 production(WAL, synchronous=NORMAL, busy_timeout 등)으로
+각각 gunicorn을 띄우고, 여러 클라이언트가 동시에 /save_vocabulary(쓰기)와 /get_vocabulary(읽기)를
+보낼 때 쓰기 처리량, 지연, 실패 수를 비교합니다.
+
+    python bench/db_writes.py --clients 48 --requests 30
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_openai import start_fake_openai
+from harness import AppServer, app_env, create_schema, percentile, prepare_app_dir, signup_and_login
+
+
+def run_profile(profile, openai_base_url, args):
+    # WAL 설정은 DB 파일에 남으므로 프로필마다 새 DB를 만듦
+    app_dir = prepare_app_dir()
+    env = app_env(openai_base_url, DB_PROFILE=profile)
+    create_schema(app_dir, env)
+
+    with AppServer(app_dir, env, worker_class=args.worker_class, workers=args.workers) as server:
+        with ThreadPoolExecutor(max_workers=args.clients) as pool:
+            sessions = list(pool.map(
+                lambda i: signup_and_login(server.base_url, f"{profile}-user-{i}"),
+                range(args.clients),
+            ))
+
+            def client(i):
+                session = sessions[i]
+                latencies, failures = [], 0
+                for n in range(args.requests):
+                    started = time.perf_counter()
+                    response = session.post(f"{server.base_url}/save_vocabulary", json={
+                        "word": f"단어{i}-{n}",
+                        "meaning": "뜻",
+                        "explanation": "설명",
+                    })
+                    latencies.append(time.perf_counter() - started)
+                    if response.status_code != 200 or not response.json().get("success"):
+                        failures += 1
+                    # 쓰기 사이사이 읽기를 섞어 실제 사용 패턴과 비슷하게
+                    if n % args.read_every == 0:
+                        session.get(f"{server.base_url}/get_vocabulary")
+                return latencies, failures
+
+            started = time.perf_counter()
+            results = list(pool.map(client, range(args.clients)))
+            elapsed = time.perf_counter() - started
+
+    latencies = [latency for client_latencies, _ in results for latency in client_latencies]
+    writes = len(latencies)
+    failures = sum(failures for _, failures in results)
+    return {
+        "profile": profile,
+        "elapsed": elapsed,
+        "writes_per_second": (writes - failures) / elapsed,
+        "failures": failures,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "max": max(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare SQLite write throughput between DB profiles")
+    parser.add_argument("--clients", type=int, default=48)
+    parser.add_argument("--requests", type=int, default=30, help="writes per client")
+    parser.add_argument("--read-every", type=int, default=4, help="one read per this many writes")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--worker-class", default="gevent")
+    parser.add_argument("--profiles", default="legacy,production")
+    args = parser.parse_args()
+
+    _, openai_base_url = start_fake_openai()
+
+    print(f"{args.clients} clients x {args.requests} writes, {args.workers} {args.worker_class} workers")
+    print(f"{'profile':>10} {'elapsed':>9} {'writes/s':>9} {'failed':>7} {'p50':>7} {'p95':>7} {'max':>7}")
+    for profile in args.profiles.split(","):
+        result = run_profile(profile, openai_base_url, args)
+        print(f"{result['profile']:>10} {result['elapsed']:>8.2f}s {result['writes_per_second']:>9.1f} "
+              f"{result['failures']:>7} {result['p50']:>6.3f}s {result['p95']:>6.3f}s {result['max']:>6.3f}s")
+
+
+if __name__ == "__main__":
+    main()
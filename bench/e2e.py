@@ -0,0 +1,274 @@
+"""
+엔드투엔드 부하/지연 벤치마크
+
+임시 SQLite DB에 사용자 N명과 대화/메시지/단어장 데이터를 채운 뒤, 가짜 OpenAI 서버(채팅, TTS 지연 조절 가능)에
+연결한 gunicorn으로 앱을 띄우고 여러 세션이 동시에 실제 사용 흐름을 흉내 냅니다.
+
+    /login → (/chat → /translate → /get_word_meaning → /get_history → /update_usage_time) x 반복
+
+라우트별 처리량, p50/p95/p99, 오류 수와 요청당 DB 쿼리 수(/metrics 에서 수집)를 출력합니다.
+--save 로 결과를 JSON으로 저장해 두고 다음 실행에서 --compare 로 비교하면 p95, 처리량, DB 쿼리 수가
+허용 범위(--tolerance)를 넘게 나빠진 라우트를 표시하고 종료 코드 1을 돌려줍니다.
+
+    python bench/e2e.py --users 200 --sessions 20 --iterations 10 --latency 0.3 --save before.json
+    python bench/e2e.py --users 200 --sessions 20 --iterations 10 --latency 0.3 --compare before.json
+    python bench/e2e.py --ref <커밋>   # 작업 트리 대신 특정 커밋을 측정
+"""
+import argparse
+import json
+import random
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from fake_openai import FakeOpenAIConfig, start_fake_openai
+from harness import AppServer, app_env, create_schema, percentile, prepare_app_dir
+
+ROUTES = ["/login", "/chat", "/translate", "/get_word_meaning", "/get_history", "/update_usage_time"]
+PASSWORD = "bench-password"
+METRICS_TOKEN = "bench-metrics-token"
+
+USER_LINES = [
+    "오늘 회사에서 회의가 너무 길어서 힘들었어",
+    "주말에 친구랑 제주도 여행 가기로 했어!",
+    "요즘 한국 드라마 보면서 공부하고 있어",
+    "어제 떡볶이를 처음 만들어 봤는데 생각보다 쉬웠어",
+    "다음 달에 토픽 시험이 있어서 좀 걱정돼",
+    "비가 와서 그냥 집에서 음악 들으면서 쉬었어",
+]
+WORDS = ["회의", "여행", "드라마", "떡볶이", "시험", "음악", "날씨", "친구", "공부", "주말"]
+
+# 앱 디렉터리에서 실행해 앱 모델로 데이터를 채우는 스크립트 (인자: 사용자 수, 사용자당 대화 수, 대화당 메시지 수, 사용자당 단어 수)
+SEED_SCRIPT = """
+import os, random, sys
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+from app import app, db, User, Conversation, Message, VocabularyItem
+
+users, conversations, messages, vocabulary = (int(value) for value in sys.argv[1:5])
+user_lines = {user_lines!r}
+words = {words!r}
+rng = random.Random(42)
+password = generate_password_hash({password!r})
+now = datetime.now()
+with app.app_context():
+    conversation_id = 0
+    for first in range(1, users + 1, 100):
+        ids = range(first, min(first + 100, users + 1))
+        db.session.execute(insert(User), [
+            dict(id=i, username=f"bench-user-{{i}}", email=f"bench-user-{{i}}@bench.local", password=password, total_usage_time=0)
+            for i in ids
+        ])
+        conversation_rows, message_rows, vocabulary_rows = [], [], []
+        for user_id in ids:
+            for c in range(conversations):
+                conversation_id += 1
+                started = now - timedelta(days=conversations - c, minutes=rng.randint(0, 600))
+                # 마지막 대화는 진행 중
+                ended = None if c == conversations - 1 else started + timedelta(minutes=messages)
+                conversation_rows.append(dict(id=conversation_id, user_id=user_id, start_time=started, end_time=ended))
+                for m in range(messages):
+                    is_user = m % 2 == 0
+                    content = rng.choice(user_lines) if is_user else "와, 정말? 더 자세히 얘기해 줘. 나도 궁금하다!"
+                    message_rows.append(dict(conversation_id=conversation_id, user_id=user_id, is_user=is_user,
+                                             content=content, timestamp=started + timedelta(seconds=30 * m)))
+            for v in range(vocabulary):
+                word = f"{{rng.choice(words)}}{{v}}"
+                vocabulary_rows.append(dict(user_id=user_id, word=word, meaning=f"meaning of {{word}}",
+                                            explanation="", created_at=now - timedelta(hours=v)))
+        db.session.execute(insert(Conversation), conversation_rows)
+        db.session.execute(insert(Message), message_rows)
+        if vocabulary_rows:
+            db.session.execute(insert(VocabularyItem), vocabulary_rows)
+        db.session.commit()
+os._exit(0)
+""".format(user_lines=USER_LINES, words=WORDS, password=PASSWORD)
+
+
+def seed_database(app_dir, env, args):
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", SEED_SCRIPT, str(args.users), str(args.conversations), str(args.messages), str(args.vocabulary)],
+        cwd=app_dir, env=env, check=True,
+    )
+    total_messages = args.users * args.conversations * args.messages
+    print(f"seeded {args.users} users, {args.users * args.conversations} conversations, {total_messages} messages, "
+          f"{args.users * args.vocabulary} vocabulary items in {time.perf_counter() - started:.1f}s")
+
+
+def run_session(base_url, index, args, timings, errors):
+    """
+    사용자 한 명의 스크립트: 로그인한 뒤 iterations번 대화 흐름을 반복합니다.
+    """
+    rng = random.Random(index)
+    session = requests.Session()
+    user = f"bench-user-{index % args.users + 1}"
+
+    def call(route, method, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = session.request(method, f"{base_url}{route}", timeout=120, **kwargs)
+            ok = response.status_code == 200
+        except requests.RequestException:
+            response, ok = None, False
+        timings[route].append(time.perf_counter() - started)
+        if not ok:
+            errors[route] += 1
+        return response if ok else None
+
+    response = call("/login", "POST", json={"username": user, "password": PASSWORD})
+    if response is None or not response.json().get("success"):
+        return
+
+    for _ in range(args.iterations):
+        response = call("/chat", "POST", json={"message": rng.choice(USER_LINES)})
+        reply = response.json().get("message") if response is not None else None
+        # 방금 받은 답을 번역하는 경우와 처음 보는 문장을 번역하는 경우를 섞음
+        text = reply if reply and rng.random() < 0.5 else f"{rng.choice(USER_LINES)} {rng.randint(1, 10000)}"
+        call("/translate", "POST", json={"text": text})
+        word = rng.choice(WORDS) if rng.random() < 0.5 else f"{rng.choice(WORDS)}{rng.randint(1000, 9999)}"
+        call("/get_word_meaning", "POST", json={"word": word})
+        call("/get_history", "GET", params={"limit": 20})
+        call("/update_usage_time", "POST", json={"time": 30})
+        time.sleep(rng.uniform(0, args.think_time))
+
+
+def scrape_db_queries(base_url):
+    """
+    /metrics 의 요청당 DB 쿼리 히스토그램에서 라우트별 평균 쿼리 수를 읽습니다. (없는 버전이면 빈 dict)
+    """
+    try:
+        response = requests.get(f"{base_url}/metrics", headers={"Authorization": f"Bearer {METRICS_TOKEN}"}, timeout=10)
+    except requests.RequestException:
+        return {}
+    if response.status_code != 200:
+        return {}
+    sums, counts = {}, {}
+    for match in re.finditer(r'^talkr_http_request_db_queries_(sum|count)\{route="([^"]+)"\} (\S+)$', response.text, re.M):
+        kind, route, value = match.groups()
+        (sums if kind == "sum" else counts)[route] = float(value)
+    return {route: sums[route] / counts[route] for route in counts if counts[route]}
+
+
+def run_benchmark(args):
+    config = FakeOpenAIConfig(latency=args.latency, latency_jitter=args.latency / 4, token_delay=args.token_delay)
+    fake_server, openai_base_url = start_fake_openai(config=config)
+    app_dir = prepare_app_dir(args.ref)
+    env = app_env(openai_base_url, METRICS_TOKEN=METRICS_TOKEN, METRICS_FLUSH_INTERVAL=0.5)
+    create_schema(app_dir, env)
+    seed_database(app_dir, env, args)
+
+    timings = defaultdict(list)
+    errors = defaultdict(int)
+    with AppServer(app_dir, env, worker_class=args.worker_class, workers=args.workers) as server:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+            list(pool.map(lambda i: run_session(server.base_url, i, args, timings, errors), range(args.sessions)))
+        elapsed = time.perf_counter() - started
+        # 다른 워커의 계측 값이 파일에 반영될 때까지 잠깐 기다림
+        time.sleep(1.5)
+        db_queries = scrape_db_queries(server.base_url)
+    fake_server.shutdown()
+
+    routes = {}
+    for route in ROUTES:
+        latencies = timings.get(route, [])
+        routes[route] = {
+            "requests": len(latencies),
+            "errors": errors.get(route, 0),
+            "rps": len(latencies) / elapsed,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "db_queries": db_queries.get(route),
+        }
+    total = sum(route["requests"] for route in routes.values())
+    return {
+        "params": {key: value for key, value in vars(args).items() if key not in ("save", "compare")},
+        "elapsed": elapsed,
+        "requests": total,
+        "rps": total / elapsed,
+        "upstream_calls": sum(config.counts.values()),
+        "routes": routes,
+    }
+
+
+def print_result(result):
+    print(f"{result['requests']} requests in {result['elapsed']:.1f}s = {result['rps']:.1f} req/s, "
+          f"{result['upstream_calls']} fake OpenAI calls")
+    print(f"{'route':>18} {'requests':>9} {'errors':>7} {'req/s':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'db q/req':>9}")
+    for route, stats in result["routes"].items():
+        db_queries = f"{stats['db_queries']:.1f}" if stats["db_queries"] is not None else "-"
+        print(f"{route:>18} {stats['requests']:>9} {stats['errors']:>7} {stats['rps']:>7.1f} "
+              f"{stats['p50']:>7.3f}s {stats['p95']:>7.3f}s {stats['p99']:>7.3f}s {db_queries:>9}")
+
+
+def compare(result, baseline, tolerance, min_delta):
+    """
+    기준 결과보다 tolerance 비율 넘게 나빠진 항목 목록을 반환합니다.
+    짧은 라우트의 측정 잡음을 거르기 위해 p95가 min_delta초 이상 늘어난 경우만 지연 회귀로 봅니다.
+    """
+    regressions = []
+    for route, stats in result["routes"].items():
+        before = baseline["routes"].get(route)
+        if not before or not before["requests"]:
+            continue
+        if stats["p95"] > before["p95"] * (1 + tolerance) and stats["p95"] - before["p95"] >= min_delta:
+            regressions.append(f"{route} p95 {before['p95']:.3f}s -> {stats['p95']:.3f}s")
+        if stats["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(f"{route} throughput {before['rps']:.1f} -> {stats['rps']:.1f} req/s")
+        if stats["errors"] > before["errors"]:
+            regressions.append(f"{route} errors {before['errors']} -> {stats['errors']}")
+        if stats["db_queries"] is not None and before["db_queries"] is not None \
+                and stats["db_queries"] > before["db_queries"] + 0.5:
+            regressions.append(f"{route} db queries/request {before['db_queries']:.1f} -> {stats['db_queries']:.1f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end load and latency benchmark against a fake OpenAI server")
+    parser.add_argument("--ref", help="git ref to benchmark instead of the working tree")
+    parser.add_argument("--users", type=int, default=200, help="seeded users")
+    parser.add_argument("--conversations", type=int, default=5, help="conversations per user (the last one stays open)")
+    parser.add_argument("--messages", type=int, default=40, help="messages per conversation")
+    parser.add_argument("--vocabulary", type=int, default=30, help="vocabulary items per user")
+    parser.add_argument("--sessions", type=int, default=20, help="concurrent scripted sessions")
+    parser.add_argument("--iterations", type=int, default=10, help="chat rounds per session")
+    parser.add_argument("--think-time", type=float, default=0.2, help="max random pause between rounds")
+    parser.add_argument("--latency", type=float, default=0.3, help="fake OpenAI latency before the first byte")
+    parser.add_argument("--token-delay", type=float, default=0.005, help="fake OpenAI delay between streamed chunks")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--worker-class", default="gevent")
+    parser.add_argument("--save", help="write the result as JSON to this path")
+    parser.add_argument("--compare", help="baseline JSON from an earlier --save run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown before flagging")
+    parser.add_argument("--min-delta", type=float, default=0.02, help="ignore p95 increases smaller than this (seconds)")
+    args = parser.parse_args()
+
+    print(f"{args.sessions} sessions x {args.iterations} rounds, {args.workers} {args.worker_class} workers, "
+          f"{args.latency}s OpenAI latency")
+    result = run_benchmark(args)
+    print_result(result)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.tolerance, args.min_delta)
+        if regressions:
+            print("regressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+로컬 개발/벤치마크용 가짜 뉴스 사이트
+
+bench/fixtures 의 HTML로 YTN 목록 페이지와 기사 페이지를 흉내 냅니다.
+앱을 이 서버에 연결하려면 NEWS_LIST_URL 환경 변수를 지정합니다.
+
+    python bench/fake_news.py --port 8098
+    NEWS_LIST_URL=http://127.0.0.1:8098/news/list.php flask run
+"""
+import argparse
+import hashlib
+import os
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from threading import Thread
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class FakeNewsConfig:
+    def __init__(self, latency=0.0, conditional=True):
+        self.latency = latency
+        self.conditional = conditional
+        self.requests = 0
+        self.not_modified = 0
+        self.last_modified = formatdate(time.time(), usegmt=True)
+
+
+class FakeNewsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config = FakeNewsConfig()
+    list_page = load_fixture("news_list.html")
+    article_template = Template(load_fixture("news_article.html"))
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.config.requests += 1
+        time.sleep(self.config.latency)
+        if self.path.startswith("/news/list.php"):
+            self._send_html(self.list_page)
+        elif self.path.startswith("/_ln/"):
+            article_id = self.path.rsplit("_", 1)[-1]
+            self._send_html(self.article_template.substitute(article_id=article_id))
+        else:
+            self._send_html("<html><body>Not Found</body></html>", status=404)
+
+    def _send_html(self, html, status=200):
+        body = html.encode("utf-8")
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if status == 200 and self.config.conditional and self.headers.get("If-None-Match") == etag:
+            self.config.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 200 and self.config.conditional:
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", self.config.last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_fake_news(port=0, config=None):
+    """
+    백그라운드 스레드에서 가짜 뉴스 사이트를 띄우고 (서버, 목록 페이지 URL)을 반환합니다.
+    """
+    handler = type("ConfiguredFakeNewsHandler", (FakeNewsHandler,), {"config": config or FakeNewsConfig()})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/news/list.php?mcd=0103"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake news site serving fixture pages")
+    parser.add_argument("--port", type=int, default=8098)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before each response")
+    args = parser.parse_args()
+
+    handler = type("ConfiguredFakeNewsHandler", (FakeNewsHandler,), {"config": FakeNewsConfig(latency=args.latency)})
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), handler)
+    print(f"Fake news site listening on http://127.0.0.1:{args.port}/news/list.php?mcd=0103")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
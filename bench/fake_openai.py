@@ -0,0 +1,248 @@
+"""
+로컬 개발/벤치마크용 가짜 OpenAI 서버
+
+chat completions(일반/스트리밍)와 audio speech API를 흉내 냅니다.
+앱을 이 서버에 연결하려면 OPENAI_BASE_URL 환경 변수를 지정합니다.
+게이트웨이의 재시도/서킷 브레이커를 확인할 수 있도록 지연 편차, 느린 응답, 오류 응답을 섞을 수 있습니다.
+
+    python bench/fake_openai.py --port 8099 --latency 0.5
+    python bench/fake_openai.py --error-rate 0.2 --error-status 503 --slow-rate 0.05 --slow-latency 30
+    OPENAI_API_KEY=fake OPENAI_BASE_URL=http://127.0.0.1:8099/v1 flask run
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+
+DEFAULT_REPLY = "<response>와, 대박! 나도 어제 떡볶이 먹었어. 진짜 맛있더라.</response>"
+
+# MP3 프레임 헤더처럼 보이는 더미 오디오 조각
+FAKE_MP3_FRAME = b"\xff\xfb\x90\x64" + b"\x00" * 413
+
+
+class FakeOpenAIConfig:
+    def __init__(self, latency=0.0, token_delay=0.02, reply=DEFAULT_REPLY, audio_frames=40,
+                 latency_jitter=0.0, error_rate=0.0, error_status=500, slow_rate=0.0, slow_latency=30.0):
+        self.latency = latency
+        self.token_delay = token_delay
+        self.reply = reply
+        self.audio_frames = audio_frames
+        # 요청마다 latency에 0~latency_jitter초를 더함
+        self.latency_jitter = latency_jitter
+        # error_rate 비율의 요청은 error_status로 실패, slow_rate 비율은 slow_latency초 동안 응답하지 않음
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.counts = Counter()
+        self._lock = Lock()
+
+    def count(self, outcome):
+        with self._lock:
+            self.counts[outcome] += 1
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config = FakeOpenAIConfig()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _end_chunks(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        payload = self._read_json()
+        config = self.config
+        time.sleep(config.latency + random.uniform(0, config.latency_jitter))
+        roll = random.random()
+        if roll < config.error_rate:
+            config.count(f"error_{config.error_status}")
+            self._send_json({"error": {"message": "Injected failure", "type": "server_error"}}, status=config.error_status)
+            return
+        if roll < config.error_rate + config.slow_rate:
+            config.count("slow")
+            time.sleep(config.slow_latency)
+        else:
+            config.count("ok")
+        if self.path.endswith("/chat/completions"):
+            if payload.get("stream"):
+                self._stream_completion(payload)
+            else:
+                self._send_json(self._completion(payload))
+        elif self.path.endswith("/audio/speech"):
+            self._stream_speech(payload)
+        else:
+            self._send_json({"error": {"message": f"Unknown path {self.path}"}}, status=404)
+
+    def _reply_for(self, payload):
+        """
+        요청 프롬프트를 보고 라우트별로 그럴듯한 응답을 만듭니다.
+        """
+        messages = payload.get("messages", [])
+        system = messages[0]["content"] if messages else ""
+        user = messages[-1]["content"] if messages else ""
+        if "dictionary" in system:
+            words_match = re.search(r"Words: (\[.*\])", user, re.DOTALL)
+            words = json.loads(words_match.group(1)) if words_match else []
+            return json.dumps([
+                {"word": word, "meaning": f"meaning of {word}", "explanation": f"{word} is a Korean word."}
+                for word in words
+            ], ensure_ascii=False)
+        if "translator" in system:
+            return "Wow, that's amazing!"
+        if "Analyze the given Korean sentence" in system:
+            return json.dumps({
+                "original": user,
+                "errors": [{"type": "Spacing", "incorrect": "안녕", "improved": "안녕!", "explanation": "Add emphasis."}],
+                "final_revised": "안녕!",
+                "overall_comment": "Good job.",
+            }, ensure_ascii=False)
+        if "대화 기록을 정리" in system:
+            return "사용자는 커피를 좋아하고 이번 주말에 등산을 갈 계획이다."
+        if "뉴스를 간결하게 요약" in system:
+            return "서울에 첫눈이 내렸다."
+        if "'---'" in user:
+            return "너 이 소식 들었어? 서울에 첫눈 왔대.\n---\n완전 겨울이다. 따뜻하게 입어!"
+        return self.config.reply
+
+    def _completion(self, payload):
+        content = self._reply_for(payload)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "gpt-4o"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": self._usage(payload, content),
+        }
+
+    def _usage(self, payload, content):
+        # 토크나이저 없이 대략 두 글자당 한 토큰으로 계산
+        prompt_tokens = sum(len(message.get("content") or "") for message in payload.get("messages", [])) // 2
+        completion_tokens = max(1, len(content) // 2)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    def _stream_completion(self, payload):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        content = self._reply_for(payload)
+        pieces = [content[i:i + 3] for i in range(0, len(content), 3)]
+        for piece in pieces:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": payload.get("model", "gpt-4o"),
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+            }
+            self._write_chunk(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+            time.sleep(self.config.token_delay)
+        if (payload.get("stream_options") or {}).get("include_usage"):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": payload.get("model", "gpt-4o"),
+                "choices": [],
+                "usage": self._usage(payload, content),
+            }
+            self._write_chunk(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._end_chunks()
+
+    def _stream_speech(self, payload):
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for _ in range(self.config.audio_frames):
+            self._write_chunk(FAKE_MP3_FRAME)
+            time.sleep(self.config.token_delay)
+        self._end_chunks()
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # 클라이언트가 타임아웃으로 먼저 끊은 경우는 정상 상황
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+
+def start_fake_openai(port=0, config=None):
+    """
+    백그라운드 스레드에서 가짜 OpenAI 서버를 띄우고 (서버, base_url)을 반환합니다.
+    """
+    handler = type("ConfiguredFakeOpenAIHandler", (FakeOpenAIHandler,), {"config": config or FakeOpenAIConfig()})
+    server = FakeOpenAIServer(("127.0.0.1", port), handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI server for local testing")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before the first byte")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="seconds between streamed chunks")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="extra random seconds added to --latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="fraction of requests stalled for --slow-latency")
+    parser.add_argument("--slow-latency", type=float, default=30.0)
+    args = parser.parse_args()
+
+    config = FakeOpenAIConfig(
+        latency=args.latency,
+        token_delay=args.token_delay,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        slow_rate=args.slow_rate,
+        slow_latency=args.slow_latency,
+    )
+    handler = type("ConfiguredFakeOpenAIHandler", (FakeOpenAIHandler,), {"config": config})
+    server = FakeOpenAIServer(("127.0.0.1", args.port), handler)
+    print(f"Fake OpenAI server listening on http://127.0.0.1:{args.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
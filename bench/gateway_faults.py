@@ -0,0 +1,100 @@
+"""
+OpenAI 게이트웨이 벤치마크
+
+가짜 OpenAI 서버에 오류와 느린 응답을 섞어 두고, 게이트웨이 없이 호출할 때(클라이언트 기본 설정: 타임아웃 600초,
+재시도 2번)와 게이트웨이를 거칠 때의 성공률과 지연 시간을 상황별로 비교합니다.
+
+- flaky: 일부 요청이 503으로 실패
+- slow: 일부 요청이 오래 멈춤 (deadline이 지연 꼬리를 자르는지)
+- outage: 모든 요청이 실패 (서킷 브레이커가 열려 바로 실패하는지, 상류로 가는 요청 수)
+
+    python bench/gateway_faults.py --calls 200 --clients 16
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_openai import FakeOpenAIConfig, start_fake_openai
+from harness import REPO_ROOT, percentile
+
+sys.path.insert(0, REPO_ROOT)
+
+from openai import OpenAI  # noqa: E402
+
+from llm_gateway import LLMGateway, ModelPolicy  # noqa: E402
+
+MESSAGES = [{"role": "system", "content": "You are a translator."}, {"role": "user", "content": "안녕"}]
+
+SCENARIOS = {
+    "flaky": dict(latency=0.05, latency_jitter=0.05, error_rate=0.2, error_status=503),
+    "slow": dict(latency=0.05, latency_jitter=0.05, slow_rate=0.05, slow_latency=5.0),
+    "outage": dict(latency=0.05, error_rate=1.0, error_status=503),
+}
+
+
+def direct_call(client):
+    return lambda: client.chat.completions.create(model="gpt-4o-mini", messages=MESSAGES)
+
+
+def gateway_call(gateway):
+    return lambda: gateway.chat("bench", model="gpt-4o-mini", messages=MESSAGES)
+
+
+def run(call, args):
+    def one(_):
+        started = time.perf_counter()
+        try:
+            call()
+            ok = True
+        except Exception:
+            ok = False
+        return ok, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        results = list(pool.map(one, range(args.calls)))
+    elapsed = time.perf_counter() - started
+    latencies = [latency for _, latency in results]
+    return {
+        "ok": sum(ok for ok, _ in results),
+        "elapsed": elapsed,
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare direct OpenAI calls with the gateway under injected faults")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--deadline", type=float, default=1.0)
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--scenarios", default="flaky,slow,outage")
+    args = parser.parse_args()
+
+    print(f"{args.calls} calls from {args.clients} threads, gateway deadline {args.deadline}s, {args.retries} retries")
+    print(f"{'scenario':>8} {'caller':>8} {'ok':>9} {'upstream':>9} {'elapsed':>8} {'p50':>7} {'p99':>7} {'max':>7}")
+    for scenario in args.scenarios.split(","):
+        for caller in ("direct", "gateway"):
+            config = FakeOpenAIConfig(**SCENARIOS[scenario])
+            server, base_url = start_fake_openai(config=config)
+            if caller == "direct":
+                call = direct_call(OpenAI(api_key="fake", base_url=base_url))
+            else:
+                gateway = LLMGateway(
+                    OpenAI(api_key="fake", base_url=base_url, max_retries=0),
+                    default_policy=ModelPolicy(deadline=args.deadline, max_retries=args.retries, concurrency=args.clients),
+                    backoff_base=0.05,
+                    backoff_max=0.2,
+                )
+                call = gateway_call(gateway)
+            result = run(call, args)
+            server.shutdown()
+            print(f"{scenario:>8} {caller:>8} {result['ok']:>4}/{args.calls:<4} {sum(config.counts.values()):>9} "
+                  f"{result['elapsed']:>7.2f}s {result['p50']:>6.3f}s {result['p99']:>6.3f}s {result['max']:>6.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+벤치마크 공용 도구
+
+저장소를 임시 디렉터리에 복사해서 빈 SQLite DB로 앱을 띄우므로
+실제 instance/users.db 는 건드리지 않습니다.
+"""
+import io
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+
+import requests
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CREATE_SCHEMA = """
+import os
+from app import app, db
+with app.app_context():
+    db.create_all()
+os._exit(0)
+"""
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def prepare_app_dir(ref=None):
+    """
+    저장소를 임시 디렉터리에 복사한 뒤 경로를 반환합니다.
+    ref를 주면 작업 트리 대신 그 git 커밋의 파일을 꺼냅니다. (변경 전/후 비교용)
+    """
+    workdir = tempfile.mkdtemp(prefix="talkr-bench-")
+    app_dir = os.path.join(workdir, "app")
+    if ref:
+        archive = subprocess.run(["git", "-C", REPO_ROOT, "archive", ref], check=True, capture_output=True).stdout
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            tar.extractall(app_dir)
+        # 커밋에 들어 있는 DB 파일 대신 빈 DB를 사용
+        shutil.rmtree(os.path.join(app_dir, "instance"), ignore_errors=True)
+        return app_dir
+    shutil.copytree(
+        REPO_ROOT,
+        app_dir,
+        ignore=shutil.ignore_patterns(".git", "instance", "__pycache__", "bench"),
+    )
+    return app_dir
+
+
+def rss_kb(pid):
+    """
+    프로세스의 현재 상주 메모리(VmRSS, KB)를 반환합니다. (리눅스 전용)
+    """
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+class RSSSampler:
+    """
+    부하를 주는 동안 프로세스들의 상주 메모리 합을 주기적으로 재서 최댓값을 기록합니다.
+    (VmHWM은 시작할 때 잠깐 올라간 값이 남아 있어 요청 처리 중 증가분을 보기 어려움)
+    """
+    def __init__(self, pids, interval=0.02):
+        self.pids = pids
+        self.interval = interval
+        self.start_kb = self._sample()
+        self.peak_kb = self.start_kb
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        return sum(rss_kb(pid) for pid in self.pids)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.peak_kb = max(self.peak_kb, self._sample())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stopped.set()
+        self._thread.join()
+
+
+def child_pids(pid):
+    """
+    pid의 자식 프로세스 목록 (gunicorn 워커 찾기)
+    """
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # 두 번째 필드(이름)에 공백이 있을 수 있으므로 마지막 ')' 뒤부터 자름
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(entry))
+    return children
+
+
+def app_env(openai_base_url, **extra):
+    env = dict(os.environ)
+    env.update({
+        "OPENAI_API_KEY": "fake",
+        "SECRET_KEY": "bench-secret-key",
+        "NEWS_PREFETCH_ENABLED": "false",
+        "OPENAI_BASE_URL": openai_base_url,
+    })
+    env.update({key: str(value) for key, value in extra.items()})
+    return env
+
+
+def create_schema(app_dir, env):
+    subprocess.run([sys.executable, "-c", CREATE_SCHEMA], cwd=app_dir, env=env, check=True)
+
+
+class AppServer:
+    """
+    gunicorn으로 앱을 띄우고 종료하는 컨텍스트 매니저
+    """
+    def __init__(self, app_dir, env, worker_class="gevent", workers=2):
+        self.app_dir = app_dir
+        self.port = free_port()
+        self.env = dict(env, PORT=str(self.port), GUNICORN_WORKER_CLASS=worker_class, WEB_CONCURRENCY=str(workers))
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.process = None
+
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py", "app:app"],
+            cwd=self.app_dir,
+            env=self.env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            try:
+                requests.get(f"{self.base_url}/check_login", timeout=5)
+                return self
+            except requests.RequestException:
+                time.sleep(0.2)
+        self.__exit__(None, None, None)
+        raise RuntimeError("app server did not start")
+
+    def __exit__(self, exc_type, exc, tb):
+        # 워커까지 확실히 내리도록 프로세스 그룹 전체에 신호를 보냄
+        os.killpg(self.process.pid, signal.SIGTERM)
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.process.pid, signal.SIGKILL)
+            self.process.wait()
+
+
+def signup_and_login(base_url, username):
+    session = requests.Session()
+    session.post(f"{base_url}/signup", json={
+        "username": username,
+        "email": f"{username}@bench.local",
+        "password": "bench-password",
+    })
+    response = session.post(f"{base_url}/login", json={"username": username, "password": "bench-password"})
+    if not response.json().get("success"):
+        raise RuntimeError(f"login failed for {username}")
+    return session
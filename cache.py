@@ -0,0 +1,100 @@
+"""
+프로세스 내 LRU 캐시와 LLM 결과 메모이제이션
+"""
+import hashlib
+import re
+import time
+import unicodedata
+from collections import OrderedDict, defaultdict
+from threading import Lock
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+class LRUCache:
+    def __init__(self, maxsize=1000, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                expires_at, value = self._data[key]
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+            }
+
+
+def normalize_text(text):
+    """
+    같은 문장이 공백이나 유니코드 조합 방식 차이로 다른 키가 되지 않도록 정규화합니다.
+    """
+    return WHITESPACE_PATTERN.sub(' ', unicodedata.normalize('NFC', text)).strip()
+
+
+class Memoizer:
+    """
+    라우트별 LLM 결과 메모이제이션
+
+    키는 (라우트, 프롬프트/모델 버전, 정규화된 텍스트)의 해시이므로
+    프롬프트나 모델을 바꾸면 버전만 올려서 이전 결과를 무효화할 수 있습니다.
+    """
+    def __init__(self, maxsize=2000, ttl=24 * 60 * 60):
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._lock = Lock()
+        self._route_stats = defaultdict(lambda: {'hits': 0, 'misses': 0})
+
+    @staticmethod
+    def make_key(route, version, text):
+        payload = f"{route}\x00{version}\x00{normalize_text(text)}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, route, version, text):
+        value = self._cache.get(self.make_key(route, version, text))
+        with self._lock:
+            self._route_stats[route]['hits' if value is not None else 'misses'] += 1
+        return value
+
+    def set(self, route, version, text, value):
+        self._cache.set(self.make_key(route, version, text), value)
+
+    def stats(self):
+        with self._lock:
+            routes = {}
+            for route, counts in self._route_stats.items():
+                lookups = counts['hits'] + counts['misses']
+                routes[route] = {
+                    **counts,
+                    'hit_rate': round(counts['hits'] / lookups, 4) if lookups else 0.0,
+                }
+        return {'routes': routes, 'size': len(self._cache), 'maxsize': self._cache.maxsize}
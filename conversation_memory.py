@@ -0,0 +1,81 @@
+"""
+대화 메모리
+
+오래된 대화는 누적 요약으로 접어 두고, 프롬프트에는 요약과 최근 몇 턴만
+토큰 예산 안에서 넣습니다.
+"""
+import re
+
+HANGUL = re.compile(r'[가-힣ㄱ-ㆎ]')
+
+SUMMARY_SYSTEM_PROMPT = "너는 한국어 회화 연습 앱의 대화 기록을 정리하는 도우미야."
+
+
+def estimate_tokens(text):
+    """
+    토크나이저 없이 토큰 수를 넉넉하게 어림합니다. (한글은 글자당 1토큰, 나머지는 4글자당 1토큰)
+    """
+    if not text:
+        return 0
+    hangul = len(HANGUL.findall(text))
+    return hangul + (len(text) - hangul + 3) // 4
+
+
+def format_turn(is_user, content):
+    return f"{'사용자' if is_user else 'AI'}: {content}"
+
+
+def truncate_to_tokens(text, budget, count_tokens=estimate_tokens):
+    """
+    text가 budget 토큰을 넘으면 앞부분만 남깁니다.
+    """
+    if count_tokens(text) <= budget:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(text[:middle]) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low]
+
+
+def build_context(summary, turns, budget, count_tokens=estimate_tokens):
+    """
+    요약과 최근 턴들을 budget 토큰 안에 맞춰 (요약, 턴 목록)으로 반환합니다.
+    turns는 오래된 것부터 (is_user, content) 순서이며, 예산이 모자라면 오래된 턴부터 뺍니다.
+    요약은 예산의 절반까지만 차지합니다.
+    """
+    summary = truncate_to_tokens(summary or '', budget // 2, count_tokens)
+    remaining = budget - count_tokens(summary)
+    kept = []
+    for is_user, content in reversed(turns):
+        line = format_turn(is_user, content)
+        cost = count_tokens(line) + 1
+        if cost > remaining:
+            break
+        kept.append(line)
+        remaining -= cost
+    kept.reverse()
+    return summary, kept
+
+
+def build_summary_request(previous_summary, turns, max_chars):
+    """
+    기존 요약에 새 대화를 합쳐 요약을 갱신하도록 요청하는 메시지 목록을 만듭니다.
+    """
+    lines = "\n".join(format_turn(is_user, content) for is_user, content in turns)
+    prompt = f"""지금까지의 대화 요약:
+{previous_summary or '(없음)'}
+
+새 대화:
+{lines}
+
+위 요약과 새 대화를 합쳐서 {max_chars}자 이내의 요약으로 갱신해줘.
+사용자의 관심사, 사용자에 대한 정보(이름, 직업, 계획 등), 나눈 주제, 사용자가 자주 틀리는 표현은 남기고
+인사말이나 반복되는 내용은 빼줘. 요약만 출력해."""
+    return [
+        {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
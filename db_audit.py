@@ -0,0 +1,33 @@
+"""
+SQLite 쿼리 플랜 점검 도구
+
+EXPLAIN QUERY PLAN 결과에서 테이블이나 인덱스 전체를 훑는 단계(SCAN <table> ...)를 찾습니다.
+"""
+import re
+
+# 'SCAN message' 는 테이블 전체, 'SCAN message USING (COVERING) INDEX ...' 는 인덱스 전체를 읽음
+# 검색 조건으로 범위를 좁히는 단계는 'SEARCH ...' 로 나옴
+FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?(?: USING (?:COVERING )?INDEX \w+)?$')
+
+
+def explain_query_plan(session, statement):
+    """
+    SQLAlchemy 쿼리/구문의 EXPLAIN QUERY PLAN 결과를 단계 설명 목록으로 반환합니다.
+    """
+    if hasattr(statement, 'statement'):
+        statement = statement.statement
+    compiled = statement.compile(dialect=session.get_bind().dialect, compile_kwargs={'render_postcompile': True})
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}', params)
+    return [row[-1] for row in rows]
+
+
+def full_scans(plan, tables=None):
+    """
+    플랜에서 전체 스캔 단계에 해당하는 테이블 이름 목록을 반환합니다.
+    tables를 주면 그 테이블만 봅니다. (서브쿼리 결과를 읽는 단계 등은 제외)
+    """
+    scanned = [match.group(1) for match in map(FULL_SCAN.match, plan) if match]
+    if tables is not None:
+        scanned = [table for table in scanned if table in tables]
+    return scanned
@@ -0,0 +1,184 @@
+"""
+SQLite 온라인 백업
+
+sqlite3 backup API로 실행 중인 DB를 페이지 단위로 복사해 일관된 스냅숏을 만들고 gzip으로 압축합니다.
+단계 사이에 잠깐씩 쉬어서 다른 요청의 쓰기를 막지 않으며, 진행 상황은 백업 폴더의 status.json에
+기록하므로 어느 워커에서든 조회할 수 있습니다.
+
+복사 중에 다른 연결이 DB를 바꾸면 SQLite가 처음부터 다시 복사합니다. 쓰기가 많아 max_restarts번 넘게
+다시 시작되면 남은 복사를 한 단계로 끝냅니다. (WAL 모드에서는 이 동안에도 쓰기가 막히지 않음)
+"""
+import fcntl
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import time
+from datetime import datetime
+
+SNAPSHOT_PREFIX = 'users-'
+SNAPSHOT_SUFFIX = '.db.gz'
+
+
+class BackupRestarted(Exception):
+    pass
+
+
+class BackupManager:
+    def __init__(self, db_path, backup_dir, keep=7, pages_per_step=1024, step_sleep=0.005, max_restarts=3):
+        self.db_path = db_path
+        self.backup_dir = backup_dir
+        self.keep = keep
+        self.pages_per_step = pages_per_step
+        self.step_sleep = step_sleep
+        self.max_restarts = max_restarts
+        self.status_path = os.path.join(backup_dir, 'status.json')
+        self.lock_path = os.path.join(backup_dir, 'backup.lock')
+
+    def snapshots(self):
+        """
+        압축이 끝난 스냅숏 목록을 최신순으로 반환합니다.
+        """
+        if not os.path.isdir(self.backup_dir):
+            return []
+        snapshots = []
+        for name in os.listdir(self.backup_dir):
+            if name.startswith(SNAPSHOT_PREFIX) and name.endswith(SNAPSHOT_SUFFIX):
+                stat = os.stat(os.path.join(self.backup_dir, name))
+                snapshots.append({
+                    'name': name,
+                    'size': stat.st_size,
+                    'created_at': datetime.utcfromtimestamp(stat.st_mtime).isoformat(),
+                })
+        # 파일 이름의 시각 순서 = 생성 순서
+        snapshots.sort(key=lambda snapshot: snapshot['name'], reverse=True)
+        return snapshots
+
+    def snapshot_path(self, name=None):
+        """
+        name 스냅숏(없으면 최신 스냅숏)의 경로를 반환합니다. 없거나 잘못된 이름이면 None
+        """
+        if name is None:
+            snapshots = self.snapshots()
+            if not snapshots:
+                return None
+            name = snapshots[0]['name']
+        if os.path.basename(name) != name or not (name.startswith(SNAPSHOT_PREFIX) and name.endswith(SNAPSHOT_SUFFIX)):
+            return None
+        path = os.path.join(self.backup_dir, name)
+        return path if os.path.exists(path) else None
+
+    def status(self):
+        try:
+            with open(self.status_path, encoding='utf-8') as f:
+                status = json.load(f)
+        except (OSError, ValueError):
+            status = {'state': 'idle'}
+        # 백업하던 프로세스가 죽었으면 잠금이 풀려 있음
+        if status.get('state') in ('running', 'compressing') and not self.is_running():
+            status['state'] = 'interrupted'
+        return status
+
+    def is_running(self):
+        lock_file = self._acquire_lock()
+        if lock_file is None:
+            return True
+        lock_file.close()
+        return False
+
+    def run(self):
+        """
+        스냅숏을 하나 만들고 보관 개수를 넘는 오래된 스냅숏을 지운 뒤 스냅숏 이름을 반환합니다.
+        다른 프로세스가 이미 백업 중이면 None을 반환합니다.
+        """
+        os.makedirs(self.backup_dir, exist_ok=True)
+        lock_file = self._acquire_lock()
+        if lock_file is None:
+            return None
+        started = time.perf_counter()
+        # 밀리초까지 넣어 같은 초에 두 번 만들어도 덮어쓰지 않음
+        name = f"{SNAPSHOT_PREFIX}{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')[:-3]}Z{SNAPSHOT_SUFFIX}"
+        raw_path = os.path.join(self.backup_dir, f'.{name}.raw')
+        compressed_path = os.path.join(self.backup_dir, f'.{name}.tmp')
+        status = {
+            'state': 'running',
+            'snapshot': name,
+            'started_at': datetime.utcnow().isoformat(),
+            'pages_total': None,
+            'pages_done': 0,
+            'restarts': 0,
+        }
+        try:
+            self._write_status(status)
+            self._copy_pages(raw_path, status)
+
+            status['state'] = 'compressing'
+            self._write_status(status)
+            with open(raw_path, 'rb') as src, gzip.open(compressed_path, 'wb', compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            os.replace(compressed_path, os.path.join(self.backup_dir, name))
+
+            status.update(
+                state='done',
+                finished_at=datetime.utcnow().isoformat(),
+                duration=round(time.perf_counter() - started, 3),
+                size=os.path.getsize(os.path.join(self.backup_dir, name)),
+            )
+            self._write_status(status)
+            self.prune()
+            print(f"Database backup {name} done in {status['duration']}s ({status['pages_total']} pages, {status['restarts']} restarts)")
+            return name
+        except Exception as e:
+            status.update(state='failed', error=str(e), finished_at=datetime.utcnow().isoformat())
+            self._write_status(status)
+            raise
+        finally:
+            for path in (raw_path, compressed_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            lock_file.close()
+
+    def prune(self):
+        for snapshot in self.snapshots()[self.keep:]:
+            os.remove(os.path.join(self.backup_dir, snapshot['name']))
+
+    def _copy_pages(self, raw_path, status):
+        def progress(_, remaining, total):
+            # 남은 페이지가 늘었으면 원본이 바뀌어서 처음부터 다시 복사하는 중
+            if status['pages_total'] is not None and total - remaining < status['pages_done']:
+                status['restarts'] += 1
+                if status['restarts'] > self.max_restarts:
+                    raise BackupRestarted()
+            status.update(pages_total=total, pages_done=total - remaining)
+            self._write_status(status)
+
+        source = sqlite3.connect(self.db_path)
+        try:
+            target = sqlite3.connect(raw_path)
+            try:
+                try:
+                    source.backup(target, pages=self.pages_per_step, progress=progress, sleep=self.step_sleep)
+                except BackupRestarted:
+                    source.backup(target)
+                    status['pages_done'] = status['pages_total']
+            finally:
+                target.close()
+        finally:
+            source.close()
+
+    def _acquire_lock(self):
+        os.makedirs(self.backup_dir, exist_ok=True)
+        lock_file = open(self.lock_path, 'a')
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return None
+        return lock_file
+
+    def _write_status(self, status):
+        tmp_path = f'{self.status_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(status, f)
+        os.replace(tmp_path, self.status_path)
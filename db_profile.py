@@ -0,0 +1,69 @@
+"""
+DB 엔진 설정 프로필
+
+- sqlite: 연결될 때마다 WAL, synchronous=NORMAL, busy_timeout, mmap, 페이지 캐시 PRAGMA를 적용합니다.
+  WAL에서는 읽기가 쓰기를 막지 않고, 쓰기끼리는 busy_timeout 동안 기다렸다가 진행하므로
+  "database is locked" 오류 대신 짧은 대기로 끝납니다.
+  (쓰기 트랜잭션을 LLM 호출 같은 네트워크 대기 동안 열어 두지 않아야 대기 시간이 짧게 유지됨)
+- 그 외 (DATABASE_URL=postgresql://... 등): 커넥션 풀 크기, 재사용 주기, pre-ping만 설정합니다.
+
+DB_PROFILE=legacy 로 두면 SQLite 기본값(롤백 저널, PRAGMA 없음)으로 동작합니다. (벤치마크 비교용)
+"""
+from sqlalchemy import event
+
+
+def normalize_database_url(url):
+    # 일부 호스팅 서비스가 주는 postgres:// 는 SQLAlchemy 2.0에서 인식하지 않음
+    if url.startswith('postgres://'):
+        return 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+def is_sqlite(url):
+    return url.startswith('sqlite')
+
+
+def sqlite_pragmas(config):
+    return {
+        'journal_mode': config['SQLITE_JOURNAL_MODE'],
+        'synchronous': config['SQLITE_SYNCHRONOUS'],
+        'busy_timeout': config['SQLITE_BUSY_TIMEOUT_MS'],
+        'mmap_size': config['SQLITE_MMAP_SIZE'],
+        # 음수는 KiB 단위
+        'cache_size': -config['SQLITE_CACHE_SIZE_KB'],
+    }
+
+
+def engine_options(config):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS 로 쓸 엔진 옵션을 만듭니다.
+    """
+    if config['DB_PROFILE'] == 'legacy':
+        return {}
+    options = {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+    }
+    if is_sqlite(config['SQLALCHEMY_DATABASE_URI']):
+        # 파이썬 sqlite3 드라이버의 잠금 대기 시간(초)도 busy_timeout과 맞춤
+        options['connect_args'] = {'timeout': config['SQLITE_BUSY_TIMEOUT_MS'] / 1000}
+    else:
+        options['pool_pre_ping'] = True
+        options['pool_recycle'] = config['DB_POOL_RECYCLE']
+    return options
+
+
+def install_sqlite_pragmas(engine, pragmas):
+    """
+    엔진이 새 연결을 만들 때마다 pragmas를 적용합니다.
+    """
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
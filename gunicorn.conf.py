@@ -0,0 +1,39 @@
+"""
+gunicorn 설정
+
+기본값은 gevent 워커입니다. OpenAI 호출처럼 네트워크를 기다리는 동안
+워커를 붙잡지 않고 다른 요청을 처리하므로, 프로세스 하나가 수백 개의
+LLM 요청을 동시에 진행할 수 있습니다.
+GUNICORN_WORKER_CLASS=sync 로 예전 동기 워커 방식으로 돌아갈 수 있습니다.
+"""
+import os
+
+bind = f":{os.environ.get('PORT', '8000')}"
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gevent')
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+# gevent 워커 하나가 동시에 처리할 최대 연결 수
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 500))
+# 스트리밍 응답과 느린 LLM 호출을 고려한 타임아웃
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+
+def on_starting(server):
+    # 이전 실행의 워커별 계측 파일을 지워 카운터를 새로 시작
+    from metrics import clear_snapshots
+    metrics_dir = os.environ.get('METRICS_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'metrics'))
+    if os.path.isdir(metrics_dir):
+        clear_snapshots(metrics_dir)
+
+
+def post_worker_init(worker):
+    # 요청이 들어오기 전에도 예약 작업이 돌도록 워커가 뜨자마자 스케줄러를 시작
+    # (리더는 워커 중 하나만 맡음)
+    from app import start_scheduler
+    start_scheduler()
+
+
+def worker_exit(server, worker):
+    # 워커가 내려갈 때 아직 반영하지 않은 사용 시간을 DB에 씀
+    from app import metrics, usage_buffer
+    usage_buffer.flush()
+    metrics.flush()
@@ -0,0 +1,127 @@
+"""
+관심사 키워드/감정 단어 매처
+
+사전(lexicon)의 모든 단어를 정규식 하나로 미리 컴파일해 두고, 메시지를 한 번만 훑어서
+관심사 카테고리와 감정 점수를 함께 계산합니다.
+
+- 관심사 키워드는 단어 안 어디에 있어도 찾습니다. ('여행지', '배낭여행' 등 합성어 포함)
+  영문 약어 키워드('AI', 'IT')는 적힌 대소문자 그대로, 단어 단위로만 찾습니다.
+- 감정 단어는 어간으로 적어 두고 어절 첫머리에서만 찾으므로 '좋아요', '좋았어', '싫어서'처럼
+  활용된 형태도 잡힙니다. 바로 앞에 부정어('안', '못')가 있으면 극성을 뒤집습니다.
+"""
+import json
+import re
+
+
+def is_hangul(char):
+    return '가' <= char <= '힣'
+
+
+def is_ascii_alnum(message, index):
+    return 0 <= index < len(message) and message[index].isascii() and message[index].isalnum()
+
+
+def trie_pattern(terms):
+    """
+    단어 목록을 공통 접두사로 묶은 정규식으로 만듭니다. ('여행', '여행지' -> '여행(?:지)?')
+    긴 단어가 먼저 시도되므로 가장 긴 단어가 매치됩니다.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return _node_pattern(trie)
+
+
+def _node_pattern(node):
+    branches = [re.escape(char) + _node_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    if '' in node:
+        return f'(?:{body})?'
+    return body
+
+
+def load_lexicon(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+class KeywordMatcher:
+    def __init__(self, lexicon):
+        self.categories = list(lexicon['categories'])
+        # 단어 -> (카테고리 집합, 극성) ; 같은 단어가 여러 카테고리에 속할 수 있음 ('운동')
+        self._terms = {}
+        for category, words in lexicon['categories'].items():
+            for word in words:
+                self._entry(word)[0].add(category)
+        polarity = {'positive': 1, 'negative': -1}
+        for label, stems in lexicon.get('sentiment', {}).items():
+            for stem in stems:
+                self._entry(stem)[1] = polarity[label]
+
+        self.negations = tuple(lexicon.get('negations', []))
+        # 앞머리에 lookbehind나 선택 그룹을 두지 않아야 re가 첫 글자 집합으로 빠르게 건너뜀
+        # 어절 경계·부정어 확인은 매치된 위치에서만 따로 함
+        self.pattern = re.compile(trie_pattern(self._terms))
+
+    def _entry(self, term):
+        if term not in self._terms:
+            self._terms[term] = [set(), 0]
+        return self._terms[term]
+
+    def _follows_negation(self, message, end):
+        """
+        message[:end]가 부정어 어절('안', '못')로 끝나는지 확인합니다. ('불안' 처럼 단어 끝에 붙은 건 제외)
+        """
+        for negation in self.negations:
+            start = end - len(negation)
+            if message.endswith(negation, 0, end) and (start == 0 or not is_hangul(message[start - 1])):
+                return True
+        return False
+
+    def _is_word_start(self, message, start):
+        """
+        어절 첫머리이거나 부정어 바로 뒤인지 확인합니다. ('좋아', '안좋아')
+        """
+        return start == 0 or not is_hangul(message[start - 1]) or self._follows_negation(message, start)
+
+    def _is_negated(self, message, start):
+        """
+        바로 앞이 부정어인지 확인합니다. ('안 좋아', '안좋아')
+        """
+        while start > 0 and message[start - 1].isspace():
+            start -= 1
+        return self._follows_negation(message, start)
+
+    def analyze(self, message):
+        """
+        (관심사 카테고리 목록, 'positive' | 'negative' | 'neutral')을 반환합니다.
+        """
+        found = set()
+        score = 0
+        for match in self.pattern.finditer(message):
+            term = match.group()
+            start, end = match.span()
+            categories, polarity = self._terms[term]
+            if term.isascii():
+                # 'AI가'처럼 한글 조사가 바로 붙는 경우도 있으므로 영문/숫자 경계만 확인
+                if is_ascii_alnum(message, start - 1) or is_ascii_alnum(message, end):
+                    continue
+            elif polarity and not categories and not self._is_word_start(message, start):
+                continue
+            found.update(categories)
+            if polarity:
+                score += -polarity if self._is_negated(message, start) else polarity
+
+        preferences = [category for category in self.categories if category in found]
+        if score > 0:
+            sentiment = 'positive'
+        elif score < 0:
+            sentiment = 'negative'
+        else:
+            sentiment = 'neutral'
+        return preferences, sentiment
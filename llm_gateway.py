@@ -0,0 +1,321 @@
+"""
+OpenAI 호출 게이트웨이
+
+모든 OpenAI 호출이 이 게이트웨이를 거치도록 해서 모델별로 다음을 적용합니다.
+- deadline: 재시도를 포함한 전체 제한 시간 (각 시도의 타임아웃은 남은 시간, 스트리밍은 마지막 조각까지)
+- 재시도: 타임아웃, 연결 오류, 429, 5xx만 지수 백오프 + 지터로 다시 시도
+- 동시 호출 수 제한: 모델별 세마포어, acquire_timeout 안에 자리가 안 나면 바로 실패
+- 서킷 브레이커: 연속 실패가 쌓이면 reset_timeout 동안 호출하지 않고 바로 실패
+호출 위치(site)별로 호출 수, 오류, 재시도, 지연 시간을 집계합니다.
+"""
+import random
+import time
+from collections import defaultdict, deque
+from threading import BoundedSemaphore, Lock, Timer
+
+import openai
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMUnavailable(Exception):
+    """
+    서킷이 열려 있거나 동시 호출 자리가 없어 호출하지 않고 실패한 경우
+    """
+
+
+def is_retryable(error):
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code in RETRYABLE_STATUS
+
+
+class ModelPolicy:
+    def __init__(self, deadline=30.0, max_retries=2, concurrency=32):
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.concurrency = concurrency
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow(self):
+        """
+        닫혀 있으면 통과, 열린 지 reset_timeout이 지났으면 시험 호출 하나만 통과시킵니다.
+        """
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def release_probe(self):
+        """
+        시험 호출이 성공도 실패도 아닌 채로 끝났을 때 상태는 그대로 두고 다음 호출이 다시 시험할 수 있게 합니다.
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+
+class SiteStats:
+    def __init__(self, window=500):
+        self.calls = 0
+        self.errors = defaultdict(int)
+        self.retries = 0
+        self.rejected = 0
+        # 첫 조각은 받았지만 deadline 안에 끝나지 않아 끊은 스트림 수
+        self.stream_timeouts = 0
+        self.latencies = deque(maxlen=window)
+
+    def snapshot(self):
+        ordered = sorted(self.latencies)
+
+        def percentile(pct):
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] * 1000, 1)
+
+        return {
+            'calls': self.calls,
+            'errors': dict(self.errors),
+            'retries': self.retries,
+            'rejected': self.rejected,
+            'stream_timeouts': self.stream_timeouts,
+            'p50_ms': percentile(50),
+            'p95_ms': percentile(95),
+            'max_ms': round(ordered[-1] * 1000, 1) if ordered else None,
+        }
+
+
+class LLMGateway:
+    def __init__(self, client, policies=None, default_policy=None, acquire_timeout=5.0,
+                 breaker_failures=5, breaker_reset=30.0, backoff_base=0.5, backoff_max=4.0, observer=None, usage_observer=None):
+        self.client = client
+        # 계측용 콜백: observer(site, model, latency, outcome)는 호출이 끝날 때마다,
+        # usage_observer(site, model, usage)는 응답에 토큰 사용량이 있을 때 불림
+        self.observer = observer
+        self.usage_observer = usage_observer
+        self.policies = dict(policies or {})
+        self.default_policy = default_policy or ModelPolicy()
+        self.acquire_timeout = acquire_timeout
+        self.breaker_failures = breaker_failures
+        self.breaker_reset = breaker_reset
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._semaphores = {}
+        self._breakers = {}
+        self._stats = defaultdict(SiteStats)
+        self._lock = Lock()
+
+    def policy(self, model):
+        return self.policies.get(model, self.default_policy)
+
+    def _model_state(self, model):
+        with self._lock:
+            if model not in self._semaphores:
+                self._semaphores[model] = BoundedSemaphore(self.policy(model).concurrency)
+                self._breakers[model] = CircuitBreaker(self.breaker_failures, self.breaker_reset)
+            return self._semaphores[model], self._breakers[model]
+
+    def _record(self, site, model, latency=None, error=None, retried=False, rejected=False):
+        if self.observer is not None and not retried:
+            outcome = 'ok' if error is None else ('rejected' if rejected else type(error).__name__)
+            self.observer(site, model, latency or 0.0, outcome)
+        with self._lock:
+            stats = self._stats[site]
+            if retried:
+                stats.retries += 1
+                return
+            stats.calls += 1
+            if rejected:
+                stats.rejected += 1
+            if error is not None:
+                stats.errors[type(error).__name__] += 1
+            if latency is not None:
+                stats.latencies.append(latency)
+
+    def _record_stream_timeout(self, site, breaker):
+        breaker.record_failure()
+        with self._lock:
+            stats = self._stats[site]
+            stats.stream_timeouts += 1
+            stats.errors['APITimeoutError'] += 1
+
+    def _backoff(self, attempt, remaining):
+        # full jitter: 여러 워커가 같은 순간에 다시 몰리지 않도록 0~상한 사이에서 고름
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        return min(delay, max(0.0, remaining))
+
+    def _call(self, site, model, request, first_result=None):
+        """
+        request(timeout)를 정책에 따라 실행합니다. first_result가 있으면 그 값이 성공적으로 나온 시점까지만
+        재시도합니다. (스트리밍은 첫 조각이 온 뒤에는 다시 시도하지 않음)
+        """
+        policy = self.policy(model)
+        semaphore, breaker = self._model_state(model)
+        started = time.monotonic()
+        deadline = started + policy.deadline
+
+        if not breaker.allow():
+            error = LLMUnavailable(f"{model} circuit open")
+            self._record(site, model, rejected=True, error=error)
+            raise error
+        if not semaphore.acquire(timeout=min(self.acquire_timeout, policy.deadline)):
+            error = LLMUnavailable(f"{model} concurrency limit reached")
+            self._record(site, model, rejected=True, error=error)
+            # 시험 호출 자리를 잡았다면 다음 호출이 다시 시험할 수 있게 돌려놓음
+            breaker.release_probe()
+            raise error
+
+        attempt = 0
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining <= 0:
+                        raise openai.APITimeoutError(request=None)
+                    result = request(remaining)
+                    if first_result is not None:
+                        result = first_result(result)
+                    breaker.record_success()
+                    self._record(site, model, latency=time.monotonic() - started)
+                    return result, semaphore
+                except Exception as e:
+                    retryable = is_retryable(e)
+                    remaining = deadline - time.monotonic()
+                    # 다른 호출 때문에 이미 서킷이 열렸으면 더 두드리지 않음
+                    if retryable and attempt < policy.max_retries and remaining > 0 and breaker.state != 'open':
+                        self._record(site, model, retried=True)
+                        time.sleep(self._backoff(attempt, remaining))
+                        attempt += 1
+                        continue
+                    # 요청 자체가 잘못된 4xx는 상대 서버 장애도 정상 응답도 아니므로 서킷 상태를 바꾸지 않음
+                    if retryable:
+                        breaker.record_failure()
+                    else:
+                        breaker.release_probe()
+                    self._record(site, model, latency=time.monotonic() - started, error=e)
+                    raise
+        except BaseException:
+            semaphore.release()
+            raise
+
+    def chat(self, site, **kwargs):
+        """
+        chat.completions.create 와 같은 인자를 받아 응답을 반환합니다.
+        """
+        model = kwargs['model']
+        response, semaphore = self._call(
+            site, model,
+            lambda timeout: self.client.chat.completions.create(timeout=timeout, **kwargs),
+        )
+        semaphore.release()
+        if self.usage_observer is not None and response.usage:
+            self.usage_observer(site, model, response.usage)
+        return response
+
+    def chat_stream(self, site, **kwargs):
+        """
+        chat.completions.create(stream=True)의 청크를 돌려주는 제너레이터
+        첫 청크가 오기 전까지의 실패만 재시도하며, 스트림을 다 읽을 때까지 동시 호출 자리를 잡고 있습니다.
+        지연 시간 통계는 첫 청크까지의 시간입니다.
+        deadline은 스트림 전체에 적용되어, 지나면 스트림을 닫고 APITimeoutError를 올리며 서킷에 실패로 셉니다.
+        """
+        model = kwargs['model']
+        deadline = time.monotonic() + self.policy(model).deadline
+
+        def first_chunk(stream):
+            iterator = iter(stream)
+            try:
+                return stream, next(iterator), iterator
+            except StopIteration:
+                return stream, None, iterator
+
+        (stream, first, iterator), semaphore = self._call(
+            site, model,
+            lambda timeout: self.client.chat.completions.create(stream=True, timeout=timeout, **kwargs),
+            first_result=first_chunk,
+        )
+        _, breaker = self._model_state(model)
+        # 조각 사이에서 멈춘 스트림은 읽기 타임아웃까지 기다리게 되므로 deadline에 스트림을 닫아 깨움
+        # (gevent에서는 기다리던 읽기가 바로 실패하고, 일반 스레드에서는 다음 읽기에서 실패함)
+        watchdog = Timer(max(0.0, deadline - time.monotonic()), stream.close)
+        watchdog.daemon = True
+        watchdog.start()
+        try:
+            if first is not None:
+                yield first
+                for chunk in iterator:
+                    if time.monotonic() >= deadline:
+                        raise openai.APITimeoutError(request=None)
+                    if self.usage_observer is not None and chunk.usage:
+                        self.usage_observer(site, model, chunk.usage)
+                    yield chunk
+        except Exception as e:
+            if time.monotonic() < deadline:
+                raise
+            self._record_stream_timeout(site, breaker)
+            if isinstance(e, openai.APITimeoutError):
+                raise
+            raise openai.APITimeoutError(request=None) from e
+        finally:
+            watchdog.cancel()
+            semaphore.release()
+            stream.close()
+
+    def speech(self, site, **kwargs):
+        """
+        audio.speech.create 와 같은 인자를 받아 오디오 바이트를 반환합니다.
+        """
+        model = kwargs['model']
+        content, semaphore = self._call(
+            site, model,
+            lambda timeout: self.client.audio.speech.create(timeout=timeout, **kwargs).content,
+        )
+        semaphore.release()
+        return content
+
+    def stats(self):
+        with self._lock:
+            sites = {site: stats.snapshot() for site, stats in self._stats.items()}
+            models = {
+                model: {
+                    'circuit': self._breakers[model].state,
+                    'consecutive_failures': self._breakers[model].failures,
+                    'concurrency': self.policy(model).concurrency,
+                    'deadline': self.policy(model).deadline,
+                }
+                for model in self._semaphores
+            }
+        return {'sites': sites, 'models': models}
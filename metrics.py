@@ -0,0 +1,221 @@
+"""
+Prometheus 형식 계측
+
+카운터와 히스토그램을 프로세스 메모리에 모으고 Prometheus 텍스트 형식으로 내보냅니다.
+gunicorn 워커마다 값이 따로 쌓이므로 각 워커는 flush_interval초마다 자기 값을 directory/<pid>.json 에
+써 두고, /metrics 를 처리하는 워커가 다른 워커의 파일과 자기 메모리 값을 합쳐서 내보냅니다.
+내려간 워커의 파일도 그대로 합치므로 카운터는 서버가 다시 시작될 때까지 줄어들지 않습니다.
+"""
+import glob
+import json
+import math
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from threading import Lock, Thread
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in pairs) + '}'
+
+
+def format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    @staticmethod
+    def merge(total, value):
+        return value if total is None else total + value
+
+    def render(self, samples):
+        for key, value in samples:
+            yield f"{self.name}{format_labels(zip(self.labelnames, key))} {format_value(value)}"
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # 라벨 값 → [버킷별 개수..., 마지막 버킷을 넘은 개수, 합계]
+        self._values = {}
+        self._lock = Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[index] += 1
+            counts[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), list(counts)] for key, counts in self._values.items()]
+
+    @staticmethod
+    def merge(total, counts):
+        return list(counts) if total is None else [a + b for a, b in zip(total, counts)]
+
+    def render(self, samples):
+        for key, counts in samples:
+            pairs = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield f"{self.name}_bucket{format_labels(pairs + [('le', format_value(bound))])} {cumulative}"
+            yield f"{self.name}_sum{format_labels(pairs)} {round(counts[-1], 6)}"
+            yield f"{self.name}_count{format_labels(pairs)} {cumulative}"
+
+
+class MetricsRegistry:
+    def __init__(self, directory=None, flush_interval=5.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._metrics = {}
+        self._lock = Lock()
+        self._thread = None
+        self._thread_pid = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def start(self):
+        """
+        워커 값을 주기적으로 파일에 쓰는 스레드를 시작합니다. (포크된 프로세스에서는 새로 시작)
+        """
+        if not self.directory:
+            return
+        with self._lock:
+            if self._thread_pid == os.getpid():
+                return
+            self._thread_pid = os.getpid()
+            self._thread = Thread(target=self._loop, name='metrics-flush', daemon=True)
+            self._thread.start()
+
+    def snapshot(self):
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def flush(self):
+        if not self.directory:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, self._worker_path(os.getpid()))
+
+    def collect(self):
+        """
+        이 워커의 현재 값과 다른 워커가 남긴 값을 합쳐 {이름: {라벨 값: 값}} 으로 반환합니다.
+        """
+        snapshots = [self.snapshot()]
+        if self.directory:
+            own_path = self._worker_path(os.getpid())
+            for path in glob.glob(os.path.join(self.directory, '*.json')):
+                if path == own_path:
+                    continue
+                try:
+                    with open(path, encoding='utf-8') as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+
+        merged = {}
+        for snapshot in snapshots:
+            for name, samples in snapshot.items():
+                metric = self._metrics.get(name)
+                if metric is None:
+                    continue
+                totals = merged.setdefault(name, {})
+                for key, value in samples:
+                    key = tuple(key)
+                    totals[key] = metric.merge(totals.get(key), value)
+        return merged
+
+    def render(self):
+        """
+        Prometheus 텍스트 형식 (text/plain; version=0.0.4)
+        """
+        merged = self.collect()
+        lines = []
+        for name, metric in self._metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.render(sorted(merged.get(name, {}).items())))
+        return '\n'.join(lines) + '\n'
+
+    def _worker_path(self, pid):
+        return os.path.join(self.directory, f"{pid}.json")
+
+    def _loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Error flushing metrics: {str(e)}")
+
+
+def clear_snapshots(directory):
+    """
+    서버를 새로 띄울 때 이전 실행의 워커 파일을 지웁니다.
+    """
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        os.remove(path)
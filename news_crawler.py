@@ -0,0 +1,136 @@
+"""
+뉴스 크롤러
+
+연결을 재사용하는 세션, 요청별 타임아웃, ETag/Last-Modified 조건부 요청,
+기사 본문의 제한된 동시 수집, 스레드 풀에서의 BeautifulSoup 파싱을 담당합니다.
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import Lock
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+
+def parse_article_list(html, base_url):
+    soup = BeautifulSoup(html, 'html.parser')
+    articles = []
+    for news in soup.find_all('div', class_='news_list'):
+        title_tag = news.find('div', class_='title')
+        if title_tag and title_tag.a:
+            articles.append(urljoin(base_url, title_tag.a['href']))
+    return articles
+
+
+def parse_article(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    content_div = soup.find('div', {'id': 'CmAdContent'})
+    if content_div:
+        return content_div.get_text(separator="\n").strip()
+    return None
+
+
+class NewsCrawler:
+    def __init__(self, timeout=(3.05, 10), max_workers=4, pool_size=10, max_cached_pages=200, max_seen_urls=5000):
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.max_cached_pages = max_cached_pages
+        self.max_seen_urls = max_seen_urls
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['User-Agent'] = 'Mozilla/5.0 (compatible; TalKR news crawler)'
+        self._fetch_executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._parse_executor = ThreadPoolExecutor(max_workers=max_workers)
+        # URL별 (ETag, Last-Modified, 본문) - 변경되지 않은 페이지는 304로 재사용
+        self._pages = OrderedDict()
+        self._seen = OrderedDict()
+        self._lock = Lock()
+        self.counters = {'requests': 0, 'not_modified': 0, 'errors': 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def fetch(self, url):
+        """
+        조건부 GET으로 페이지를 가져옵니다. 실패하면 None을 반환합니다.
+        """
+        headers = {}
+        with self._lock:
+            cached = self._pages.get(url)
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        self._count('requests')
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            self._count('errors')
+            print(f"웹 페이지를 불러오지 못했습니다: {url} ({str(e)})")
+            return None
+
+        if response.status_code == 304 and cached:
+            self._count('not_modified')
+            with self._lock:
+                self._pages.move_to_end(url)
+            return cached[2]
+        if response.status_code != 200:
+            self._count('errors')
+            print(f"웹 페이지를 불러오지 못했습니다. 상태 코드: {response.status_code}")
+            return None
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            with self._lock:
+                self._pages[url] = (etag, last_modified, response.text)
+                self._pages.move_to_end(url)
+                while len(self._pages) > self.max_cached_pages:
+                    self._pages.popitem(last=False)
+        return response.text
+
+    def list_articles(self, list_url):
+        html = self.fetch(list_url)
+        if html is None:
+            return []
+        return self._parse_executor.submit(parse_article_list, html, list_url).result()
+
+    def scrape_article(self, url):
+        html = self.fetch(url)
+        if html is None:
+            return None
+        return self._parse_executor.submit(parse_article, html).result()
+
+    def is_seen(self, url):
+        with self._lock:
+            return url in self._seen
+
+    def mark_seen(self, url):
+        with self._lock:
+            self._seen[url] = True
+            self._seen.move_to_end(url)
+            while len(self._seen) > self.max_seen_urls:
+                self._seen.popitem(last=False)
+
+    def scrape_articles(self, urls, limit=None):
+        """
+        아직 보지 않은 기사들을 최대 max_workers개씩 동시에 가져와 (url, 본문)을 완료 순서대로 돌려줍니다.
+        """
+        candidates = [url for url in dict.fromkeys(urls) if not self.is_seen(url)]
+        if limit is not None:
+            candidates = candidates[:limit]
+        futures = {self._fetch_executor.submit(self.scrape_article, url): url for url in candidates}
+        for future in as_completed(futures):
+            url = futures[future]
+            content = future.result()
+            if content:
+                self.mark_seen(url)
+                yield url, content
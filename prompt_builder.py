@@ -0,0 +1,103 @@
+"""
+/chat 프롬프트 빌더
+
+변하지 않는 페르소나와 답변 지침을 매 요청 바이트 단위로 같은 첫 system 메시지로 두어
+공급자 쪽 프롬프트 프리픽스 캐시가 적중하도록 하고, 사용자 관심사·감정·대화 요약·최근 대화처럼
+요청마다 바뀌는 내용은 그 뒤 메시지로 보냅니다. 컨텍스트는 토큰 예산에 맞춰 잘라냅니다.
+"""
+from threading import Lock
+
+from conversation_memory import build_context, estimate_tokens
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# 메시지 하나에 붙는 역할/구분 토큰과 응답 시작 토큰 (OpenAI 채팅 포맷 기준 근사치)
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+
+
+class TokenCounter:
+    """
+    tiktoken 인코딩이 있으면 정확히 세고, 없거나 불러오지 못하면 어림값을 씁니다.
+    인코딩 파일은 처음 셀 때 불러옵니다.
+    """
+    def __init__(self, encoding_name='o200k_base'):
+        self.encoding_name = encoding_name
+        self._encoding = None
+        self._loaded = False
+        self._lock = Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._loaded:
+                return
+            if tiktoken is not None and self.encoding_name:
+                try:
+                    self._encoding = tiktoken.get_encoding(self.encoding_name)
+                except Exception as e:
+                    print(f"tiktoken encoding {self.encoding_name} unavailable, estimating tokens: {str(e)}")
+            self._loaded = True
+
+    def __call__(self, text):
+        if not text:
+            return 0
+        if not self._loaded:
+            self._load()
+        if self._encoding is None:
+            return estimate_tokens(text)
+        return len(self._encoding.encode(text))
+
+
+def count_message_tokens(messages, count_tokens):
+    return sum(count_tokens(message['content']) + TOKENS_PER_MESSAGE for message in messages) + TOKENS_PER_REPLY
+
+
+class PromptBuilder:
+    def __init__(self, static_prompt, count_tokens, budget, context_budget):
+        self.static_message = {"role": "system", "content": static_prompt}
+        self.count_tokens = count_tokens
+        self.budget = budget
+        self.context_budget = context_budget
+        self._static_tokens = None
+
+    @property
+    def static_tokens(self):
+        if self._static_tokens is None:
+            self._static_tokens = self.count_tokens(self.static_message['content'])
+        return self._static_tokens
+
+    def build(self, user_message, summary, turns, preferences, sentiment, usual_preferences=(), usual_sentiment=None):
+        """
+        (메시지 목록, 프롬프트 토큰 수)를 반환합니다.
+        usual_preferences, usual_sentiment는 지난 대화에서 누적한 사용자 프로필입니다.
+        summary와 turns는 예산 안에 들어갈 만큼만 남기며, 예산이 모자라면 오래된 턴부터 뺍니다.
+        """
+        header = f"추가 컨텍스트:\n사용자 관심사: {', '.join(preferences)}\n감정 상태: {sentiment}"
+        if usual_preferences:
+            header += f"\n평소 관심사: {', '.join(usual_preferences)}"
+        if usual_sentiment:
+            header += f"\n평소 감정: {usual_sentiment}"
+        fixed = (
+            self.static_tokens
+            + self.count_tokens(header)
+            + self.count_tokens(user_message)
+            + TOKENS_PER_MESSAGE * 3
+            + TOKENS_PER_REPLY
+        )
+        available = max(0, min(self.context_budget, self.budget - fixed))
+        summary, kept = build_context(summary, turns, available, self.count_tokens)
+
+        sections = [header]
+        if summary:
+            sections.append(f"이전 대화 요약:\n{summary}")
+        if kept:
+            sections.append("최근 대화:\n" + "\n".join(kept))
+        messages = [
+            self.static_message,
+            {"role": "system", "content": "\n\n".join(sections)},
+            {"role": "user", "content": user_message},
+        ]
+        return messages, count_message_tokens(messages, self.count_tokens)
@@ -0,0 +1,120 @@
+"""
+단일 리더 작업 스케줄러
+
+여러 gunicorn 워커가 각자 스케줄러를 띄워도 파일 잠금(flock)을 잡은 프로세스 하나만
+예약 작업을 실행합니다. 리더 프로세스가 죽으면 잠금이 풀리고, 다른 워커가
+election_interval 안에 리더를 이어받습니다.
+"""
+import fcntl
+import os
+import time
+from threading import Event, Lock, Thread
+
+import schedule
+
+
+class JobScheduler:
+    def __init__(self, lock_path, runner=None, poll_interval=1.0, election_interval=30.0):
+        self.lock_path = lock_path
+        self.poll_interval = poll_interval
+        self.election_interval = election_interval
+        # runner(name, func, record): 작업 실행을 감싸서 기록을 남기는 함수
+        # record=False인 작업은 실패했을 때만 기록을 남기면 됨
+        self._runner = runner or (lambda name, func, record: func())
+        self._schedule = schedule.Scheduler()
+        self._jobs = {}
+        self._record = {}
+        self._on_election = []
+        self._pending = set()
+        self._requested_at = {}
+        self._wakeup = Event()
+        self._lock = Lock()
+        self._thread = None
+        self._lock_file = None
+        self.is_leader = False
+
+    def every(self, name, seconds, func, record=True, run_on_election=False):
+        """
+        seconds초마다 실행할 작업을 등록합니다. 1분 남짓마다 도는 정리 작업은 record=False로
+        실행 기록을 남기지 않아 DB 쓰기를 줄입니다.
+        run_on_election=True이면 리더가 된 직후에도 한 번 실행합니다.
+        """
+        self._jobs[name] = func
+        self._record[name] = record
+        if run_on_election:
+            self._on_election.append(name)
+        self._schedule.every(seconds).seconds.do(self._run, name)
+
+    def every_day_at(self, name, at, func, record=True):
+        self._jobs[name] = func
+        self._record[name] = record
+        self._schedule.every().day.at(at).do(self._run, name)
+
+    def run_now(self, name, min_interval=0):
+        """
+        리더 프로세스라면 다음 주기를 기다리지 않고 작업을 바로 실행하도록 요청합니다.
+        리더가 아니면 요청을 버립니다. (나중에 리더가 됐을 때 지난 요청을 실행하지 않도록)
+        min_interval초 안에 이미 요청한 작업이면 다시 요청하지 않습니다.
+        요청을 받아들였으면 True를 반환합니다.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if not self.is_leader:
+                return False
+            requested_at = self._requested_at.get(name)
+            if requested_at is not None and now - requested_at < min_interval:
+                return False
+            self._requested_at[name] = now
+            self._pending.add(name)
+        self._wakeup.set()
+        return True
+
+    def start(self):
+        """
+        스케줄러 스레드를 프로세스당 한 번만 시작합니다.
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._loop, name='job-scheduler', daemon=True)
+                self._thread.start()
+
+    @property
+    def started(self):
+        return self._thread is not None
+
+    def _try_acquire(self):
+        lock_file = open(self.lock_path, 'a')
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def _run(self, name):
+        try:
+            self._runner(name, self._jobs[name], self._record[name])
+        except Exception as e:
+            print(f"Error in scheduled job {name}: {str(e)}")
+
+    def _loop(self):
+        while True:
+            if not self.is_leader:
+                self.is_leader = self._try_acquire()
+                if not self.is_leader:
+                    self._wakeup.wait(self.election_interval)
+                    self._wakeup.clear()
+                    continue
+                print(f"Job scheduler leader elected (pid {os.getpid()})")
+                with self._lock:
+                    self._pending.update(self._on_election)
+
+            with self._lock:
+                pending, self._pending = self._pending, set()
+            for name in pending:
+                self._run(name)
+            self._schedule.run_pending()
+
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
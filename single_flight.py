@@ -0,0 +1,183 @@
+"""
+동일한 LLM 호출 합치기 (single-flight)
+
+(라우트, 모델/프롬프트 버전, 정규화된 입력)이 같은 호출이 동시에 들어오면 한 번만 상류를 호출하고
+나머지는 그 결과를 기다려 함께 씁니다.
+
+- 같은 워커 안: 진행 중인 호출 표에 먼저 들어온 요청이 대표로 호출하고 나머지는 Event로 기다림
+- 워커 사이: 락 파일 하나를 슬롯 표로 쓰고, 키 해시로 고른 1바이트 구간에 fcntl 레코드 잠금을 겁니다.
+  대표 호출이 끝나면 결과를 result_ttl초 동안 유지되는 JSON 파일로 남기고, 잠금을 기다리던 다른 워커는
+  잠금을 얻은 뒤 그 결과를 읽어 씁니다.
+
+레코드 잠금은 프로세스 단위이고 같은 파일의 어떤 fd를 닫아도 풀리므로 락 파일은 워커마다 한 번만 열어 둡니다.
+(같은 워커 안의 중복은 진행 중인 호출 표가 먼저 걸러 줌)
+"""
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import defaultdict
+from threading import Event, Lock
+
+from cache import normalize_text
+
+_MISSING = object()
+
+
+class _Call:
+    def __init__(self):
+        self.done = Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, directory=None, slots=65536, result_ttl=10.0, wait_timeout=30.0, poll_interval=0.02):
+        self.directory = directory
+        self.slots = slots
+        self.result_ttl = result_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._calls = {}
+        self._lock = Lock()
+        self._lock_fd = None
+        self._lock_pid = None
+        self._stats = defaultdict(lambda: {'calls': 0, 'upstream': 0, 'coalesced': 0, 'shared': 0, 'wait_timeouts': 0})
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(route, model, text):
+        payload = f"{route}\x00{model}\x00{normalize_text(text)}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def do(self, route, model, text, func):
+        """
+        같은 키로 진행 중인 호출이 있으면 그 결과를, 없으면 func()를 호출한 결과를 반환합니다.
+        func의 결과는 워커 사이에 전달할 수 있도록 JSON으로 직렬화할 수 있어야 합니다.
+        """
+        key = self.make_key(route, model, text)
+        with self._lock:
+            self._stats[route]['calls'] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self._stats[route]['coalesced'] += 1
+
+        if not leader:
+            if not call.done.wait(self.wait_timeout):
+                # 대표 호출이 너무 오래 걸리면 기다리지 않고 직접 호출
+                self._count(route, 'wait_timeouts')
+                self._count(route, 'upstream')
+                return func()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = self._run_shared(route, key, func)
+            return call.value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def _run_shared(self, route, key, func):
+        if not self.directory:
+            self._count(route, 'upstream')
+            return func()
+
+        slot = int(key[:8], 16) % self.slots
+        locked = self._acquire_slot(slot)
+        if not locked:
+            self._count(route, 'wait_timeouts')
+        try:
+            value = self._read_result(key)
+            if value is not _MISSING:
+                self._count(route, 'shared')
+                return value
+            self._count(route, 'upstream')
+            value = func()
+            self._write_result(key, value)
+            return value
+        finally:
+            if locked:
+                fcntl.lockf(self._lock_fd, fcntl.LOCK_UN, 1, slot)
+
+    def _acquire_slot(self, slot):
+        """
+        슬롯 잠금을 얻으면 True, wait_timeout 안에 얻지 못하면 False
+        gevent 워커를 막지 않도록 블로킹 잠금 대신 짧게 쉬면서 다시 시도합니다.
+        """
+        fd = self._slot_file()
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            try:
+                fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, slot)
+                return True
+            except OSError:
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(self.poll_interval)
+
+    def _slot_file(self):
+        # 포크된 프로세스는 부모의 레코드 잠금을 물려받지 않으므로 프로세스마다 새로 엶
+        with self._lock:
+            if self._lock_pid != os.getpid():
+                self._lock_fd = os.open(os.path.join(self.directory, 'slots.lock'), os.O_RDWR | os.O_CREAT, 0o644)
+                self._lock_pid = os.getpid()
+            return self._lock_fd
+
+    def _result_path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read_result(self, key):
+        try:
+            with open(self._result_path(key), encoding='utf-8') as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return _MISSING
+        if result['expires_at'] < time.time():
+            return _MISSING
+        return result['value']
+
+    def _write_result(self, key, value):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'value': value, 'expires_at': time.time() + self.result_ttl}, f, ensure_ascii=False)
+        os.replace(tmp_path, self._result_path(key))
+
+    def prune(self):
+        """
+        만료된 결과 파일을 지우고 지운 개수를 반환합니다.
+        """
+        if not self.directory:
+            return 0
+        now = time.time()
+        removed = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(('.json', '.tmp')):
+                    continue
+                try:
+                    if entry.stat().st_mtime + self.result_ttl < now:
+                        os.remove(entry.path)
+                        removed += 1
+                except FileNotFoundError:
+                    continue
+        return removed
+
+    def _count(self, route, name):
+        with self._lock:
+            self._stats[route][name] += 1
+
+    def stats(self):
+        with self._lock:
+            return {'routes': {route: dict(counts) for route, counts in self._stats.items()}, 'in_flight': len(self._calls)}
@@ -0,0 +1,66 @@
+"""
+문장 단위 TTS 파이프라인
+
+LLM 응답이 스트리밍되는 동안 문장이 완성될 때마다 TTS를 스레드 풀에 넘기고,
+결과는 문장 순서대로 돌려줍니다. 첫 문장의 음성 합성이 나머지 문장 생성과
+겹쳐서 진행됩니다.
+"""
+import re
+
+# 문장 끝 부호 뒤의 공백, 줄바꿈, 뉴스 메시지 구분자('---')를 경계로 사용
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?~…])\s+|\s*\n+\s*|\s*---\s*')
+
+
+def split_sentences(text):
+    return [part.strip() for part in SENTENCE_BOUNDARY.split(text) if part.strip()]
+
+
+class SpeechPipeline:
+    def __init__(self, synthesize, executor):
+        self._synthesize = synthesize
+        self._executor = executor
+        self._buffer = ''
+        self._futures = []
+        self._next_result = 0
+
+    def feed(self, delta):
+        """
+        스트리밍된 텍스트 조각을 받아 완성된 문장의 TTS를 바로 시작합니다.
+        """
+        self._buffer += delta
+        last_boundary = None
+        for last_boundary in SENTENCE_BOUNDARY.finditer(self._buffer):
+            pass
+        if last_boundary is None:
+            return
+        complete = self._buffer[:last_boundary.start()]
+        self._buffer = self._buffer[last_boundary.end():]
+        for sentence in split_sentences(complete):
+            self._submit(sentence)
+
+    def close(self):
+        """
+        응답이 끝났을 때 버퍼에 남은 마지막 문장을 제출합니다.
+        """
+        remaining, self._buffer = self._buffer, ''
+        for sentence in split_sentences(remaining):
+            self._submit(sentence)
+
+    def _submit(self, sentence):
+        self._futures.append((sentence, self._executor.submit(self._synthesize, sentence)))
+
+    def results(self, block=True):
+        """
+        아직 돌려주지 않은 (문장, 합성 결과)를 순서대로 돌려줍니다.
+        block=False이면 앞에서부터 이미 끝난 결과까지만 돌려줍니다.
+        합성에 실패한 문장은 건너뜁니다.
+        """
+        while self._next_result < len(self._futures):
+            sentence, future = self._futures[self._next_result]
+            if not block and not future.done():
+                return
+            self._next_result += 1
+            try:
+                yield sentence, future.result()
+            except Exception as e:
+                print(f"Error in speech generation for '{sentence}': {str(e)}")
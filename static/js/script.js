@@ -7,12 +7,17 @@ const ChatApp = (function () {
   let currentAudio = null;
   let recognition = null;
   let messageCount = 0;
-  let sessionStartTime = null;
+  let usageTimer = null;
+  let lastUsageReportTime = null;
   let isTranslating = false;
   let isAnalyzing = false;
   let pendingMessage = null;
   let messageQueue = [];
   let vocabulary = [];
+  const wordMeaningCache = new Map();
+  let historyCursor = null;
+  let isHistoryLoading = false;
+  let isHistoryExhausted = false;
 
   const elements = {
     chatContainer: document.getElementById("chat-container"),
@@ -97,10 +102,13 @@ const ChatApp = (function () {
     elements.resetPasswordBtn?.addEventListener("click", resetPassword);
     elements.logoutBtn?.addEventListener("click", logout);
     elements.showTodaysNews?.addEventListener("click", showTodaysNews);
+    elements.chatContainer.addEventListener("scroll", handleChatScroll);
     elements.showReports?.addEventListener("click", showReportsModal);
     elements.reportsModal
       .querySelector(".close")
       ?.addEventListener("click", closeReportsModal);
+    document.addEventListener("visibilitychange", handleVisibilityChange);
+    window.addEventListener("pagehide", sendUsageBeacon);
   }
 
   function sendMessage(event) {
@@ -142,12 +150,44 @@ const ChatApp = (function () {
     setAITalking(true);
     stopListening();
 
-    sendMessageToServer(message)
-      .then((data) => {
-        if (data.success) {
-          addMessage(data.message, false, data.audio);
-        } else {
+    let streamingMessage = null;
+    let audioPlayer = null;
+
+    const requestReply = canStreamResponse
+      ? streamMessageFromServer
+      : sendMessageAsEvents;
+
+    requestReply(message, (event, data) => {
+      switch (event) {
+        case "text":
+          // 첫 토큰이 도착하면 로딩 애니메이션 대신 말풍선을 보여준다
+          if (!streamingMessage) {
+            removeLoadingAnimation(loadingDiv);
+            streamingMessage = startStreamingBotMessage();
+          }
+          streamingMessage.append(data.delta);
+          break;
+        case "text_done":
+          if (!streamingMessage) {
+            removeLoadingAnimation(loadingDiv);
+            streamingMessage = startStreamingBotMessage();
+          }
+          streamingMessage.finish(data.message);
+          break;
+        case "audio_url":
+          // 서버 캐시에 있는 문장 오디오는 URL로 받아 순서대로 이어 붙인다
+          if (!audioPlayer) {
+            audioPlayer = createStreamingAudioPlayer();
+          }
+          audioPlayer.appendUrl(data.url);
+          break;
+        case "error":
           throw new Error("서버에서 오류 응답을 받았습니다.");
+      }
+    })
+      .then(() => {
+        if (audioPlayer) {
+          audioPlayer.end();
         }
       })
       .catch((error) => {
@@ -155,7 +195,9 @@ const ChatApp = (function () {
         addMessage("네트워크 오류가 발생했습니다. 다시 시도해 주세요.", false);
       })
       .finally(() => {
-        removeLoadingAnimation(loadingDiv);
+        if (!streamingMessage) {
+          removeLoadingAnimation(loadingDiv);
+        }
         setLoading(false);
         setAITalking(false);
         setProcessing(false);
@@ -170,6 +212,23 @@ const ChatApp = (function () {
       });
   }
 
+  // fetch 응답 본문을 스트림으로 읽을 수 없는 브라우저는 /chat 으로 한 번에 받는다
+  const canStreamResponse =
+    "ReadableStream" in window && "body" in Response.prototype;
+
+  function sendMessageAsEvents(message, onEvent) {
+    // /chat 응답을 /chat_stream 과 같은 이벤트로 바꿔서 처리 코드를 공유한다
+    return sendMessageToServer(message).then((data) => {
+      if (!data.success) {
+        throw new Error("서버에서 오류 응답을 받았습니다.");
+      }
+      onEvent("text_done", { message: data.message });
+      if (data.audio_url) {
+        onEvent("audio_url", { url: data.audio_url });
+      }
+    });
+  }
+
   function sendMessageToServer(message) {
     return fetch("/chat", {
       method: "POST",
@@ -182,7 +241,146 @@ const ChatApp = (function () {
     });
   }
 
-  function addMessage(message, isUser, audioData) {
+  function streamMessageFromServer(message, onEvent) {
+    return fetch("/chat_stream", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ message: message }),
+    }).then((response) => {
+      if (!response.ok)
+        throw new Error(`HTTP error! status: ${response.status}`);
+      return readEventStream(response, onEvent);
+    });
+  }
+
+  function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+
+    function pump() {
+      return reader.read().then(({ done, value }) => {
+        if (done) {
+          return;
+        }
+        buffer += decoder.decode(value, { stream: true });
+        let boundary;
+        while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+          const rawEvent = buffer.slice(0, boundary);
+          buffer = buffer.slice(boundary + 2);
+          let eventName = "message";
+          let data = "";
+          rawEvent.split("\n").forEach((line) => {
+            if (line.startsWith("event:")) {
+              eventName = line.slice(6).trim();
+            } else if (line.startsWith("data:")) {
+              data += line.slice(5).trim();
+            }
+          });
+          if (data) {
+            onEvent(eventName, JSON.parse(data));
+          }
+        }
+        return pump();
+      });
+    }
+
+    return pump();
+  }
+
+  function startStreamingBotMessage() {
+    const messageDiv = document.createElement("div");
+    messageDiv.className = "message bot-message";
+
+    const messageBubble = document.createElement("div");
+    messageBubble.className = "message-bubble";
+    messageDiv.appendChild(messageBubble);
+
+    elements.chatContainer.appendChild(messageDiv);
+
+    return {
+      append(delta) {
+        messageBubble.textContent += delta;
+        elements.chatContainer.scrollTop = elements.chatContainer.scrollHeight;
+      },
+      finish(message) {
+        messageBubble.textContent = message;
+
+        const translateBtn = document.createElement("button");
+        translateBtn.className = "translate-btn";
+        translateBtn.textContent = "번역";
+        translateBtn.onclick = () =>
+          translateMessage(message, messageDiv, translateBtn);
+        messageDiv.appendChild(translateBtn);
+
+        addWordHoverEffects(messageBubble);
+        elements.chatContainer.scrollTop = elements.chatContainer.scrollHeight;
+      },
+    };
+  }
+
+  function createStreamingAudioPlayer() {
+    // MediaSource를 지원하면 첫 조각부터 재생하고, 아니면 모두 받은 뒤 재생한다
+    const canStream =
+      "MediaSource" in window && MediaSource.isTypeSupported("audio/mpeg");
+    const chunks = [];
+    let mediaSource = null;
+    let sourceBuffer = null;
+    let isEnded = false;
+    let pendingFetches = Promise.resolve();
+
+    function flush() {
+      if (!sourceBuffer || sourceBuffer.updating) {
+        return;
+      }
+      if (chunks.length > 0) {
+        sourceBuffer.appendBuffer(chunks.shift());
+      } else if (isEnded && mediaSource.readyState === "open") {
+        mediaSource.endOfStream();
+      }
+    }
+
+    if (canStream) {
+      mediaSource = new MediaSource();
+      mediaSource.addEventListener("sourceopen", () => {
+        sourceBuffer = mediaSource.addSourceBuffer("audio/mpeg");
+        sourceBuffer.addEventListener("updateend", flush);
+        flush();
+      });
+      playAudioUrl(URL.createObjectURL(mediaSource));
+    }
+
+    function appendBytes(bytes) {
+      chunks.push(bytes);
+      if (canStream) {
+        flush();
+      }
+    }
+
+    return {
+      appendUrl(url) {
+        // 문장 순서가 바뀌지 않도록 이전 요청이 끝난 뒤에 붙인다
+        pendingFetches = pendingFetches
+          .then(() => fetch(url))
+          .then((response) => response.arrayBuffer())
+          .then((buffer) => appendBytes(new Uint8Array(buffer)))
+          .catch((error) => console.error("오디오 조각 로딩 오류:", error));
+      },
+      end() {
+        pendingFetches.then(() => {
+          isEnded = true;
+          if (canStream) {
+            flush();
+          } else if (chunks.length > 0) {
+            const blob = new Blob(chunks, { type: "audio/mpeg" });
+            playAudioUrl(URL.createObjectURL(blob));
+          }
+        });
+      },
+    };
+  }
+
+  function createMessageElement(message, isUser, prefetchWords = true) {
     const messageDiv = document.createElement("div");
     messageDiv.className = `message ${isUser ? "user-message" : "bot-message"}`;
 
@@ -205,18 +403,99 @@ const ChatApp = (function () {
         translateMessage(message, messageDiv, translateBtn);
       messageDiv.appendChild(translateBtn);
 
-      addWordHoverEffects(messageBubble);
+      addWordHoverEffects(messageBubble, prefetchWords);
     }
 
+    return messageDiv;
+  }
+
+  function addMessage(message, isUser, audioUrl) {
+    const messageDiv = createMessageElement(message, isUser);
     elements.chatContainer.appendChild(messageDiv);
     elements.chatContainer.scrollTop = elements.chatContainer.scrollHeight;
 
-    if (!isUser && audioData) {
-      playAudio(audioData);
+    if (!isUser && audioUrl) {
+      playAudioUrl(audioUrl);
+    }
+  }
+
+  function handleChatScroll() {
+    // 맨 위 근처까지 올리면 이전 대화 기록을 이어서 불러온다
+    if (isLoggedIn && elements.chatContainer.scrollTop < 100) {
+      loadHistory();
+    }
+  }
+
+  function resetHistory() {
+    historyCursor = null;
+    isHistoryLoading = false;
+    isHistoryExhausted = false;
+  }
+
+  function loadHistory() {
+    if (isHistoryLoading || isHistoryExhausted) {
+      return;
+    }
+    isHistoryLoading = true;
+
+    const query = historyCursor
+      ? `?before=${encodeURIComponent(historyCursor)}`
+      : "";
+    fetch(`/get_history${query}`)
+      .then((response) => {
+        if (!response.ok) {
+          throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        return response.json();
+      })
+      .then((data) => {
+        prependHistory(data.history || []);
+        historyCursor = data.next_cursor;
+        isHistoryExhausted = !data.next_cursor;
+      })
+      .catch((error) => {
+        console.error("Error loading history:", error);
+      })
+      .finally(() => {
+        isHistoryLoading = false;
+      });
+  }
+
+  function prependHistory(days) {
+    const container = elements.chatContainer;
+    const previousHeight = container.scrollHeight;
+    const fragment = document.createDocumentFragment();
+
+    days.forEach((day) => {
+      const dateDiv = document.createElement("div");
+      dateDiv.className = "history-date";
+      dateDiv.textContent = day.date;
+      fragment.appendChild(dateDiv);
+      // 기록의 단어 뜻은 마우스를 올렸을 때만 조회한다
+      day.messages.forEach((message) => {
+        fragment.appendChild(
+          createMessageElement(message.content, message.is_user, false)
+        );
+      });
+    });
+
+    // 페이지 경계에서 같은 날짜 구분선이 두 번 나오지 않도록 정리
+    const firstChild = container.firstElementChild;
+    if (
+      firstChild &&
+      firstChild.classList.contains("history-date") &&
+      days.length > 0 &&
+      firstChild.textContent === days[days.length - 1].date
+    ) {
+      container.removeChild(firstChild);
     }
+
+    container.insertBefore(fragment, container.firstChild);
+    // 위에 기록이 추가돼도 보고 있던 위치가 그대로 유지되도록 스크롤 보정
+    container.scrollTop += container.scrollHeight - previousHeight;
   }
 
-  function addWordHoverEffects(element) {
+  function addWordHoverEffects(element, prefetch = true) {
     const words = element.textContent.split(/\s+/);
     element.innerHTML = words
       .map((word) => `<span class="hoverable-word">${word}</span>`)
@@ -227,6 +506,81 @@ const ChatApp = (function () {
       span.addEventListener("mouseleave", hideWordMeaning);
       span.addEventListener("click", handleWordClick);
     });
+
+    if (prefetch) {
+      prefetchWordMeanings(words);
+    }
+  }
+
+  function normalizeWord(word) {
+    return word.replace(/^[\s.,!?~…"'()\[\]{}:;·]+|[\s.,!?~…"'()\[\]{}:;·]+$/g, "");
+  }
+
+  function prefetchWordMeanings(words) {
+    // 메시지의 단어들을 한 번에 조회해서 마우스를 올리기 전에 캐시를 채운다
+    const missing = [
+      ...new Set(words.map(normalizeWord).filter((word) => word)),
+    ].filter((word) => !wordMeaningCache.has(word));
+    if (missing.length === 0) {
+      return;
+    }
+
+    const request = fetch("/get_word_meanings", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ words: missing }),
+    })
+      .then((response) => {
+        if (!response.ok) {
+          throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        return response.json();
+      })
+      .then((data) => data.meanings || {});
+
+    missing.forEach((word) => {
+      const entry = request.then((meanings) => {
+        if (!meanings[word]) {
+          throw new Error("Meaning not found in the response");
+        }
+        return meanings[word];
+      });
+      // 실패한 단어는 캐시에서 지워서 다음에 단건 조회로 다시 시도한다
+      entry.catch(() => wordMeaningCache.delete(word));
+      wordMeaningCache.set(word, entry);
+    });
+  }
+
+  function getWordMeaning(word) {
+    const key = normalizeWord(word);
+    if (wordMeaningCache.has(key)) {
+      return wordMeaningCache.get(key);
+    }
+
+    const entry = fetch("/get_word_meaning", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ word: word }),
+    })
+      .then((response) => {
+        console.log(`Response status: ${response.status}`);
+        if (!response.ok) {
+          return response.text().then((text) => {
+            console.log(`Error response text: ${text}`);
+            throw new Error(`HTTP error! status: ${response.status}`);
+          });
+        }
+        return response.json();
+      })
+      .then((data) => {
+        if (!data.meaning) {
+          throw new Error("Meaning not found in the response");
+        }
+        return data;
+      });
+    entry.catch(() => wordMeaningCache.delete(key));
+    wordMeaningCache.set(key, entry);
+    return entry;
   }
 
   function handleWordClick(event) {
@@ -250,38 +604,9 @@ const ChatApp = (function () {
   }
 
   function fetchWordMeaning(word) {
-    fetch("/get_word_meaning", {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ word: word }),
-    })
-      .then((response) => response.json())
+    getWordMeaning(word)
       .then((data) => {
-        if (data.meaning) {
-          saveWordToVocabulary(word, data.meaning, data.explanation);
-        } else {
-          throw new Error("Meaning not found in the response");
-        }
-      })
-      .catch((error) => {
-        console.error("Error fetching word meaning:", error);
-        alert("단어 의미를 가져오는 데 실패했습니다. 다시 시도해 주세요.");
-      });
-  }
-
-  function fetchWordMeaning(element, word) {
-    fetch("/get_word_meaning", {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ word: word }),
-    })
-      .then((response) => response.json())
-      .then((data) => {
-        if (data.meaning) {
-          saveWordToVocabulary(element, word, data.meaning, data.explanation);
-        } else {
-          throw new Error("Meaning not found in the response");
-        }
+        saveWordToVocabulary(word, data.meaning, data.explanation);
       })
       .catch((error) => {
         console.error("Error fetching word meaning:", error);
@@ -322,26 +647,9 @@ const ChatApp = (function () {
     tooltip.style.left = `${left}px`;
     tooltip.style.top = `${top}px`;
 
-    fetch("/get_word_meaning", {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ word: word }),
-    })
-      .then((response) => {
-        console.log(`Response status: ${response.status}`);
-        if (!response.ok) {
-          return response.text().then((text) => {
-            console.log(`Error response text: ${text}`);
-            throw new Error(`HTTP error! status: ${response.status}`);
-          });
-        }
-        return response.json();
-      })
+    getWordMeaning(word)
       .then((data) => {
         console.log("Received data:", data);
-        if (!data.meaning) {
-          throw new Error("Meaning not found in the response");
-        }
 
         // 기존 툴팁이 아직 존재하는지 확인
         if (!document.body.contains(tooltip)) {
@@ -548,12 +856,12 @@ const ChatApp = (function () {
     });
   }
 
-  function playAudio(audioData) {
+  function playAudioUrl(url) {
     setAITalking(true);
     if (isListening) {
       stopListening();
     }
-    currentAudio = new Audio("data:audio/mp3;base64," + audioData);
+    currentAudio = new Audio(url);
     currentAudio.play().catch((error) => {
       console.error("오디오 재생 오류:", error);
       setAITalking(false);
@@ -935,8 +1243,9 @@ const ChatApp = (function () {
           setLoggedIn(true);
           elements.authModal.style.display = "none";
           updateUserId(username);
-          sessionStartTime = new Date();
           startUsageTracking();
+          resetHistory();
+          loadHistory();
         } else {
           setMessage("Failed to log in. Please try again.", "error");
         }
@@ -1012,18 +1321,60 @@ const ChatApp = (function () {
   }
 
   function startUsageTracking() {
-    setInterval(() => {
-      const currentTime = new Date();
-      const usageTime = Math.floor((currentTime - sessionStartTime) / 1000);
-      updateUsageTime(usageTime);
-    }, 60000);
+    if (usageTimer) return;
+    lastUsageReportTime = document.hidden ? null : Date.now();
+    usageTimer = setInterval(reportUsageTime, 60000);
+  }
+
+  function stopUsageTracking() {
+    clearInterval(usageTimer);
+    usageTimer = null;
+    lastUsageReportTime = null;
+  }
+
+  // 지난 보고 이후 늘어난 시간(초)만 보냄 (탭이 숨겨진 동안은 세지 않음)
+  function takeUsageDelta() {
+    if (!usageTimer || lastUsageReportTime === null) return 0;
+    const seconds = Math.floor((Date.now() - lastUsageReportTime) / 1000);
+    lastUsageReportTime += seconds * 1000;
+    return seconds;
+  }
+
+  function handleVisibilityChange() {
+    if (!usageTimer) return;
+    if (document.hidden) {
+      sendUsageBeacon();
+      lastUsageReportTime = null;
+    } else {
+      lastUsageReportTime = Date.now();
+    }
+  }
+
+  function sendUsageBeacon() {
+    const seconds = takeUsageDelta();
+    if (!seconds) return;
+    const body = JSON.stringify({ time: seconds });
+    if (navigator.sendBeacon) {
+      navigator.sendBeacon(
+        "/update_usage_time",
+        new Blob([body], { type: "application/json" })
+      );
+    } else {
+      updateUsageTime(seconds, true);
+    }
+  }
+
+  function reportUsageTime() {
+    const seconds = takeUsageDelta();
+    return seconds ? updateUsageTime(seconds) : Promise.resolve();
   }
 
-  function updateUsageTime(time) {
-    fetch("/update_usage_time", {
+  function updateUsageTime(time, keepalive = false) {
+    return fetch("/update_usage_time", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({ time: time }),
+      keepalive: keepalive,
     })
       .then((response) => response.json())
       .then((data) => {
@@ -1044,6 +1395,8 @@ const ChatApp = (function () {
           setLoggedIn(true);
           updateUserId(data.username);
           elements.authModal.style.display = "none";
+          startUsageTracking();
+          loadHistory();
         } else {
           showLoginForm();
         }
@@ -1055,14 +1408,21 @@ const ChatApp = (function () {
   }
 
   function logout() {
-    fetch("/logout", {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-    })
+    // 로그아웃 전에 남은 사용 시간을 먼저 보냄
+    reportUsageTime()
+      .then(() =>
+        fetch("/logout", {
+          method: "POST",
+          headers: { "Content-Type": "application/json" },
+        })
+      )
       .then((response) => response.json())
       .then((data) => {
         if (data.success) {
+          stopUsageTracking();
           setLoggedIn(false);
+          resetHistory();
+          elements.chatContainer.innerHTML = "";
           showLoginForm();
           closeSidebar();
         }
@@ -1167,6 +1527,10 @@ const ChatApp = (function () {
         data.messages.forEach((message) => {
           addMessage(message, false);
         });
+        // 오디오는 URL로 받아 브라우저가 내려받는 대로 재생
+        if (data.audio_url) {
+          playAudioUrl(data.audio_url);
+        }
       })
       .catch((error) => {
         console.error("Error fetching news:", error);
@@ -0,0 +1,70 @@
+"""
+사용 시간 쓰기 버퍼
+
+/update_usage_time 요청마다 DB에 쓰지 않고 사용자별 증가분을 프로세스 메모리에 모아 두었다가
+interval초마다 한 번에 반영합니다. 같은 사용자의 여러 탭/요청은 하나의 증가분으로 합쳐집니다.
+반영에 실패한 증가분은 버퍼에 되돌려 다음 주기에 다시 시도합니다.
+"""
+import time
+from threading import Lock, Thread
+
+
+class UsageBuffer:
+    def __init__(self, flush_func, interval=10.0):
+        # flush_func({user_id: 증가분, ...}): 증가분을 DB에 반영하는 함수
+        self._flush_func = flush_func
+        self.interval = interval
+        self._pending = {}
+        self._lock = Lock()
+        self._flush_lock = Lock()
+        self._thread = None
+        self.added = 0
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.failures = 0
+
+    def add(self, user_id, seconds):
+        with self._lock:
+            self._pending[user_id] = self._pending.get(user_id, 0) + seconds
+            self.added += 1
+            if self._thread is None:
+                self._thread = Thread(target=self._loop, name='usage-buffer', daemon=True)
+                self._thread.start()
+
+    def flush(self):
+        """
+        모아 둔 증가분을 반영하고, 반영한 사용자 수를 반환합니다.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            try:
+                self._flush_func(pending)
+            except Exception as e:
+                with self._lock:
+                    for user_id, seconds in pending.items():
+                        self._pending[user_id] = self._pending.get(user_id, 0) + seconds
+                    self.failures += 1
+                print(f"Error flushing usage time for {len(pending)} users: {str(e)}")
+                return 0
+            with self._lock:
+                self.flushes += 1
+                self.flushed_rows += len(pending)
+            return len(pending)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'pending_users': len(self._pending),
+                'added': self.added,
+                'flushes': self.flushes,
+                'flushed_rows': self.flushed_rows,
+                'failures': self.failures,
+            }
+
+    def _loop(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
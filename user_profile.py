@@ -0,0 +1,61 @@
+"""
+사용자 관심사/감정 프로필
+
+사용자 메시지마다 analyze_message 결과를 누적합니다.
+- 관심사: 카테고리별 횟수를 메시지 단위로 감쇠시켜 최근 이야기한 주제일수록 크게 남깁니다.
+  (half_life 개의 메시지가 지나면 절반)
+- 감정: positive=1, neutral=0, negative=-1 값의 지수 이동 평균
+
+카테고리 수가 고정되어 있으므로 메시지 하나를 반영하는 비용은 일정합니다.
+"""
+import json
+
+SENTIMENT_VALUES = {'positive': 1.0, 'neutral': 0.0, 'negative': -1.0}
+
+
+class ProfileState:
+    def __init__(self, category_counts=None, sentiment_average=0.0, message_count=0):
+        self.category_counts = dict(category_counts or {})
+        self.sentiment_average = sentiment_average or 0.0
+        self.message_count = message_count or 0
+
+    @classmethod
+    def from_row(cls, row):
+        if row is None:
+            return cls()
+        return cls(json.loads(row.category_counts or '{}'), row.sentiment_average, row.message_count)
+
+    def dumps(self):
+        return json.dumps(self.category_counts, ensure_ascii=False, sort_keys=True)
+
+    def add(self, preferences, sentiment, half_life, sentiment_alpha):
+        """
+        메시지 하나의 분석 결과를 반영합니다.
+        """
+        decay = 0.5 ** (1 / half_life)
+        counts = {category: count * decay for category, count in self.category_counts.items()}
+        for category in preferences:
+            counts[category] = counts.get(category, 0.0) + 1.0
+        # 너무 작아진 카테고리는 지워서 크기를 카테고리 수 이하로 유지
+        self.category_counts = {category: round(count, 4) for category, count in counts.items() if count >= 0.01}
+
+        value = SENTIMENT_VALUES.get(sentiment, 0.0)
+        if self.message_count == 0:
+            self.sentiment_average = value
+        else:
+            self.sentiment_average += sentiment_alpha * (value - self.sentiment_average)
+        self.message_count += 1
+        return self
+
+    def top_categories(self, limit, min_count=1.0):
+        ranked = sorted(self.category_counts.items(), key=lambda item: item[1], reverse=True)
+        return [category for category, count in ranked[:limit] if count >= min_count]
+
+    def mood(self, threshold=0.2):
+        if self.message_count == 0:
+            return None
+        if self.sentiment_average >= threshold:
+            return 'positive'
+        if self.sentiment_average <= -threshold:
+            return 'negative'
+        return 'neutral'